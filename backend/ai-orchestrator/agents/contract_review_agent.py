@@ -1,70 +1,121 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Callable, List, Optional
 from .base_agent import BaseAgent
-from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
 import spacy
 import numpy as np
 from ..utils.risk_scorer import RiskScorer
+from ..utils.clause_index import ClauseIndex
+from ..utils.batching import BucketedBatcher
+from ..utils.model_store import ModelStore, LEGAL_BERT
+from ..utils.extractive_summarizer import ExtractiveSummarizer
+from ..utils.inference_scheduler import InferenceScheduler
+from ..utils.summary_registry import SummaryNotFound, register_summary_owner
+from ..utils.recommendation_cache import (
+    RecommendationCache, fill_slots, issue_requirement, recommendation_key, risk_factor_names, template_literal
+)
 from ..models.contract import ContractClause, RiskAssessment
+from ..models.analysis_tier import AnalysisTier, get_tier
 
 class ContractReviewAgent(BaseAgent):
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], inference_scheduler: Optional[InferenceScheduler] = None):
         super().__init__(config)
-        # Load NLP models
-        self.nlp = spacy.load("en_core_web_lg")
-        self.tokenizer = AutoTokenizer.from_pretrained("nlpaueb/legal-bert-base-uncased")
-        self.model = AutoModelForSequenceClassification.from_pretrained("nlpaueb/legal-bert-base-uncased")
+        # Thread pools are process-wide, so only pool workers size them, before constructing the agent
+        self.inference_scheduler = inference_scheduler or InferenceScheduler.from_config(self.config)
+        
+        # spaCy models are loaded on first use by the tiers that need them
+        self.nlp_models: Dict[str, Any] = {}
+        
+        # Load NLP models; converted weights are memory-mapped and shared across workers
+        self.model_store = ModelStore(self.config.get('model_store_dir'))
+        self.tokenizer = self.model_store.load_tokenizer(LEGAL_BERT)
+        self.model = self.model_store.load_model(LEGAL_BERT, "sequence-classification")
         
         # Specialized pipelines
-        self.clause_classifier = pipeline("text-classification", model="legal-bert-contract-clauses")
-        self.risk_analyzer = pipeline("text-classification", model="legal-bert-risk-analysis")
-        self.summarizer = pipeline("summarization", model="legal-bert-summarizer")
+        self.clause_classifier = self.model_store.load_pipeline("text-classification", "legal-bert-contract-clauses")
+        self.risk_analyzer = self.model_store.load_pipeline("text-classification", "legal-bert-risk-analysis")
+        self.summarizer = self.model_store.load_pipeline("summarization", "legal-bert-summarizer")
+        
+        # Length-bucketed batching for all pipeline calls
+        self.batcher = BucketedBatcher(
+            max_length=self.config.get('max_sequence_length', 512),
+            batch_size=self.config.get('inference_batch_size', 16)
+        )
         
         # Utilities
         self.risk_scorer = RiskScorer()
+        self.extractive_summarizer = ExtractiveSummarizer(
+            num_sentences=self.config.get('preview_sentences', 5),
+            max_sentences=self.config.get('preview_max_sentences', 1500)
+        )
+        
+        # Recommendation templates shared by repeated rules and risk categories
+        self.recommendation_cache = RecommendationCache(
+            max_entries=self.config.get('recommendation_cache_size', 1024)
+        )
+        
+        # Abstractive summaries behind an extractive preview, kept for a while after they finish
+        self.pending_summaries: OrderedDict = OrderedDict()
+        self.summary_finished_at: Dict[str, float] = {}
+        self.max_pending_summaries = self.config.get('max_pending_summaries', 256)
+        self.summary_ttl = self.config.get('summary_ttl', 600)
+        register_summary_owner(self)
     
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process contract document"""
         document = input_data['document']
         context = input_data.get('context', {})
+        tier = get_tier(input_data.get('analysis_tier') or self.config.get('analysis_tier'))
         
         # Analyze contract structure and extract clauses
-        clauses = await self._extract_clauses(document)
+        clauses = await self._extract_clauses(document, tier)
+        
+        # Index defined terms and section numbers once for the whole document
+        clause_index = ClauseIndex.build(clauses)
         
         # Analyze each clause
         analyzed_clauses = []
         for clause in clauses:
-            analysis = await self._analyze_clause(clause, context)
+            analysis = await self._analyze_clause(clause, context, clause_index, tier)
             analyzed_clauses.append(analysis)
         
         # Generate risk assessment
-        risks = await self._assess_risks(analyzed_clauses)
+        risks = await self._assess_risks(analyzed_clauses, tier)
         
         # Check compliance
         compliance_issues = await self._check_compliance(analyzed_clauses, context)
         
         # Generate summary and recommendations
-        summary = await self._generate_summary(document, analyzed_clauses, risks)
-        recommendations = await self._generate_recommendations(risks, compliance_issues)
+        summary = await self._generate_summary(document, analyzed_clauses, risks, context, tier)
+        recommendations = await self._generate_recommendations(risks, compliance_issues, analyzed_clauses, context)
         
         return {
             'clauses': analyzed_clauses,
             'risks': risks,
             'compliance_issues': compliance_issues,
             'summary': summary,
-            'recommendations': recommendations
+            'recommendations': recommendations,
+            'dependency_graph': clause_index.dependency_graph(),
+            'analysis_tier': tier.name
         }
     
-    async def _extract_clauses(self, document: str) -> List[ContractClause]:
+    async def _extract_clauses(self, document: str, tier: AnalysisTier) -> List[ContractClause]:
         """Extract and classify contract clauses"""
         # Split document into sections
-        doc = self.nlp(document)
+        doc = self._get_nlp(tier.spacy_model)(document)
         sections = self._split_into_sections(doc)
         
+        # Classify all sections in length-bucketed batches
+        clause_types = self.batcher.run(
+            self.clause_classifier,
+            [section.text for section in sections],
+            batch_size=tier.batch_size
+        )
+        
         clauses = []
-        for section in sections:
-            # Classify section type
-            clause_type = self.clause_classifier(section.text)[0]
-            
+        for section, clause_type in zip(sections, clause_types):
             # Extract key terms
             terms = self._extract_terms(section)
             
@@ -81,20 +132,27 @@ class ContractReviewAgent(BaseAgent):
     async def _analyze_clause(
         self,
         clause: ContractClause,
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        clause_index: ClauseIndex,
+        tier: AnalysisTier
     ) -> Dict[str, Any]:
         """Analyze individual clause"""
-        # Perform deep analysis of clause
+        # Risk factors feed risk scoring, so every tier identifies them
         analysis = {
             'clause': clause.dict(),
-            'risk_factors': await self._identify_risk_factors(clause.text),
-            'obligations': await self._extract_obligations(clause.text),
-            'dependencies': await self._identify_dependencies(clause.text),
-            'temporal_aspects': await self._extract_temporal_aspects(clause.text)
+            'risk_factors': await self._identify_risk_factors(clause.text)
         }
         
+        # Deeper analysers only run in the tiers that select them
+        if 'obligations' in tier.analyzers:
+            analysis['obligations'] = await self._extract_obligations(clause.text)
+        if 'dependencies' in tier.analyzers:
+            analysis['dependencies'] = await self._identify_dependencies(clause, clause_index)
+        if 'temporal_aspects' in tier.analyzers:
+            analysis['temporal_aspects'] = await self._extract_temporal_aspects(clause.text)
+        
         # Add context-specific analysis
-        if context.get('jurisdiction'):
+        if 'jurisdiction' in tier.analyzers and context.get('jurisdiction'):
             analysis['jurisdiction_specific'] = await self._analyze_jurisdiction_compliance(
                 clause.text,
                 context['jurisdiction']
@@ -102,13 +160,17 @@ class ContractReviewAgent(BaseAgent):
         
         return analysis
     
-    async def _assess_risks(self, analyzed_clauses: List[Dict]) -> List[RiskAssessment]:
+    async def _assess_risks(self, analyzed_clauses: List[Dict], tier: AnalysisTier) -> List[RiskAssessment]:
         """Assess risks in contract clauses"""
+        # Get risk predictions in length-bucketed batches
+        risk_preds = self.batcher.run(
+            self.risk_analyzer,
+            [clause_analysis['clause']['text'] for clause_analysis in analyzed_clauses],
+            batch_size=tier.batch_size
+        )
+        
         risks = []
-        for clause_analysis in analyzed_clauses:
-            # Get risk prediction
-            risk_pred = self.risk_analyzer(clause_analysis['clause']['text'])[0]
-            
+        for clause_analysis, risk_pred in zip(analyzed_clauses, risk_preds):
             # Calculate risk score
             risk_score = self.risk_scorer.calculate_score(
                 risk_pred['label'],
@@ -153,11 +215,24 @@ class ContractReviewAgent(BaseAgent):
         self,
         document: str,
         analyzed_clauses: List[Dict],
-        risks: List[RiskAssessment]
+        risks: List[RiskAssessment],
+        context: Dict[str, Any],
+        tier: AnalysisTier
     ) -> Dict[str, Any]:
         """Generate contract summary with key points and risks"""
-        # Generate overall summary
-        summary_text = self.summarizer(document)[0]['summary_text']
+        # Summary mode: 'abstractive', 'extractive', 'preview' or None, defaulting to the tier's
+        summary_mode = context.get('summary_mode', tier.summary_mode)
+        summary_id = None
+        
+        if summary_mode is None:
+            summary_text = None
+        elif summary_mode == 'abstractive':
+            summary_text = self._abstractive_summary(document)
+        else:
+            # Key sentences by centrality, cheap enough for interactive previews
+            summary_text = self.extractive_summarizer.summarize(document)
+            if summary_mode == 'preview':
+                summary_id = self._schedule_abstractive_summary(document, context)
         
         # Extract key points
         key_points = await self._extract_key_points(analyzed_clauses)
@@ -167,30 +242,173 @@ class ContractReviewAgent(BaseAgent):
         
         return {
             'summary': summary_text,
+            'summary_mode': summary_mode,
+            'summary_id': summary_id,
             'key_points': key_points,
             'risk_summary': risk_summary
         }
     
+    def _abstractive_summary(self, document: str) -> str:
+        """Summarise with the abstractive model, chunking past the model window"""
+        return self.batcher.run(
+            self.summarizer,
+            [document],
+            overflow='chunk',
+            combine=lambda chunks: ' '.join(chunk['summary_text'] for chunk in chunks)
+        )[0]
+    
+    def _schedule_abstractive_summary(self, document: str, context: Dict[str, Any]) -> str:
+        """Run the abstractive pass in the background to replace a preview"""
+        self._prune_summaries()
+        summary_id = str(uuid.uuid4())
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(None, self._abstractive_summary, document)
+        self.pending_summaries[summary_id] = future
+        
+        on_summary = context.get('on_summary')
+        def finished(done: asyncio.Future) -> None:
+            # The result stays retrievable until it expires, whether or not anyone was notified
+            self.summary_finished_at[summary_id] = time.monotonic()
+            # Let callers swap the preview as soon as the full summary is ready
+            if on_summary and not done.cancelled() and done.exception() is None:
+                on_summary(summary_id, done.result())
+        future.add_done_callback(finished)
+        
+        return summary_id
+    
+    def _prune_summaries(self) -> None:
+        """Expire finished summaries, and drop the oldest entries past the cap"""
+        expired_before = time.monotonic() - self.summary_ttl
+        for summary_id, finished_at in list(self.summary_finished_at.items()):
+            if finished_at < expired_before:
+                self._forget_summary(summary_id)
+        
+        while len(self.pending_summaries) >= self.max_pending_summaries:
+            # Prefer dropping finished summaries; unfinished ones keep running but can no longer be fetched
+            summary_id = next((key for key in self.pending_summaries if key in self.summary_finished_at), None)
+            self._forget_summary(summary_id or next(iter(self.pending_summaries)))
+    
+    def _forget_summary(self, summary_id: str) -> None:
+        future = self.pending_summaries.pop(summary_id, None)
+        self.summary_finished_at.pop(summary_id, None)
+        if future is not None and future.done() and not future.cancelled():
+            # Mark any failure as retrieved so it isn't logged as never retrieved
+            future.exception()
+    
+    async def get_abstractive_summary(self, summary_id: str, timeout: Optional[float] = None) -> str:
+        """Wait for the abstractive summary that replaces an extractive preview"""
+        future = self.pending_summaries.get(summary_id)
+        if future is None:
+            raise SummaryNotFound(f"Summary {summary_id} is unknown or has expired")
+        return await asyncio.wait_for(asyncio.shield(future), timeout)
+    
     async def _generate_recommendations(
         self,
         risks: List[RiskAssessment],
-        compliance_issues: List[Dict]
+        compliance_issues: List[Dict],
+        analyzed_clauses: List[Dict],
+        context: Dict[str, Any]
     ) -> List[Dict]:
         """Generate recommendations for identified risks and issues"""
-        recommendations = []
+        jurisdiction = context.get('jurisdiction')
+        clause_types = {analysis['clause']['id']: analysis['clause']['type'] for analysis in analyzed_clauses}
+        semaphore = asyncio.Semaphore(self.config.get('recommendation_concurrency', 8))
+        
+        async def recommend(kind: str, item: Dict[str, Any], generate: Callable) -> Dict:
+            # Only cache misses take a generation slot
+            async def bounded_generate():
+                async with semaphore:
+                    return await generate(item, jurisdiction)
+            
+            template = await self.recommendation_cache.get_or_create(
+                recommendation_key(kind, item, jurisdiction),
+                bounded_generate
+            )
+            return fill_slots(template, self._recommendation_slots(item))
+        
+        jobs = []
         
         # Generate risk-based recommendations
         for risk in risks:
             if risk.risk_score > self.config['risk_threshold']:
-                rec = await self._generate_risk_recommendation(risk)
-                recommendations.append(rec)
+                # The clause type is part of the template key, so it travels with the risk
+                item = {**risk.dict(), 'clause_type': clause_types.get(risk.clause_id)}
+                jobs.append(recommend('risk', item, self._generate_risk_recommendation))
         
         # Generate compliance-based recommendations
         for issue in compliance_issues:
-            rec = await self._generate_compliance_recommendation(issue)
-            recommendations.append(rec)
+            jobs.append(recommend('compliance', issue, self._generate_compliance_recommendation))
+        
+        return list(await asyncio.gather(*jobs))
+    
+    def _recommendation_slots(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Clause specifics substituted into cached recommendation templates"""
+        slots = {key: value for key, value in item.items() if isinstance(value, (str, int, float))}
+        clause = item.get('clause')
+        if isinstance(clause, dict):
+            slots.setdefault('clause_id', clause.get('id'))
+            slots.setdefault('clause_text', clause.get('text'))
+        # Issues under one regulation share a template, so their own requirement is filled in per issue
+        requirement = issue_requirement(item)
+        if requirement:
+            slots.setdefault('requirement', requirement)
+        return slots
+    
+    async def _generate_risk_recommendation(self, risk: Dict[str, Any], jurisdiction: Optional[str]) -> Dict:
+        """Generate a recommendation template for a clause type and its risk factors, with ${slots} for clause specifics"""
+        clause_type = template_literal(risk.get('clause_type') or 'this')
+        level = template_literal(risk['risk_level']) if risk.get('risk_level') else None
+        risk_level = level or 'elevated'
+        factors = [template_literal(name) for name in risk_factor_names(risk.get('risk_factors'))]
+        
+        recommendation = f"Review the {clause_type} clause ${{clause_id}}, which carries {risk_level} risk"
+        if factors:
+            recommendation += f" from {', '.join(factors)}"
+        recommendation += "; negotiate narrower terms or add protective language"
+        if jurisdiction:
+            recommendation += f" consistent with {template_literal(jurisdiction)} law"
         
-        return recommendations
+        return {
+            'type': 'risk',
+            'clause_id': '${clause_id}',
+            'risk_level': level,
+            'risk_factors': factors,
+            'recommendation': recommendation + '.'
+        }
+    
+    async def _generate_compliance_recommendation(self, issue: Dict[str, Any], jurisdiction: Optional[str]) -> Dict:
+        """Generate a recommendation template for a compliance rule, with ${slots} for clause specifics"""
+        regulation = issue.get('regulation') or issue.get('rule_id') or issue.get('regulation_id') or 'the applicable regulation'
+        if isinstance(regulation, dict):
+            regulation = regulation.get('name') or regulation.get('id')
+        regulation = template_literal(regulation)
+        
+        recommendation = f"Amend clause ${{clause_id}} to comply with {regulation}"
+        if jurisdiction:
+            recommendation += f" in {template_literal(jurisdiction)}"
+        if issue_requirement(issue):
+            recommendation += ": ${requirement}"
+        
+        return {
+            'type': 'compliance',
+            'clause_id': '${clause_id}',
+            'regulation': regulation,
+            'recommendation': recommendation + '.'
+        }
+    
+    async def _identify_dependencies(
+        self,
+        clause: ContractClause,
+        clause_index: ClauseIndex
+    ) -> List[Dict[str, Any]]:
+        """Resolve defined-term and cross-reference dependencies from the document index"""
+        return clause_index.resolve(clause.id, clause.text)
+    
+    def _get_nlp(self, model_name: str) -> Any:
+        """Load a spaCy model once and reuse it across requests"""
+        if model_name not in self.nlp_models:
+            self.nlp_models[model_name] = spacy.load(model_name)
+        return self.nlp_models[model_name]
     
     def _split_into_sections(self, doc) -> List[Any]:
         """Split document into logical sections"""
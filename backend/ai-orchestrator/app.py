@@ -1,9 +1,13 @@
 from fastapi import FastAPI, HTTPException, Security
+from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
 from typing import List, Dict, Optional
+import asyncio
 import httpx
 from datetime import datetime
+from .utils.inference_scheduler import InferenceScheduler, active_scheduler
+from .utils.summary_registry import SummaryNotFound, get_abstractive_summary
 
 app = FastAPI()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
@@ -43,6 +47,7 @@ class AIOrchestratorService:
         }
 
 ai_orchestrator = AIOrchestratorService()
+inference_scheduler = InferenceScheduler()
 
 @app.post("/ai/analyze")
 async def analyze_document(task_data: dict, token: str = Security(oauth2_scheme)):
@@ -51,4 +56,24 @@ async def analyze_document(task_data: dict, token: str = Security(oauth2_scheme)
         raise HTTPException(status_code=400, detail="Invalid task type")
     
     result = await ai_orchestrator.agents[task_type](task_data.get("input"))
-    return result 
\ No newline at end of file
+    return result 
+
+@app.get("/ai/metrics/cpu")
+async def cpu_metrics(token: str = Security(oauth2_scheme)):
+    """CPU layout, load and utilisation of the inference host"""
+    # Report the layout applied to this process; the API process itself is never configured as a worker
+    return (active_scheduler() or inference_scheduler).stats()
+
+# Longest a client can hold a summary request open waiting for the abstractive pass
+MAX_SUMMARY_WAIT = 30.0
+
+@app.get("/ai/summaries/{summary_id}")
+async def abstractive_summary(summary_id: str, wait: float = 0.0, token: str = Security(oauth2_scheme)):
+    """Abstractive summary that replaces a review's extractive preview, waiting up to wait seconds for it"""
+    try:
+        summary = await get_abstractive_summary(summary_id, min(max(wait, 0.0), MAX_SUMMARY_WAIT))
+    except SummaryNotFound:
+        raise HTTPException(status_code=404, detail="Summary not found or expired")
+    except asyncio.TimeoutError:
+        return JSONResponse(status_code=202, content={"summary_id": summary_id, "status": "pending"})
+    return {"summary_id": summary_id, "status": "complete", "summary": summary}
\ No newline at end of file
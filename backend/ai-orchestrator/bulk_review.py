@@ -0,0 +1,275 @@
+from typing import Dict, List, Any, Iterator, Optional, Set, Tuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+from .agents.contract_review_agent import ContractReviewAgent
+from .utils.inference_scheduler import InferenceScheduler, read_load
+# document-service is a sibling service, not a parent package, so it is imported by its installed name
+from document_service.format_converter import FormatConverter
+from document_service.pdf_extractor import PdfExtractor
+
+SOURCE_FORMATS = {
+    '.txt': 'text',
+    '.md': 'markdown',
+    '.markdown': 'markdown',
+    '.html': 'html',
+    '.htm': 'html',
+    '.docx': 'docx',
+    '.pdf': 'pdf'
+}
+
+# Per-process state, created once by the pool initializer
+_worker_state: Dict[str, Any] = {}
+
+def iter_documents(root: str) -> Iterator[str]:
+    """Stream supported document paths under root in a stable order"""
+    with os.scandir(root) as entries:
+        for entry in sorted(entries, key=lambda e: e.name):
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_documents(entry.path)
+            elif os.path.splitext(entry.name)[1].lower() in SOURCE_FORMATS:
+                yield entry.path
+
+def load_checkpoint(output_path: str) -> Set[str]:
+    """Return paths already reviewed successfully; files that failed are retried on resume"""
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    
+    valid_bytes = 0
+    with open(output_path, 'rb') as f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            if record.get('status') == 'completed':
+                completed.add(record['path'])
+            valid_bytes += len(line)
+    
+    # Drop a partially written trailing line left by an interrupted run
+    if valid_bytes != os.path.getsize(output_path):
+        with open(output_path, 'r+b') as f:
+            f.truncate(valid_bytes)
+    
+    return completed
+
+def _init_worker(config: Dict[str, Any], worker_counter: Optional[Any] = None) -> None:
+    """Load models once per worker process"""
+    # Claim a worker slot so each process takes its own core set
+    if worker_counter is not None:
+        with worker_counter.get_lock():
+            config = {**config, 'worker_index': worker_counter.value}
+            worker_counter.value += 1
+    
+    # Size thread pools for this worker's share of the host before loading models
+    scheduler = InferenceScheduler.from_config(config)
+    scheduler.configure_worker(config.get('worker_index', 0))
+    
+    _worker_state['agent'] = ContractReviewAgent(config, inference_scheduler=scheduler)
+    # Review workers already use every core, so each extracts PDFs with a single helper process
+    _worker_state['converter'] = FormatConverter(pdf_extractor=PdfExtractor(workers=1))
+    _worker_state['loop'] = asyncio.new_event_loop()
+
+def _to_serializable(value: Any) -> Any:
+    """JSON fallback for pydantic models and timestamps in agent output"""
+    if hasattr(value, 'dict'):
+        return value.dict()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+def _review_batch(paths: List[str], context: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """Convert and review a batch of files, returning (status, JSONL line) per file"""
+    agent = _worker_state['agent']
+    converter = _worker_state['converter']
+    loop = _worker_state['loop']
+    
+    lines = []
+    for path in paths:
+        start_time = time.time()
+        try:
+            source_format = SOURCE_FORMATS[os.path.splitext(path)[1].lower()]
+            if source_format == 'pdf':
+                # Pages are read from the file as they are extracted rather than loaded up front
+                document = converter.pdf_extractor.extract_text(path)
+            else:
+                with open(path, 'rb') as f:
+                    content = f.read()
+                
+                if source_format == 'text':
+                    document = content.decode('utf-8', errors='replace')
+                else:
+                    if source_format in ('markdown', 'html'):
+                        content = content.decode('utf-8', errors='replace')
+                    text = loop.run_until_complete(
+                        converter.convert(content=content, source_format=source_format, target_format='text')
+                    )
+                    document = text.decode('utf-8')
+            
+            result = loop.run_until_complete(
+                agent.process({'document': document, 'context': context})
+            )
+            record = {'path': path, 'status': 'completed', 'result': result}
+        except Exception as e:
+            record = {'path': path, 'status': 'error', 'error': str(e)}
+        
+        record['elapsed'] = time.time() - start_time
+        lines.append((record['status'], json.dumps(record, default=_to_serializable) + '\n'))
+    
+    return lines
+
+class BulkReviewRunner:
+    def __init__(
+        self,
+        input_dir: str,
+        output_path: str,
+        workers: int = os.cpu_count() or 1,
+        batch_size: int = 8,
+        max_pending: Optional[int] = None,
+        context: Optional[Dict[str, Any]] = None,
+        config: Optional[Dict[str, Any]] = None,
+        report_interval: float = 10.0
+    ):
+        self.input_dir = input_dir
+        self.output_path = output_path
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_pending = max_pending or workers * 2
+        self.context = context or {}
+        self.config = dict(config or {})
+        # Split the host's cores across the pool unless the config sets a layout
+        self.config.setdefault('cpu_workers', workers)
+        self.report_interval = report_interval
+        self.stats = {'completed': 0, 'errors': 0, 'skipped': 0}
+        self._start_time = 0.0
+        self._last_report = 0.0
+    
+    def run(self) -> Dict[str, Any]:
+        """Review every pending document, appending results to the output file"""
+        completed = load_checkpoint(self.output_path)
+        self.stats['skipped'] = len(completed)
+        
+        self._start_time = time.time()
+        self._last_report = self._start_time
+        
+        with open(self.output_path, 'a', encoding='utf-8') as output, \
+                ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    initializer=_init_worker,
+                    initargs=(self.config, multiprocessing.Value('i', 0))
+                ) as pool:
+            pending = set()
+            for batch in self._pending_batches(completed):
+                # Bound in-flight work so memory stays flat on large data rooms
+                while len(pending) >= self.max_pending:
+                    pending = self._drain(pending, output)
+                pending.add(pool.submit(_review_batch, batch, self.context))
+            
+            while pending:
+                pending = self._drain(pending, output)
+        
+        self._report()
+        self.stats['elapsed'] = time.time() - self._start_time
+        return self.stats
+    
+    def _pending_batches(self, completed: Set[str]) -> Iterator[List[str]]:
+        """Group unreviewed paths into batches"""
+        batch = []
+        for path in iter_documents(self.input_dir):
+            if path in completed:
+                continue
+            batch.append(path)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    def _drain(self, pending: Set, output) -> Set:
+        """Wait for at least one batch and checkpoint its results"""
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            for status, line in future.result():
+                output.write(line)
+                if status == 'error':
+                    self.stats['errors'] += 1
+                else:
+                    self.stats['completed'] += 1
+        
+        # Make the checkpoint durable before more work is acknowledged
+        output.flush()
+        os.fsync(output.fileno())
+        
+        if time.time() - self._last_report >= self.report_interval:
+            self._report()
+        return pending
+    
+    def _report(self) -> None:
+        """Print throughput since the run started"""
+        self._last_report = time.time()
+        elapsed = max(self._last_report - self._start_time, 1e-9)
+        processed = self.stats['completed'] + self.stats['errors']
+        load = read_load() if os.path.exists('/proc/loadavg') else None
+        print(
+            f"[bulk-review] {processed} reviewed ({self.stats['errors']} errors, "
+            f"{self.stats['skipped']} resumed) in {elapsed:.1f}s - "
+            f"{processed / elapsed:.2f} docs/sec"
+            + (f", load {load['load_1m']:.1f}, run queue {load['run_queue']}" if load else ""),
+            file=sys.stderr,
+            flush=True
+        )
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m ai_orchestrator.bulk_review",
+        description="Review a directory of contracts offline and write results to JSONL"
+    )
+    parser.add_argument('input_dir', help="Directory of contracts (txt, md, html, docx, pdf)")
+    parser.add_argument('output', help="JSONL output file; re-running resumes from it")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--batch-size', type=int, default=8, help="Documents per worker task")
+    parser.add_argument('--max-pending', type=int, default=None, help="Maximum in-flight batches")
+    parser.add_argument('--jurisdiction', default=None)
+    parser.add_argument('--config', default=None, help="JSON file with agent configuration")
+    parser.add_argument('--threads-per-worker', type=int, default=None, help="Inference threads per worker")
+    parser.add_argument('--pin-workers', action='store_true', help="Pin each worker to its own core set")
+    parser.add_argument('--report-interval', type=float, default=10.0)
+    args = parser.parse_args(argv)
+    
+    config = {}
+    if args.config:
+        with open(args.config) as f:
+            config = json.load(f)
+    if args.threads_per_worker:
+        config['cpu_threads_per_worker'] = args.threads_per_worker
+    if args.pin_workers:
+        config['cpu_pin_workers'] = True
+    
+    context = {}
+    if args.jurisdiction:
+        context['jurisdiction'] = args.jurisdiction
+    
+    runner = BulkReviewRunner(
+        input_dir=args.input_dir,
+        output_path=args.output,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        max_pending=args.max_pending,
+        context=context,
+        config=config,
+        report_interval=args.report_interval
+    )
+    stats = runner.run()
+    return 1 if stats['errors'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
@@ -1,6 +1,7 @@
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import asyncio
+import logging
 from .agents import (
     ContractReviewAgent,
     ComplianceAgent,
@@ -10,7 +11,11 @@ from .agents import (
 )
 from .models.ai_config import AITask
 from .utils.task_queue import TaskQueue
-from .utils.result_aggregator import ResultAggregator
+from .utils.result_aggregator import ResultAggregator, ResultMerge
+from .utils.document_router import DocumentRouter
+from .models.analysis_tier import get_tier
+
+logger = logging.getLogger(__name__)
 
 class AIOrchestrator:
     def __init__(self):
@@ -23,6 +28,7 @@ class AIOrchestrator:
         }
         self.task_queue = TaskQueue()
         self.result_aggregator = ResultAggregator()
+        self.router = DocumentRouter()
         
     async def process_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process a task using appropriate agents"""
@@ -36,11 +42,12 @@ class AIOrchestrator:
         # Create subtasks for each agent
         subtasks = await self._create_subtasks(task, required_agents)
         
-        # Execute subtasks
-        results = await self._execute_subtasks(subtasks)
+        # Execute subtasks, merging each result as its agent finishes
+        merge = self.result_aggregator.create_merge()
+        results = await self._execute_subtasks(subtasks, merge)
         
         # Aggregate results
-        final_result = await self.result_aggregator.aggregate(results)
+        final_result = await self.result_aggregator.aggregate(results, merge)
         
         # Update task status
         await self._update_task_status(task, final_result)
@@ -59,14 +66,39 @@ class AIOrchestrator:
             'risk_analysis': ['risk_assessment', 'compliance']
         }
         
-        return workflows.get(task_type, [task_type])
+        default_agents = workflows.get(task_type, [task_type])
+        input_data = task.input_data or {}
+        
+        # Callers can pin the agent set; otherwise pre-classify the document
+        if input_data.get('agents'):
+            decision = self.router.override(task_type, input_data['agents'])
+        else:
+            decision = self.router.route(task_type, input_data.get('document'), default_agents)
+        
+        # Analysis stays thorough unless the caller asks for a tier; routing never lowers it
+        requested_tier = input_data.get('analysis_tier')
+        try:
+            tier = get_tier(requested_tier)
+        except ValueError:
+            logger.warning("Unknown analysis tier %r for task %s, using the default", requested_tier, task.id)
+            tier = get_tier()
+        
+        # Record the routing decision with the task for audit
+        logger.info("Routing task %s at %s tier: %s", task.id, tier.name, decision.json())
+        task.input_data = {**input_data, 'routing': decision.dict(), 'analysis_tier': tier.name}
+        
+        return decision.agents
     
-    async def _execute_subtasks(self, subtasks: List[AITask]) -> List[Dict[str, Any]]:
+    async def _execute_subtasks(
+        self,
+        subtasks: List[AITask],
+        merge: Optional[ResultMerge] = None
+    ) -> List[Dict[str, Any]]:
         """Execute subtasks in parallel where possible"""
         tasks = []
         for subtask in subtasks:
             agent = self.agents[subtask.agent_type]
-            tasks.append(agent.execute(subtask))
+            tasks.append(self._run_subtask(agent, subtask, merge))
         
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
@@ -77,6 +109,18 @@ class AIOrchestrator:
         
         return [r for r in results if not isinstance(r, Exception)]
     
+    async def _run_subtask(
+        self,
+        agent: Any,
+        subtask: AITask,
+        merge: Optional[ResultMerge]
+    ) -> Dict[str, Any]:
+        """Execute one subtask and fold its result into the merge"""
+        result = await agent.execute(subtask)
+        if merge is not None:
+            merge.add(subtask.agent_type, result)
+        return result
+    
     async def _create_subtasks(
         self,
         parent_task: AITask,
@@ -0,0 +1,186 @@
+from typing import Dict, List, Any, Callable, NamedTuple, Optional, Sequence, Tuple
+from collections import defaultdict
+import bisect
+
+DEFAULT_BUCKETS = (32, 64, 128, 256, 384, 512)
+
+class WorkItem(NamedTuple):
+    index: int
+    chunk: int
+    text: str
+    length: int
+
+class BucketedBatcher:
+    """Batch transformer pipeline inputs by token length to minimise padding"""
+    
+    def __init__(
+        self,
+        max_length: int = 512,
+        batch_size: int = 16,
+        bucket_boundaries: Sequence[int] = DEFAULT_BUCKETS,
+        chunk_stride: int = 0
+    ):
+        self.max_length = max_length
+        self.batch_size = batch_size
+        self.bucket_boundaries = sorted(bucket_boundaries)
+        self.chunk_stride = chunk_stride
+    
+    def run(
+        self,
+        pipe: Callable,
+        texts: List[str],
+        overflow: str = 'truncate',
+        combine: Optional[Callable[[List[Any]], Any]] = None,
+        batch_size: Optional[int] = None,
+        **pipe_kwargs
+    ) -> List[Any]:
+        """Run a pipeline over texts in length buckets, returning results in input order"""
+        if not texts:
+            return []
+        
+        # Over-length inputs are truncated, or split into windows when chunking
+        max_length = self._effective_max_length(pipe.tokenizer)
+        items = self._prepare(pipe.tokenizer, texts, max_length, overflow)
+        
+        outputs: Dict[int, Dict[int, Any]] = defaultdict(dict)
+        for batch in self.plan(items, max_length, batch_size):
+            batch_outputs = pipe(
+                [item.text for item in batch],
+                batch_size=len(batch),
+                truncation=True,
+                **pipe_kwargs
+            )
+            for item, output in zip(batch, batch_outputs):
+                outputs[item.index][item.chunk] = output
+        
+        # Restore original order, merging chunked inputs
+        results = []
+        for index in range(len(texts)):
+            chunks = [outputs[index][chunk] for chunk in sorted(outputs[index])]
+            if overflow == 'chunk':
+                results.append(combine(chunks) if combine else chunks)
+            else:
+                results.append(chunks[0])
+        return results
+    
+    def plan(
+        self,
+        items: List[WorkItem],
+        max_length: Optional[int] = None,
+        batch_size: Optional[int] = None
+    ) -> List[List[WorkItem]]:
+        """Group work items into batches within length buckets"""
+        batch_size = batch_size or self.batch_size
+        boundaries = self._boundaries(max_length or self.max_length)
+        buckets: Dict[int, List[WorkItem]] = defaultdict(list)
+        for item in items:
+            bucket = min(bisect.bisect_left(boundaries, item.length), len(boundaries) - 1)
+            buckets[bucket].append(item)
+        
+        batches = []
+        for bucket in sorted(buckets):
+            bucket_items = sorted(buckets[bucket], key=lambda item: item.length)
+            for start in range(0, len(bucket_items), batch_size):
+                batches.append(bucket_items[start:start + batch_size])
+        return batches
+    
+    def _prepare(
+        self,
+        tokenizer: Any,
+        texts: List[str],
+        max_length: int,
+        overflow: str
+    ) -> List[WorkItem]:
+        """Measure token lengths and split over-length inputs when chunking"""
+        try:
+            # Offsets map truncated token ids back to the exact source text, so nothing is decoded
+            encoding = tokenizer(list(texts), add_special_tokens=False, truncation=False, return_offsets_mapping=True)
+            offsets = encoding['offset_mapping']
+        except NotImplementedError:
+            # Only fast tokenizers report offsets
+            encoding = tokenizer(list(texts), add_special_tokens=False, truncation=False)
+            offsets = None
+        encoded = encoding['input_ids']
+        special_tokens = tokenizer.num_special_tokens_to_add(pair=False)
+        window = max_length - special_tokens
+        
+        items = []
+        for index, (text, token_ids) in enumerate(zip(texts, encoded)):
+            if len(token_ids) <= window:
+                items.append(WorkItem(index, 0, text, len(token_ids) + special_tokens))
+                continue
+            
+            text_offsets = offsets[index] if offsets is not None else None
+            
+            # Truncate to the same window every pipeline uses
+            if overflow != 'chunk':
+                items.append(WorkItem(index, 0, self._span(tokenizer, text, token_ids, text_offsets, 0, window), max_length))
+                continue
+            
+            step = max(window - self.chunk_stride, 1)
+            for chunk, start in enumerate(range(0, len(token_ids), step)):
+                end = min(start + window, len(token_ids))
+                items.append(WorkItem(
+                    index,
+                    chunk,
+                    self._span(tokenizer, text, token_ids, text_offsets, start, end),
+                    end - start + special_tokens
+                ))
+                if end >= len(token_ids):
+                    break
+        return items
+    
+    def _span(
+        self,
+        tokenizer: Any,
+        text: str,
+        token_ids: List[int],
+        offsets: Optional[List[Tuple[int, int]]],
+        start: int,
+        end: int
+    ) -> str:
+        """Source text covered by tokens [start, end)"""
+        if offsets is None:
+            return tokenizer.decode(token_ids[start:end], skip_special_tokens=True)
+        return text[offsets[start][0]:offsets[end - 1][1]]
+    
+    def _effective_max_length(self, tokenizer: Any) -> int:
+        """Cap the configured length at what the model accepts"""
+        model_max_length = getattr(tokenizer, 'model_max_length', None) or self.max_length
+        return min(self.max_length, model_max_length)
+    
+    def _boundaries(self, max_length: int) -> List[int]:
+        """Bucket boundaries capped at max_length"""
+        return [b for b in self.bucket_boundaries if b < max_length] + [max_length]
+
+def padded_batches(lengths: Sequence[int], batch_size: int, max_length: int) -> List[Tuple[int, int]]:
+    """Naive arrival-order batches as (batch size, padded length) pairs"""
+    batches = []
+    for start in range(0, len(lengths), batch_size):
+        batch = [min(length, max_length) for length in lengths[start:start + batch_size]]
+        batches.append((len(batch), max(batch)))
+    return batches
+
+def bucketed_batches(
+    lengths: Sequence[int],
+    batcher: BucketedBatcher
+) -> List[Tuple[int, int]]:
+    """Batches the batcher would form, as (batch size, padded length) pairs"""
+    items = [WorkItem(i, 0, '', min(length, batcher.max_length)) for i, length in enumerate(lengths)]
+    return [
+        (len(batch), max(item.length for item in batch))
+        for batch in batcher.plan(items)
+    ]
+
+def estimate_flops(
+    batches: Sequence[Tuple[int, int]],
+    hidden_size: int = 768,
+    num_layers: int = 12
+) -> float:
+    """Approximate encoder forward FLOPs for (batch size, padded length) batches"""
+    total = 0.0
+    for batch_size, length in batches:
+        # Dense projections and feed-forward scale with L, attention scores with L^2
+        per_layer = 24 * length * hidden_size ** 2 + 4 * length ** 2 * hidden_size
+        total += batch_size * num_layers * per_layer
+    return total
\ No newline at end of file
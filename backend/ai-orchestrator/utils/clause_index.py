@@ -0,0 +1,173 @@
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+from collections import deque
+import re
+
+# "Term" means ... / (the "Term")
+DEFINITION_PATTERNS = [
+    re.compile(r'["“]([A-Z][\w\-\' ]{0,80}?)["”]\s+(?:shall\s+)?(?:means?|refers?\s+to|has\s+the\s+meaning)\b'),
+    re.compile(r'\((?:the\s+|each\s+|a\s+|an\s+|each\s+a\s+|each\s+an\s+)?["“]([A-Z][\w\-\' ]{0,80}?)["”]\)')
+]
+
+# Leading section number of a clause, e.g. "2.3 Payment Terms" or "Section 7."
+SECTION_HEADING = re.compile(
+    r'^\s*(?:(?:Section|Article|Clause)\s+)?(\d+(?:\.\d+)*)(?:[.)]|\s)',
+    re.IGNORECASE
+)
+
+# References such as "Section 2.3", "Sections 4.1 and 4.2", "Clause 9(b)"
+SECTION_REFERENCE = re.compile(
+    r'\b(?:Sections?|Articles?|Clauses?)\s+'
+    r'(\d+(?:\.\d+)*(?:\s*(?:,|and|or|through|to)\s*\d+(?:\.\d+)*)*)',
+    re.IGNORECASE
+)
+SECTION_NUMBER = re.compile(r'\d+(?:\.\d+)*')
+
+class TermAutomaton:
+    """Aho-Corasick automaton for matching all defined terms in one scan"""
+    
+    def __init__(self, terms: Iterable[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[str]] = [[]]
+        
+        for term in terms:
+            self._add(term)
+        self._build_failure_links()
+    
+    def _add(self, term: str) -> None:
+        """Insert a term into the trie"""
+        state = 0
+        for char in term:
+            if char not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+                self.goto[state][char] = len(self.goto) - 1
+            state = self.goto[state][char]
+        self.output[state].append(term)
+    
+    def _build_failure_links(self) -> None:
+        """Compute failure links breadth-first"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                if self.fail[next_state] == next_state:
+                    self.fail[next_state] = 0
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+    
+    def find(self, text: str) -> Iterator[Tuple[int, str]]:
+        """Yield (start offset, term) for every whole-word term occurrence"""
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for term in self.output[state]:
+                start = index - len(term) + 1
+                end = index + 1
+                if self._is_word_boundary(text, start - 1) and self._is_word_boundary(text, end):
+                    yield start, term
+    
+    @staticmethod
+    def _is_word_boundary(text: str, position: int) -> bool:
+        """Check that the character at position does not continue a word"""
+        if position < 0 or position >= len(text):
+            return True
+        return not text[position].isalnum()
+
+class ClauseIndex:
+    """Per-document index of defined terms and section numbers to clause ids"""
+    
+    def __init__(self):
+        self.terms: Dict[str, Any] = {}
+        self.sections: Dict[str, Any] = {}
+        self.clause_ids: List[Any] = []
+        self.dependencies: Dict[Any, List[Dict[str, Any]]] = {}
+        self.automaton: Optional[TermAutomaton] = None
+    
+    @classmethod
+    def build(cls, clauses: Iterable[Any]) -> 'ClauseIndex':
+        """Build the index in a single pass over the document's clauses"""
+        index = cls()
+        for clause in clauses:
+            clause_id = clause.id
+            text = clause.text or ''
+            index.clause_ids.append(clause_id)
+            
+            # Section number from the clause heading
+            heading = SECTION_HEADING.match(text)
+            if heading:
+                index.sections.setdefault(heading.group(1), clause_id)
+            
+            # Defined terms introduced by this clause (first definition wins)
+            for pattern in DEFINITION_PATTERNS:
+                for match in pattern.finditer(text):
+                    index.terms.setdefault(match.group(1).strip(), clause_id)
+        
+        index.automaton = TermAutomaton(index.terms.keys())
+        return index
+    
+    def resolve(self, clause_id: Any, text: str) -> List[Dict[str, Any]]:
+        """Resolve defined-term and section dependencies of a clause by lookup"""
+        dependencies = []
+        seen = set()
+        
+        def add(dependency_type: str, reference: str, target: Any) -> None:
+            if target is None or target == clause_id:
+                return
+            key = (dependency_type, reference, target)
+            if key in seen:
+                return
+            seen.add(key)
+            dependencies.append({
+                'type': dependency_type,
+                'reference': reference,
+                'clause_id': target
+            })
+        
+        # Defined terms used in the clause
+        for _, term in self.automaton.find(text):
+            add('defined_term', term, self.terms[term])
+        
+        # Explicit cross-references to other sections
+        for match in SECTION_REFERENCE.finditer(text):
+            for number in SECTION_NUMBER.findall(match.group(1)):
+                add('section_reference', number, self._lookup_section(number))
+        
+        self.dependencies[clause_id] = dependencies
+        return dependencies
+    
+    def _lookup_section(self, number: str) -> Any:
+        """Find the clause for a section number, falling back to its parent section"""
+        parts = number.split('.')
+        while parts:
+            clause_id = self.sections.get('.'.join(parts))
+            if clause_id is not None:
+                return clause_id
+            parts.pop()
+        return None
+    
+    def dependency_graph(self) -> Dict[str, Any]:
+        """Return the resolved dependency graph as nodes and edges"""
+        edges = [
+            {
+                'source': clause_id,
+                'target': dependency['clause_id'],
+                'type': dependency['type'],
+                'reference': dependency['reference']
+            }
+            for clause_id, dependencies in self.dependencies.items()
+            for dependency in dependencies
+        ]
+        return {
+            'nodes': list(self.clause_ids),
+            'edges': edges,
+            'defined_terms': dict(self.terms),
+            'sections': dict(self.sections)
+        }
\ No newline at end of file
@@ -0,0 +1,147 @@
+from typing import Dict, List, Any, Optional
+from collections import Counter
+from pydantic import BaseModel
+import re
+
+# Weighted phrases that identify each document type
+DOCUMENT_SIGNALS = {
+    'nda': {
+        'non-disclosure': 4, 'nondisclosure': 4, 'confidentiality agreement': 4,
+        'disclosing party': 3, 'receiving party': 3, 'confidential information': 2
+    },
+    'employment': {
+        'employment agreement': 4, 'employee': 2, 'employer': 2, 'salary': 2,
+        'termination of employment': 3, 'non-compete': 2
+    },
+    'lease': {
+        'lease agreement': 4, 'landlord': 3, 'tenant': 3, 'premises': 2, 'rent': 1
+    },
+    'services_agreement': {
+        'master services agreement': 4, 'statement of work': 3, 'service levels': 2,
+        'service provider': 2, 'deliverables': 2
+    },
+    'purchase_agreement': {
+        'purchase agreement': 4, 'purchase price': 3, 'seller': 2, 'buyer': 2, 'closing date': 2
+    },
+    'loan_agreement': {
+        'loan agreement': 4, 'borrower': 3, 'lender': 3, 'interest rate': 2, 'event of default': 2
+    },
+    'privacy_policy': {
+        'privacy policy': 4, 'personal data': 2, 'data subject': 3, 'cookies': 2, 'data controller': 2
+    }
+}
+
+# Minimal agent set per (task type, document type); None matches any type
+ROUTING_POLICY = {
+    ('contract_analysis', 'nda'): ['contract_review', 'compliance'],
+    ('contract_analysis', 'employment'): ['contract_review', 'compliance'],
+    ('contract_analysis', 'privacy_policy'): ['compliance'],
+    ('contract_analysis', None): ['contract_review', 'risk_assessment', 'compliance'],
+    ('risk_analysis', 'privacy_policy'): ['compliance'],
+    ('risk_analysis', None): ['risk_assessment', 'compliance']
+}
+
+SECTION_HEADING = re.compile(r'^\s*(?:section|article|clause)?\s*\d+(?:\.\d+)*[.)]?\s+\S', re.IGNORECASE | re.MULTILINE)
+CROSS_REFERENCE = re.compile(r'\b(?:sections?|articles?|clauses?|schedules?|exhibits?)\s+\d', re.IGNORECASE)
+
+class DocumentPrediction(BaseModel):
+    document_type: str
+    confidence: float
+    complexity: str
+    sample_size: int
+
+class RoutingDecision(BaseModel):
+    task_type: str
+    agents: List[str]
+    prediction: Optional[DocumentPrediction]
+    overridden: bool = False
+    reason: str
+
+class DocumentRouter:
+    """Fast pre-classifier that picks the minimal agent set for a document"""
+    
+    def __init__(self, sample_bytes: int = 16384, min_score: float = 4.0):
+        self.sample_bytes = sample_bytes
+        self.min_score = min_score
+        phrases = sorted({p for signals in DOCUMENT_SIGNALS.values() for p in signals}, key=len, reverse=True)
+        self.signal_pattern = re.compile(r'\b(?:' + '|'.join(re.escape(p) for p in phrases) + r')\b')
+    
+    def predict(self, document: str) -> DocumentPrediction:
+        """Predict document type and complexity from the first sample_bytes of text"""
+        sample = document[:self.sample_bytes]
+        matches = Counter(self.signal_pattern.findall(sample.lower()))
+        
+        scores = {
+            document_type: sum(weight * matches[phrase] for phrase, weight in signals.items())
+            for document_type, signals in DOCUMENT_SIGNALS.items()
+        }
+        document_type, top_score = max(scores.items(), key=lambda item: item[1])
+        total = sum(scores.values())
+        
+        if top_score < self.min_score:
+            document_type = 'general'
+        
+        return DocumentPrediction(
+            document_type=document_type,
+            confidence=top_score / total if total else 0.0,
+            complexity=self._complexity(document, sample),
+            sample_size=len(sample)
+        )
+    
+    def route(
+        self,
+        task_type: str,
+        document: Optional[str],
+        default_agents: List[str]
+    ) -> RoutingDecision:
+        """Map a prediction to the minimal agent set"""
+        if not document or not any(key[0] == task_type for key in ROUTING_POLICY):
+            return RoutingDecision(
+                task_type=task_type,
+                agents=default_agents,
+                prediction=None,
+                reason='workflow'
+            )
+        
+        prediction = self.predict(document)
+        agents = ROUTING_POLICY.get(
+            (task_type, prediction.document_type),
+            ROUTING_POLICY.get((task_type, None), default_agents)
+        )
+        
+        # High-complexity documents always get the full workflow
+        if prediction.complexity == 'high':
+            agents = default_agents
+        
+        return RoutingDecision(
+            task_type=task_type,
+            agents=list(agents),
+            prediction=prediction,
+            reason='policy'
+        )
+    
+    def override(self, task_type: str, agents: List[str]) -> RoutingDecision:
+        """Record a caller-supplied agent set"""
+        return RoutingDecision(
+            task_type=task_type,
+            agents=list(agents),
+            prediction=None,
+            overridden=True,
+            reason='caller_override'
+        )
+    
+    def _complexity(self, document: str, sample: str) -> str:
+        """Estimate complexity from length, structure and cross-referencing"""
+        size_kb = len(document) / 1024
+        sections = len(SECTION_HEADING.findall(sample))
+        references = len(CROSS_REFERENCE.findall(sample))
+        
+        # Scale sample counts up to the whole document
+        scale = max(len(document) / max(len(sample), 1), 1)
+        score = size_kb / 40 + sections * scale / 40 + references * scale / 20
+        
+        if score < 1:
+            return 'low'
+        if score < 4:
+            return 'medium'
+        return 'high'
\ No newline at end of file
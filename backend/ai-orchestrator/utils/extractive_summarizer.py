@@ -0,0 +1,100 @@
+from typing import Dict, List, Optional
+from collections import Counter
+import logging
+import re
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?;:])\s+(?=[A-Z0-9("“])')
+WORD = re.compile(r'[a-z0-9]+')
+
+STOP_WORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or such that the
+their this to was were which will with shall may any all under other each
+""".split())
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences on terminal punctuation"""
+    return [s.strip() for s in SENTENCE_BOUNDARY.split(text) if s.strip()]
+
+class ExtractiveSummarizer:
+    """TextRank-style extractive summaries over TF-IDF sentence vectors"""
+    
+    def __init__(
+        self,
+        num_sentences: int = 5,
+        damping: float = 0.85,
+        max_iterations: int = 50,
+        tolerance: float = 1e-6,
+        max_sentences: int = 1500
+    ):
+        self.num_sentences = num_sentences
+        self.damping = damping
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+        self.max_sentences = max_sentences
+    
+    def summarize(self, text: str, num_sentences: Optional[int] = None) -> str:
+        """Return the most central sentences in document order"""
+        sentences = split_sentences(text)
+        if len(sentences) > self.max_sentences:
+            # Ranking is quadratic in sentences, so only the opening of very long documents is ranked
+            logger.warning(
+                "Summarising the first %d of %d sentences; raise max_sentences to rank the rest",
+                self.max_sentences, len(sentences)
+            )
+            sentences = sentences[:self.max_sentences]
+        return ' '.join(self.rank(sentences, num_sentences))
+    
+    def rank(self, sentences: List[str], num_sentences: Optional[int] = None) -> List[str]:
+        """Select the top-ranked sentences, preserving their original order"""
+        limit = num_sentences or self.num_sentences
+        if len(sentences) <= limit:
+            return list(sentences)
+        
+        scores = self._centrality(self._tfidf(sentences))
+        top = np.argsort(-scores, kind='stable')[:limit]
+        return [sentences[i] for i in sorted(top)]
+    
+    def _tfidf(self, sentences: List[str]) -> np.ndarray:
+        """Build L2-normalised TF-IDF vectors for each sentence"""
+        counts: List[Dict[str, int]] = []
+        vocabulary: Dict[str, int] = {}
+        for sentence in sentences:
+            terms = Counter(w for w in WORD.findall(sentence.lower()) if w not in STOP_WORDS)
+            for term in terms:
+                vocabulary.setdefault(term, len(vocabulary))
+            counts.append(terms)
+        
+        matrix = np.zeros((len(sentences), max(len(vocabulary), 1)), dtype=np.float32)
+        for row, terms in enumerate(counts):
+            for term, count in terms.items():
+                matrix[row, vocabulary[term]] = count
+        
+        # Sublinear term frequency with smoothed inverse document frequency
+        document_frequency = np.count_nonzero(matrix, axis=0)
+        idf = np.log((1 + len(sentences)) / (1 + document_frequency)) + 1
+        matrix = np.log1p(matrix) * idf
+        
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
+    
+    def _centrality(self, vectors: np.ndarray) -> np.ndarray:
+        """Score sentences by PageRank over their cosine similarity graph"""
+        n = vectors.shape[0]
+        similarity = vectors @ vectors.T
+        np.fill_diagonal(similarity, 0)
+        
+        # Row-normalise into a transition matrix; isolated sentences jump uniformly
+        row_sums = similarity.sum(axis=1, keepdims=True)
+        transition = np.where(row_sums > 0, similarity / np.where(row_sums == 0, 1, row_sums), 1.0 / n)
+        
+        scores = np.full(n, 1.0 / n, dtype=np.float32)
+        teleport = (1 - self.damping) / n
+        for _ in range(self.max_iterations):
+            updated = teleport + self.damping * (transition.T @ scores)
+            if np.abs(updated - scores).sum() < self.tolerance:
+                return updated
+            scores = updated
+        return scores
\ No newline at end of file
@@ -0,0 +1,208 @@
+from typing import Dict, List, Any, NamedTuple, Optional
+import logging
+import os
+import sys
+
+logger = logging.getLogger(__name__)
+
+# Native thread pools that size themselves from these at import time
+THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'NUMEXPR_NUM_THREADS')
+
+CPU_TOPOLOGY = '/sys/devices/system/cpu/cpu{}/topology/{}'
+
+# Scheduler whose layout was applied to this process, if any
+_active_scheduler: Optional['InferenceScheduler'] = None
+
+class CPULayout(NamedTuple):
+    workers: int
+    threads_per_worker: int
+    core_sets: List[List[int]]
+
+def available_cores() -> List[int]:
+    """Logical CPUs this process may run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def _read_topology(cpu: int, name: str) -> Optional[int]:
+    try:
+        with open(CPU_TOPOLOGY.format(cpu, name)) as f:
+            return int(f.read())
+    except (OSError, ValueError):
+        return None
+
+def physical_cores(cores: Optional[List[int]] = None) -> List[List[int]]:
+    """Group logical CPUs into physical cores, ordered by socket and core id"""
+    groups: Dict[tuple, List[int]] = {}
+    for cpu in cores if cores is not None else available_cores():
+        package = _read_topology(cpu, 'physical_package_id')
+        core = _read_topology(cpu, 'core_id')
+        key = (package, core) if package is not None and core is not None else (cpu, cpu)
+        groups.setdefault(key, []).append(cpu)
+    return [groups[key] for key in sorted(groups)]
+
+def plan_layout(
+    workers: Optional[int] = None,
+    threads_per_worker: Optional[int] = None,
+    cores: Optional[List[int]] = None,
+    use_smt: bool = False
+) -> CPULayout:
+    """Split the host's cores into contiguous per-worker core sets"""
+    # SMT siblings share execution units, so GEMM-heavy inference skips them by default
+    units = [cpu for group in physical_cores(cores) for cpu in (group if use_smt else group[:1])]
+    
+    if workers and not threads_per_worker:
+        threads_per_worker = max(1, len(units) // workers)
+    elif threads_per_worker and not workers:
+        workers = max(1, len(units) // threads_per_worker)
+    elif not workers:
+        workers, threads_per_worker = 1, len(units)
+    
+    if workers * threads_per_worker > len(units):
+        logger.warning(
+            "CPU layout %d workers x %d threads oversubscribes %d cores",
+            workers, threads_per_worker, len(units)
+        )
+    
+    # Wrap around when oversubscribed so every worker still gets a core set
+    core_sets = [
+        [units[(index * threads_per_worker + offset) % len(units)] for offset in range(threads_per_worker)]
+        for index in range(workers)
+    ]
+    return CPULayout(workers, threads_per_worker, core_sets)
+
+def apply_thread_settings(threads: int) -> None:
+    """Size native and torch thread pools for one worker"""
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(threads)
+    
+    try:
+        import torch
+    except ImportError:
+        return
+    
+    torch.set_num_threads(threads)
+    try:
+        # Inter-op parallelism only adds contention next to sized intra-op pools
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Can only be set before the first parallel region runs
+        pass
+
+def effective_thread_settings() -> Dict[str, Any]:
+    """Thread pool sizes and cores actually in effect for this process"""
+    settings: Dict[str, Any] = {name: os.environ.get(name) for name in THREAD_ENV_VARS}
+    settings['cores'] = available_cores()
+    # Only report torch if something already imported it; importing it here would be costly
+    torch = sys.modules.get('torch')
+    if torch is not None:
+        settings['torch_threads'] = torch.get_num_threads()
+        settings['torch_interop_threads'] = torch.get_num_interop_threads()
+    return settings
+
+def active_scheduler() -> Optional['InferenceScheduler']:
+    """The scheduler that configured this process, or None if none has"""
+    return _active_scheduler
+
+def read_load() -> Dict[str, float]:
+    """Load averages and run-queue length from /proc/loadavg"""
+    with open('/proc/loadavg') as f:
+        fields = f.read().split()
+    running, total = fields[3].split('/')
+    return {
+        'load_1m': float(fields[0]),
+        'load_5m': float(fields[1]),
+        'load_15m': float(fields[2]),
+        'run_queue': int(running),
+        'threads': int(total)
+    }
+
+def read_cpu_times() -> Dict[str, List[int]]:
+    """Cumulative per-CPU jiffies from /proc/stat"""
+    times = {}
+    with open('/proc/stat') as f:
+        for line in f:
+            if not line.startswith('cpu'):
+                break
+            fields = line.split()
+            times[fields[0]] = [int(value) for value in fields[1:]]
+    return times
+
+def cpu_utilisation(previous: Dict[str, List[int]], current: Dict[str, List[int]]) -> Dict[str, float]:
+    """Busy fraction per CPU between two /proc/stat samples"""
+    utilisation = {}
+    for cpu, values in current.items():
+        before = previous.get(cpu)
+        if before is None:
+            continue
+        deltas = [now - then for now, then in zip(values, before)]
+        total = sum(deltas)
+        # Idle and iowait are the fourth and fifth columns
+        idle = sum(deltas[3:5])
+        utilisation[cpu] = (total - idle) / total if total else 0.0
+    return utilisation
+
+class InferenceScheduler:
+    """Explicit threads-per-worker x workers layout for CPU inference"""
+    
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        threads_per_worker: Optional[int] = None,
+        pin_workers: bool = False,
+        use_smt: bool = False
+    ):
+        self.layout = plan_layout(workers, threads_per_worker, use_smt=use_smt)
+        self.pin_workers = pin_workers
+        self.worker_index: Optional[int] = None
+        self._cpu_times = read_cpu_times() if os.path.exists('/proc/stat') else {}
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'InferenceScheduler':
+        """Build a scheduler from agent configuration"""
+        return cls(
+            workers=config.get('cpu_workers'),
+            threads_per_worker=config.get('cpu_threads_per_worker'),
+            pin_workers=config.get('cpu_pin_workers', False),
+            use_smt=config.get('cpu_use_smt', False)
+        )
+    
+    def configure_worker(self, worker_index: int = 0) -> List[int]:
+        """Apply the thread count, and optionally the core set, for this worker process"""
+        global _active_scheduler
+        self.worker_index = worker_index
+        _active_scheduler = self
+        core_set = self.layout.core_sets[worker_index % self.layout.workers]
+        apply_thread_settings(self.layout.threads_per_worker)
+        
+        if self.pin_workers and hasattr(os, 'sched_setaffinity'):
+            os.sched_setaffinity(0, core_set)
+        
+        logger.info(
+            "Inference worker %d: %d threads on cores %s%s",
+            worker_index, self.layout.threads_per_worker, core_set,
+            " (pinned)" if self.pin_workers else ""
+        )
+        return core_set
+    
+    def stats(self) -> Dict[str, Any]:
+        """Layout in effect, load and per-CPU utilisation since the previous call"""
+        stats: Dict[str, Any] = {'configured': self.worker_index is not None}
+        # A planned layout only describes this process once it has been applied
+        if self.worker_index is not None:
+            stats.update({
+                'workers': self.layout.workers,
+                'threads_per_worker': self.layout.threads_per_worker,
+                'worker_index': self.worker_index,
+                'pinned': self.pin_workers
+            })
+        stats['thread_settings'] = effective_thread_settings()
+        
+        if os.path.exists('/proc/loadavg'):
+            stats.update(read_load())
+        if self._cpu_times:
+            current = read_cpu_times()
+            stats['utilisation'] = cpu_utilisation(self._cpu_times, current)
+            self._cpu_times = current
+        
+        return stats
\ No newline at end of file
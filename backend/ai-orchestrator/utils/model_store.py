@@ -0,0 +1,144 @@
+from typing import Dict, List, Any, Optional
+import argparse
+import logging
+import os
+import re
+import sys
+import time
+from safetensors.torch import load_file
+from transformers import (
+    AutoConfig,
+    AutoModelForSeq2SeqLM,
+    AutoModelForSequenceClassification,
+    AutoTokenizer,
+    pipeline
+)
+from transformers.modeling_utils import no_init_weights
+
+logger = logging.getLogger(__name__)
+
+LEGAL_BERT = "nlpaueb/legal-bert-base-uncased"
+
+# Models loaded by ContractReviewAgent and the pipeline task each one serves
+MODEL_SET = {
+    LEGAL_BERT: "sequence-classification",
+    "legal-bert-contract-clauses": "text-classification",
+    "legal-bert-risk-analysis": "text-classification",
+    "legal-bert-summarizer": "summarization"
+}
+
+WEIGHTS_FILE = "model.safetensors"
+
+class ModelStore:
+    """Load transformer weights from memory-mapped safetensors files"""
+    
+    def __init__(self, root_dir: Optional[str] = None):
+        # An empty root_dir disables the store even when MODEL_STORE_DIR is set
+        self.root_dir = os.getenv('MODEL_STORE_DIR') if root_dir is None else root_dir
+    
+    def model_dir(self, model_name: str) -> str:
+        """Directory holding the converted files for a model"""
+        return os.path.join(self.root_dir, model_name.replace('/', '--'))
+    
+    def is_converted(self, model_name: str) -> bool:
+        """Check whether a model has been pre-converted into the store"""
+        if not self.root_dir:
+            return False
+        return os.path.exists(os.path.join(self.model_dir(model_name), WEIGHTS_FILE))
+    
+    def convert(self, model_name: str, task: str) -> str:
+        """Pre-convert a model into a single safetensors file plus tokenizer"""
+        target_dir = self.model_dir(model_name)
+        model = self._model_class(task).from_pretrained(model_name)
+        model.save_pretrained(target_dir, safe_serialization=True, max_shard_size="100GB")
+        AutoTokenizer.from_pretrained(model_name).save_pretrained(target_dir)
+        return target_dir
+    
+    def load_tokenizer(self, model_name: str) -> Any:
+        """Load a tokenizer, preferring the converted copy"""
+        source = self.model_dir(model_name) if self.is_converted(model_name) else model_name
+        return AutoTokenizer.from_pretrained(source)
+    
+    def load_model(self, model_name: str, task: str) -> Any:
+        """Load a model whose parameters are views onto the mapped weights file"""
+        model_class = self._model_class(task)
+        if not self.is_converted(model_name):
+            logger.warning(f"Model {model_name} not in store, loading private copy")
+            return model_class.from_pretrained(model_name).eval()
+        
+        model_dir = self.model_dir(model_name)
+        config = AutoConfig.from_pretrained(model_dir)
+        
+        # Build the module without initialising weights that are replaced below
+        with no_init_weights():
+            model = model_class.from_config(config)
+        
+        # Tensors from load_file are views onto the mapped file; assign=True keeps
+        # them as parameters, so workers on a host share the page-cache pages
+        weights_path = os.path.join(model_dir, WEIGHTS_FILE)
+        state_dict = load_file(weights_path, device="cpu")
+        # Not strict, because tied weights are saved once and restored by tie_weights
+        result = model.load_state_dict(state_dict, strict=False, assign=True)
+        model.tie_weights()
+        check_loaded_keys(model, result.missing_keys, result.unexpected_keys, weights_path)
+        return model.eval()
+    
+    def load_pipeline(self, task: str, model_name: str) -> Any:
+        """Build a transformers pipeline on top of a mapped model"""
+        model = self.load_model(model_name, task)
+        tokenizer = self.load_tokenizer(model_name)
+        return pipeline(task, model=model, tokenizer=tokenizer)
+    
+    @staticmethod
+    def _model_class(task: str) -> Any:
+        """Resolve the auto model class for a task"""
+        if task == "summarization":
+            return AutoModelForSeq2SeqLM
+        return AutoModelForSequenceClassification
+
+class WeightsMismatchError(Exception):
+    """Raised when a weights file does not match the model it is loaded into"""
+
+def check_loaded_keys(model: Any, missing_keys: List[str], unexpected_keys: List[str], source: str) -> None:
+    """Reject weights with missing or extra parameters, apart from tied and ignorable keys"""
+    allowed_missing = [
+        *(getattr(model, '_tied_weights_keys', None) or []),
+        *(getattr(model, '_keys_to_ignore_on_load_missing', None) or [])
+    ]
+    allowed_unexpected = getattr(model, '_keys_to_ignore_on_load_unexpected', None) or []
+    missing = [key for key in missing_keys if not any(re.search(pattern, key) for pattern in allowed_missing)]
+    unexpected = [key for key in unexpected_keys if not any(re.search(pattern, key) for pattern in allowed_unexpected)]
+    if missing or unexpected:
+        raise WeightsMismatchError(
+            f"Weights in {source} do not match {type(model).__name__}: "
+            f"missing {missing[:5]}{'...' if len(missing) > 5 else ''}, "
+            f"unexpected {unexpected[:5]}{'...' if len(unexpected) > 5 else ''}"
+        )
+
+def convert_model_set(root_dir: str, models: Optional[List[str]] = None) -> Dict[str, float]:
+    """Convert the agent model set into the store, returning seconds per model"""
+    store = ModelStore(root_dir)
+    timings = {}
+    for model_name in models or list(MODEL_SET):
+        start_time = time.time()
+        store.convert(model_name, MODEL_SET[model_name])
+        timings[model_name] = time.time() - start_time
+    return timings
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Pre-convert agent models to memory-mappable safetensors files"
+    )
+    parser.add_argument('output_dir', nargs='?', default=os.getenv('MODEL_STORE_DIR'))
+    parser.add_argument('--model', action='append', choices=list(MODEL_SET), help="Convert only these models")
+    args = parser.parse_args(argv)
+    
+    if not args.output_dir:
+        parser.error("output_dir is required when MODEL_STORE_DIR is not set")
+    
+    for model_name, elapsed in convert_model_set(args.output_dir, args.model).items():
+        print(f"Converted {model_name} in {elapsed:.1f}s")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
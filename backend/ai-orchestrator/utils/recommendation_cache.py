@@ -0,0 +1,104 @@
+from typing import Dict, List, Any, Awaitable, Callable, Optional, Tuple
+from collections import OrderedDict
+from string import Template
+import asyncio
+
+def risk_factor_names(factors: Any) -> List[str]:
+    """Sorted, distinct names of a risk's factors, whether given as strings or dicts"""
+    names = set()
+    for factor in factors or []:
+        if isinstance(factor, dict):
+            factor = factor.get('type') or factor.get('name') or factor.get('category')
+        if factor:
+            names.add(str(factor))
+    return sorted(names)
+
+def issue_requirement(issue: Dict[str, Any]) -> Optional[str]:
+    """The requirement a compliance issue states, if any"""
+    return issue.get('requirement') or issue.get('description')
+
+def recommendation_key(kind: str, item: Dict[str, Any], jurisdiction: Optional[str]) -> Tuple[str, str, str]:
+    """Key recommendations by rule id and whether a requirement is stated, or by clause type, risk level and risk factors, and jurisdiction"""
+    if kind == 'compliance':
+        identifier = item.get('rule_id') or item.get('regulation_id') or item.get('regulation') or item.get('category')
+        if isinstance(identifier, dict):
+            identifier = identifier.get('id') or identifier.get('name')
+        # The requirement text is a slot, but issues without one get a template without it
+        identifier = '/'.join([str(identifier or ''), 'requirement' if issue_requirement(item) else ''])
+    else:
+        # A risk level alone is shared by unrelated clauses, so the advice is keyed on what makes the clause risky
+        identifier = '/'.join([
+            str(item.get('clause_type') or item.get('category') or ''),
+            str(item.get('risk_level') or ''),
+            ','.join(risk_factor_names(item.get('risk_factors')))
+        ])
+    return (kind, str(identifier or ''), jurisdiction or '')
+
+def template_literal(value: Any) -> str:
+    """Text placed into a template verbatim, so a '$' in it is not read as a slot"""
+    return str(value).replace('$', '$$')
+
+def fill_slots(recommendation: Any, slots: Dict[str, Any]) -> Any:
+    """Substitute clause specifics into ${slot} placeholders, leaving unknown slots intact"""
+    if isinstance(recommendation, str):
+        return Template(recommendation).safe_substitute(slots)
+    if isinstance(recommendation, dict):
+        return {key: fill_slots(value, slots) for key, value in recommendation.items()}
+    if isinstance(recommendation, list):
+        return [fill_slots(value, slots) for value in recommendation]
+    return recommendation
+
+class RecommendationCache:
+    """LRU cache of recommendation templates with in-flight deduplication"""
+    
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.entries: OrderedDict = OrderedDict()
+        self.in_flight: Dict[Tuple, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+    
+    async def get_or_create(self, key: Tuple, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached template for key, generating it at most once"""
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        
+        # Concurrent requests for the same key wait on the first generation
+        if key in self.in_flight:
+            self.hits += 1
+            return await asyncio.shield(self.in_flight[key])
+        
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self.in_flight[key] = future
+        try:
+            template = await factory()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieve the exception so it is not reported when nobody else waited
+            future.exception()
+            raise
+        finally:
+            del self.in_flight[key]
+        
+        future.set_result(template)
+        self.entries[key] = template
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return template
+    
+    def invalidate(self, key: Optional[Tuple] = None) -> None:
+        """Drop one template, or all of them"""
+        if key is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(key, None)
+    
+    def stats(self) -> Dict[str, int]:
+        """Cache hit and miss counts"""
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.entries)}
\ No newline at end of file
@@ -0,0 +1,137 @@
+from typing import Dict, List, Any, Optional
+import hashlib
+import re
+
+# Result fields holding deduplicated items, mapped to their merged field
+ITEM_FIELDS = {
+    'compliance_issues': 'compliance_issues',
+    'issues': 'compliance_issues',
+    'violations': 'compliance_issues',
+    'risks': 'risks'
+}
+
+WHITESPACE = re.compile(r'\s+')
+
+def _as_dict(item: Any) -> Dict[str, Any]:
+    """Normalise pydantic models and plain values to dicts"""
+    if isinstance(item, dict):
+        return item
+    if hasattr(item, 'dict'):
+        return item.dict()
+    return {'value': item}
+
+def _clause_key(item: Dict[str, Any]) -> str:
+    """Stable hash of the clause an item refers to"""
+    if item.get('clause_hash'):
+        return str(item['clause_hash'])
+    
+    clause = item.get('clause')
+    text = item.get('clause_text') or (clause.get('text') if isinstance(clause, dict) else clause)
+    if text:
+        normalized = WHITESPACE.sub(' ', str(text)).strip().lower()
+        return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+    
+    return str(item.get('clause_id', ''))
+
+def _rule_key(item: Dict[str, Any]) -> str:
+    """Rule or regulation identifier of an item"""
+    rule = item.get('rule_id') or item.get('regulation_id') or item.get('regulation') or ''
+    if isinstance(rule, dict):
+        rule = rule.get('id') or rule.get('name') or ''
+    return str(rule)
+
+def _confidence(item: Dict[str, Any]) -> float:
+    """Confidence used to pick which duplicate to keep"""
+    for key in ('confidence', 'score', 'risk_score'):
+        value = item.get(key)
+        if isinstance(value, (int, float)):
+            return float(value)
+    return 0.0
+
+def fingerprint(kind: str, item: Dict[str, Any]) -> str:
+    """Fingerprint an issue or risk by clause, rule and category"""
+    category = item.get('category') or item.get('type') or kind
+    key = '|'.join((kind, _clause_key(item), _rule_key(item), str(category)))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+class ResultMerge:
+    """Incrementally merged, deduplicated view of agent results"""
+    
+    def __init__(self):
+        self.items: Dict[str, Dict[str, Dict[str, Any]]] = {
+            'compliance_issues': {},
+            'risks': {}
+        }
+        self.fields: Dict[str, Any] = {}
+        self.field_sources: Dict[str, str] = {}
+        self.conflicts: Dict[str, Dict[str, Any]] = {}
+        self.agents: List[str] = []
+        self.duplicates_removed = 0
+    
+    def add(self, agent_type: str, result: Dict[str, Any]) -> None:
+        """Fold one agent's result into the merge"""
+        self.agents.append(agent_type)
+        for key, value in (result or {}).items():
+            if key == 'agent_type':
+                continue
+            merged_field = ITEM_FIELDS.get(key)
+            if merged_field and isinstance(value, list):
+                for item in value:
+                    self._add_item(merged_field, agent_type, _as_dict(item))
+            else:
+                self._add_field(agent_type, key, value)
+    
+    def _add_item(self, merged_field: str, agent_type: str, item: Dict[str, Any]) -> None:
+        """Keep the highest-confidence copy of each fingerprinted item"""
+        kind = 'risk' if merged_field == 'risks' else 'issue'
+        key = fingerprint(kind, item)
+        entry = self.items[merged_field].get(key)
+        
+        if entry is None:
+            self.items[merged_field][key] = {'item': item, 'sources': [agent_type]}
+            return
+        
+        self.duplicates_removed += 1
+        if agent_type not in entry['sources']:
+            entry['sources'].append(agent_type)
+        if _confidence(item) > _confidence(entry['item']):
+            entry['item'] = item
+    
+    def _add_field(self, agent_type: str, key: str, value: Any) -> None:
+        """Merge scalar fields, keeping the first value and recording disagreements"""
+        if key not in self.fields:
+            self.fields[key] = value
+            self.field_sources[key] = agent_type
+        elif self.fields[key] != value:
+            self.conflicts.setdefault(key, {self.field_sources[key]: self.fields[key]})[agent_type] = value
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Compact merged result with per-item provenance"""
+        merged = dict(self.fields)
+        for merged_field, entries in self.items.items():
+            merged[merged_field] = [
+                {**entry['item'], 'fingerprint': key, 'sources': entry['sources']}
+                for key, entry in entries.items()
+            ]
+        merged['agents'] = list(self.agents)
+        merged['duplicates_removed'] = self.duplicates_removed
+        if self.conflicts:
+            merged['conflicts'] = self.conflicts
+        return merged
+
+class ResultAggregator:
+    def create_merge(self) -> ResultMerge:
+        """Start a merge that agents fold into as they finish"""
+        return ResultMerge()
+    
+    async def aggregate(
+        self,
+        results: List[Dict[str, Any]],
+        merge: Optional[ResultMerge] = None
+    ) -> Dict[str, Any]:
+        """Aggregate agent results into one deduplicated result"""
+        if merge is None:
+            merge = self.create_merge()
+            for index, result in enumerate(results):
+                merge.add(result.get('agent_type', f'agent_{index}'), result)
+        return merge.to_dict()
\ No newline at end of file
@@ -0,0 +1,19 @@
+from typing import Any, Optional
+import weakref
+
+class SummaryNotFound(KeyError):
+    """Raised for a summary id that was never issued or whose result has expired"""
+
+# Agents in this process that schedule abstractive summaries, so one can be fetched by its id alone
+_owners: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+def register_summary_owner(owner: Any) -> None:
+    """Make an agent's pending summaries reachable through get_abstractive_summary"""
+    _owners.add(owner)
+
+async def get_abstractive_summary(summary_id: str, timeout: Optional[float] = None) -> str:
+    """Wait for an abstractive summary scheduled by any agent in this process"""
+    for owner in list(_owners):
+        if summary_id in owner.pending_summaries:
+            return await owner.get_abstractive_summary(summary_id, timeout)
+    raise SummaryNotFound(f"Summary {summary_id} is unknown or has expired")
\ No newline at end of file
@@ -1,13 +1,31 @@
-from fastapi import FastAPI, HTTPException, Security
+from fastapi import FastAPI, HTTPException, Request, Security
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
+from collections import OrderedDict
 import uuid
 from datetime import datetime
+from .template_cache import get_template_cache
+from .conversion_cache import get_conversion_cache
+from .enhancement_cache import get_enhancement_cache
+from .version_store import VersionStore
+from .conversion_executor import ConversionQueueFull, ConversionTimeout, get_conversion_executor
+from .document_generator import DocumentGenerator
+from .bulk_generator import BulkGenerator, OUTPUT_FORMATS, ROW_FORMATS, aiter_lines, aiter_rows
 
 app = FastAPI()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+@app.exception_handler(ConversionQueueFull)
+async def conversion_queue_full(request: Request, exc: ConversionQueueFull):
+    """Shed load while every conversion worker is busy"""
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "5"})
+
+@app.exception_handler(ConversionTimeout)
+async def conversion_timeout(request: Request, exc: ConversionTimeout):
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
+
 class Document(BaseModel):
     id: str
     title: str
@@ -21,7 +39,8 @@ class Document(BaseModel):
 
 class DocumentService:
     def __init__(self):
-        self.version_history = {}
+        # Snapshots every few versions with line deltas between them, instead of a full copy per version
+        self.version_history = VersionStore()
         
     async def create_document(self, doc_data: dict) -> Document:
         doc_id = str(uuid.uuid4())
@@ -32,24 +51,63 @@ class DocumentService:
             updated_at=datetime.now(),
             **doc_data
         )
-        self.version_history[doc_id] = [document]
+        self.version_history.add(doc_id, document.content, document.dict(exclude={'content'}))
         return document
     
     async def update_document(self, doc_id: str, updates: dict) -> Document:
         if doc_id not in self.version_history:
-            raise HTTPException(status_code=404, message="Document not found")
+            raise HTTPException(status_code=404, detail="Document not found")
             
-        current_doc = self.version_history[doc_id][-1]
-        new_version = Document(
+        current_doc = await self.get_document(doc_id)
+        new_version = Document(**{
             **current_doc.dict(),
             **updates,
-            version=current_doc.version + 1,
-            updated_at=datetime.now()
-        )
-        self.version_history[doc_id].append(new_version)
+            'version': current_doc.version + 1,
+            'updated_at': datetime.now()
+        })
+        self.version_history.add(doc_id, new_version.content, new_version.dict(exclude={'content'}))
         return new_version
+    
+    async def get_document(self, doc_id: str, version: Optional[int] = None) -> Document:
+        """Latest version by default, or an earlier one rebuilt from its snapshot"""
+        if doc_id not in self.version_history:
+            raise HTTPException(status_code=404, detail="Document not found")
+        try:
+            metadata = self.version_history.metadata(doc_id, version)
+            content = self.version_history.latest(doc_id) if version is None else self.version_history.get(doc_id, version)
+        except KeyError:
+            raise HTTPException(status_code=404, detail="Document version not found")
+        return Document(content=content, **metadata)
+    
+    async def list_versions(self, doc_id: str) -> List[Dict]:
+        """Version metadata without loading content"""
+        if doc_id not in self.version_history:
+            raise HTTPException(status_code=404, detail="Document not found")
+        return self.version_history.list_versions(doc_id)
 
 document_service = DocumentService()
+bulk_generator = BulkGenerator()
+
+# Progress of recent bulk jobs, oldest dropped first
+bulk_jobs: Dict[str, Dict] = OrderedDict()
+MAX_BULK_JOBS = 1000
+
+STREAM_MEDIA_TYPES = {
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "pdf": "application/pdf",
+    "html": "text/html",
+    "text": "text/plain",
+    "markdown": "text/markdown"
+}
+
+_document_generator: Optional[DocumentGenerator] = None
+
+def get_document_generator() -> DocumentGenerator:
+    """Create the generator, and its NLP models, on first use"""
+    global _document_generator
+    if _document_generator is None:
+        _document_generator = DocumentGenerator()
+    return _document_generator
 
 @app.post("/documents/", response_model=Document)
 async def create_document(doc_data: dict, token: str = Security(oauth2_scheme)):
@@ -57,4 +115,91 @@ async def create_document(doc_data: dict, token: str = Security(oauth2_scheme)):
 
 @app.put("/documents/{doc_id}", response_model=Document)
 async def update_document(doc_id: str, updates: dict, token: str = Security(oauth2_scheme)):
-    return await document_service.update_document(doc_id, updates) 
\ No newline at end of file
+    return await document_service.update_document(doc_id, updates) 
+
+@app.get("/documents/{doc_id}/versions")
+async def list_document_versions(doc_id: str, token: str = Security(oauth2_scheme)):
+    return await document_service.list_versions(doc_id)
+
+@app.get("/documents/{doc_id}/versions/{version}", response_model=Document)
+async def get_document_version(doc_id: str, version: int, token: str = Security(oauth2_scheme)):
+    return await document_service.get_document(doc_id, version)
+
+@app.post("/templates/{template_id}/invalidate")
+async def invalidate_template(template_id: str, token: str = Security(oauth2_scheme)):
+    """Drop compiled copies of a template after template-service updates it"""
+    return {"template_id": template_id, "invalidated": get_template_cache().invalidate(template_id)}
+
+@app.get("/templates/cache/metrics")
+async def template_cache_metrics(token: str = Security(oauth2_scheme)):
+    return get_template_cache().metrics()
+
+@app.get("/conversions/cache/metrics")
+async def conversion_cache_metrics(token: str = Security(oauth2_scheme)):
+    return get_conversion_cache().metrics()
+
+@app.get("/nlp/cache/metrics")
+async def enhancement_cache_metrics(token: str = Security(oauth2_scheme)):
+    return get_enhancement_cache().metrics()
+
+@app.get("/conversions/metrics")
+async def conversion_metrics(token: str = Security(oauth2_scheme)):
+    return get_conversion_executor().metrics()
+
+@app.post("/documents/bulk")
+async def bulk_generate(
+    request: Request,
+    template_id: str,
+    format: str = "docx",
+    output: str = "zip",
+    row_format: Optional[str] = None,
+    name_field: Optional[str] = None,
+    token: str = Security(oauth2_scheme)
+):
+    """Generate one document per streamed JSONL or CSV row, streaming the results back"""
+    row_format = row_format or ("csv" if "csv" in request.headers.get("content-type", "") else "jsonl")
+    if output not in OUTPUT_FORMATS or row_format not in ROW_FORMATS:
+        raise HTTPException(status_code=400, detail="Unsupported output or row format")
+    
+    # Compile the template once for the whole job
+    template = await get_document_generator().compiled_template(template_id)
+    
+    job_id = str(uuid.uuid4())
+    bulk_jobs[job_id] = {"status": "running", "rendered": 0, "completed": 0, "errors": 0}
+    while len(bulk_jobs) > MAX_BULK_JOBS:
+        bulk_jobs.popitem(last=False)
+    
+    async def stream():
+        job = bulk_jobs.get(job_id, {})
+        try:
+            rows = aiter_rows(aiter_lines(request.stream()), row_format)
+            async for chunk in bulk_generator.generate(template, rows, format, output, name_field, job.update):
+                yield chunk
+            job["status"] = "completed"
+        except Exception as e:
+            job.update(status="failed", error=str(e))
+            raise
+    
+    media_type = "application/zip" if output == "zip" else "application/x-ndjson"
+    return StreamingResponse(stream(), media_type=media_type, headers={
+        "X-Job-Id": job_id,
+        "Content-Disposition": f'attachment; filename="{job_id}.{"zip" if output == "zip" else "jsonl"}"'
+    })
+
+@app.get("/documents/bulk/{job_id}")
+async def bulk_progress(job_id: str, token: str = Security(oauth2_scheme)):
+    if job_id not in bulk_jobs:
+        raise HTTPException(status_code=404, detail="Bulk job not found")
+    return bulk_jobs[job_id]
+
+@app.post("/documents/render/stream")
+async def render_document_stream(request_data: dict, token: str = Security(oauth2_scheme)):
+    """Render and convert a document chunk by chunk, sending bytes as they are produced"""
+    format = request_data.get("format", "docx")
+    stream = get_document_generator().generate_document_stream(
+        template_id=request_data["template_id"],
+        variables=request_data.get("variables", {}),
+        format=format,
+        context=request_data.get("context")
+    )
+    return StreamingResponse(stream, media_type=STREAM_MEDIA_TYPES.get(format, "application/octet-stream"))
\ No newline at end of file
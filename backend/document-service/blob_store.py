@@ -0,0 +1,403 @@
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+from abc import ABC, abstractmethod
+from collections import Counter
+import argparse
+import hashlib
+import hmac
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+
+MANIFEST_VERSION = 1
+
+# Chunk sizes suited to contracts, where shared clauses run to a few kilobytes
+MIN_CHUNK_SIZE = 1024
+AVG_CHUNK_SIZE = 4096
+MAX_CHUNK_SIZE = 32768
+
+# Gear table: one fixed pseudo-random 64-bit value per byte, identical in every process
+GEAR = [int.from_bytes(hashlib.sha256(bytes([value])).digest()[:8], 'big') for value in range(256)]
+MASK_64 = (1 << 64) - 1
+
+class BlobStoreConfigError(Exception):
+    """Raised when the blob store is enabled without an encryption key"""
+
+def canonical_form(content: bytes) -> bytes:
+    """ZIP packages such as DOCX rewritten with every part stored uncompressed, so shared clauses chunk alike"""
+    # Deflate output shifts after the first edit, so compressed packages barely deduplicate
+    if not content.startswith(b'PK\x03\x04'):
+        return content
+    try:
+        source = zipfile.ZipFile(io.BytesIO(content))
+        members = source.infolist()
+    except zipfile.BadZipFile:
+        return content
+    if all(member.compress_type == zipfile.ZIP_STORED for member in members):
+        return content
+    
+    buffer = io.BytesIO()
+    with source, zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as package:
+        for member in members:
+            # Keep names, order and timestamps, so the same package always gives the same bytes
+            stored = zipfile.ZipInfo(member.filename, member.date_time)
+            stored.external_attr = member.external_attr
+            package.writestr(stored, source.read(member))
+    return buffer.getvalue()
+
+def _mask(bits: int) -> int:
+    """Test the high bits, which depend on the last 64 bytes seen"""
+    return ((1 << bits) - 1) << (64 - bits)
+
+def chunk_boundaries(
+    data: bytes,
+    min_size: int = MIN_CHUNK_SIZE,
+    avg_size: int = AVG_CHUNK_SIZE,
+    max_size: int = MAX_CHUNK_SIZE
+) -> Iterator[Tuple[int, int]]:
+    """FastCDC: cut where a Gear rolling hash matches, so an edit only moves nearby boundaries"""
+    bits = max(avg_size.bit_length() - 1, 3)
+    # Normalised chunking: a stricter mask before the average size and a looser one after it
+    mask_small = _mask(bits + 2)
+    mask_large = _mask(bits - 2)
+    gear = GEAR
+    
+    start = 0
+    length = len(data)
+    while start < length:
+        remaining = length - start
+        if remaining <= min_size:
+            yield start, length
+            return
+        
+        end = start + min(remaining, max_size)
+        normal = start + min(remaining, avg_size)
+        cut = end
+        fingerprint = 0
+        # Boundaries never fall inside the minimum size, so its bytes aren't hashed at all
+        for index in range(start + min_size, normal):
+            fingerprint = ((fingerprint << 1) + gear[data[index]]) & MASK_64
+            if not fingerprint & mask_small:
+                cut = index + 1
+                break
+        else:
+            for index in range(normal, end):
+                fingerprint = ((fingerprint << 1) + gear[data[index]]) & MASK_64
+                if not fingerprint & mask_large:
+                    cut = index + 1
+                    break
+        
+        yield start, cut
+        start = cut
+
+class BlobBackend(ABC):
+    """Storage for chunks by id, and their reference counts"""
+    
+    @abstractmethod
+    def read(self, chunk_id: str) -> bytes:
+        """Stored bytes of a chunk"""
+        pass
+    
+    @abstractmethod
+    def write(self, chunk_id: str, data: bytes) -> None:
+        """Store a chunk, atomically"""
+        pass
+    
+    @abstractmethod
+    def exists(self, chunk_id: str) -> bool:
+        """Whether a chunk is stored"""
+        pass
+    
+    @abstractmethod
+    def add_references(self, counts: Dict[str, int]) -> None:
+        """Adjust reference counts, negative to release"""
+        pass
+    
+    @abstractmethod
+    def collect(self) -> List[str]:
+        """Delete chunks nothing references, returning their ids"""
+        pass
+    
+    @abstractmethod
+    def usage(self) -> Dict[str, int]:
+        """Stored chunk count and bytes"""
+        pass
+
+class LocalFileSystemBackend(BlobBackend):
+    """Chunks as files fanned out by id prefix, with reference counts in SQLite"""
+    
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        os.makedirs(os.path.join(root_dir, 'chunks'), exist_ok=True)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(
+            os.path.join(root_dir, 'refs.db'), timeout=30.0, check_same_thread=False, isolation_level=None
+        )
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS refs (chunk_id TEXT PRIMARY KEY, count INTEGER NOT NULL, size INTEGER NOT NULL DEFAULT 0)"
+        )
+    
+    def _path(self, chunk_id: str) -> str:
+        return os.path.join(self.root_dir, 'chunks', chunk_id[:2], chunk_id)
+    
+    def read(self, chunk_id: str) -> bytes:
+        with open(self._path(chunk_id), 'rb') as f:
+            return f.read()
+    
+    def write(self, chunk_id: str, data: bytes) -> None:
+        path = self._path(chunk_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        with self.lock:
+            self.connection.execute("UPDATE refs SET size = ? WHERE chunk_id = ?", (len(data), chunk_id))
+    
+    def exists(self, chunk_id: str) -> bool:
+        return os.path.exists(self._path(chunk_id))
+    
+    def add_references(self, counts: Dict[str, int]) -> None:
+        with self.lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                self.connection.executemany(
+                    "INSERT INTO refs (chunk_id, count) VALUES (?, ?) "
+                    "ON CONFLICT(chunk_id) DO UPDATE SET count = count + excluded.count",
+                    counts.items()
+                )
+                self.connection.execute("COMMIT")
+            except sqlite3.Error:
+                self.connection.execute("ROLLBACK")
+                raise
+    
+    def collect(self) -> List[str]:
+        # The write lock keeps writers from referencing a chunk between selecting and deleting it
+        with self.lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                chunk_ids = [row[0] for row in self.connection.execute("SELECT chunk_id FROM refs WHERE count <= 0")]
+                for chunk_id in chunk_ids:
+                    try:
+                        os.unlink(self._path(chunk_id))
+                    except FileNotFoundError:
+                        pass
+                self.connection.execute("DELETE FROM refs WHERE count <= 0")
+                self.connection.execute("COMMIT")
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+        self._remove_stale_temp_files()
+        return chunk_ids
+    
+    def _remove_stale_temp_files(self) -> None:
+        """Remove files left behind by writers that died mid-write"""
+        stale_before = time.time() - 3600
+        for shard in os.scandir(os.path.join(self.root_dir, 'chunks')):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                try:
+                    if entry.name.startswith('.tmp-') and entry.stat().st_mtime < stale_before:
+                        os.unlink(entry.path)
+                except FileNotFoundError:
+                    continue
+    
+    def usage(self) -> Dict[str, int]:
+        with self.lock:
+            chunks, size = self.connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM refs WHERE count > 0").fetchone()
+        return {'chunks': chunks, 'bytes': size}
+
+class BlobStore:
+    """Content-defined chunk store: documents and versions keep manifests, each unique chunk is stored once"""
+    
+    def __init__(
+        self,
+        backend: BlobBackend,
+        key: Optional[bytes] = None,
+        min_size: int = MIN_CHUNK_SIZE,
+        avg_size: int = AVG_CHUNK_SIZE,
+        max_size: int = MAX_CHUNK_SIZE
+    ):
+        self.backend = backend
+        self.min_size = min_size
+        self.avg_size = avg_size
+        self.max_size = max_size
+        
+        # With a key, ids are keyed hashes and chunks are encrypted deterministically, so equal chunks still dedupe
+        self.id_key = hmac.new(key, b'chunk-id', hashlib.sha256).digest() if key else None
+        self.cipher = None
+        if key:
+            from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+            self.cipher = AESGCM(hmac.new(key, b'chunk-encryption', hashlib.sha256).digest())
+    
+    def chunk_id(self, chunk: bytes) -> str:
+        """Address of a chunk's content"""
+        if self.id_key:
+            return hmac.new(self.id_key, chunk, hashlib.sha256).hexdigest()
+        return hashlib.sha256(chunk).hexdigest()
+    
+    def put(self, content: bytes) -> Dict[str, Any]:
+        """Store content and return its manifest"""
+        chunks: List[List[Any]] = []
+        pending: Dict[str, bytes] = {}
+        view = memoryview(content)
+        for start, end in chunk_boundaries(content, self.min_size, self.avg_size, self.max_size):
+            chunk = bytes(view[start:end])
+            chunk_id = self.chunk_id(chunk)
+            chunks.append([chunk_id, end - start])
+            pending.setdefault(chunk_id, chunk)
+        
+        # Reference first, then write what's missing: collection never removes a chunk a writer is about to rely on
+        self.backend.add_references(Counter(chunk_id for chunk_id, _ in chunks))
+        for chunk_id, chunk in pending.items():
+            if not self.backend.exists(chunk_id):
+                self.backend.write(chunk_id, self._seal(chunk_id, chunk))
+        
+        return {
+            'version': MANIFEST_VERSION,
+            'size': len(content),
+            'sha256': hashlib.sha256(content).hexdigest(),
+            'chunks': chunks
+        }
+    
+    def get(self, manifest: Dict[str, Any]) -> bytes:
+        """Reassemble content from its manifest"""
+        content = b''.join(self._chunk(chunk_id) for chunk_id, _ in manifest['chunks'])
+        if hashlib.sha256(content).hexdigest() != manifest['sha256']:
+            raise ValueError("Reassembled content does not match its manifest checksum")
+        return content
+    
+    def read_range(self, manifest: Dict[str, Any], start: int, end: int) -> bytes:
+        """Bytes [start, end) of the content, reading only the chunks that overlap them"""
+        parts = []
+        offset = 0
+        for chunk_id, size in manifest['chunks']:
+            if offset >= end:
+                break
+            if offset + size > start:
+                chunk = self._chunk(chunk_id)
+                # Without a key there is no authenticated decryption, so check the chunk against its id
+                if not self.cipher and hashlib.sha256(chunk).hexdigest() != chunk_id:
+                    raise ValueError(f"Chunk {chunk_id} does not match its id")
+                parts.append(chunk[max(start - offset, 0):end - offset])
+            offset += size
+        return b''.join(parts)
+    
+    def release(self, manifest: Dict[str, Any]) -> None:
+        """Drop a manifest's references; unreferenced chunks go at the next collection"""
+        self.backend.add_references({
+            chunk_id: -count for chunk_id, count in Counter(chunk_id for chunk_id, _ in manifest['chunks']).items()
+        })
+    
+    def collect(self) -> int:
+        """Delete unreferenced chunks, returning how many were removed"""
+        return len(self.backend.collect())
+    
+    def _chunk(self, chunk_id: str) -> bytes:
+        data = self.backend.read(chunk_id)
+        if self.cipher:
+            data = self.cipher.decrypt(data[:12], data[12:], chunk_id.encode('ascii'))
+        return data
+    
+    def _seal(self, chunk_id: str, chunk: bytes) -> bytes:
+        """Encrypt with a nonce derived from the keyed id; it only repeats for identical plaintext"""
+        if not self.cipher:
+            return chunk
+        nonce = bytes.fromhex(chunk_id)[:12]
+        return nonce + self.cipher.encrypt(nonce, chunk, chunk_id.encode('ascii'))
+
+def dedup_report(
+    contents: Iterable[bytes],
+    min_size: int = MIN_CHUNK_SIZE,
+    avg_size: int = AVG_CHUNK_SIZE,
+    max_size: int = MAX_CHUNK_SIZE,
+    canonical: bool = True
+) -> Dict[str, Any]:
+    """Logical versus unique chunk bytes for a corpus, chunked in the form the store keeps, without storing anything"""
+    seen = set()
+    documents = 0
+    chunks = 0
+    input_bytes = 0
+    logical_bytes = 0
+    stored_bytes = 0
+    for content in contents:
+        documents += 1
+        input_bytes += len(content)
+        if canonical:
+            content = canonical_form(content)
+        logical_bytes += len(content)
+        for start, end in chunk_boundaries(content, min_size, avg_size, max_size):
+            chunks += 1
+            digest = hashlib.sha256(content[start:end]).digest()
+            if digest not in seen:
+                seen.add(digest)
+                stored_bytes += end - start
+    return {
+        'documents': documents,
+        'chunks': chunks,
+        'unique_chunks': len(seen),
+        'input_bytes': input_bytes,
+        'logical_bytes': logical_bytes,
+        'stored_bytes': stored_bytes,
+        'dedup_ratio': logical_bytes / stored_bytes if stored_bytes else 1.0,
+        'storage_ratio': input_bytes / stored_bytes if stored_bytes else 1.0
+    }
+
+_shared_store: Optional[BlobStore] = None
+
+def get_blob_store() -> Optional[BlobStore]:
+    """Process-wide store when BLOB_STORE_DIR is set; documents keep inline content otherwise"""
+    global _shared_store
+    if _shared_store is None and os.getenv('BLOB_STORE_DIR'):
+        # Inline content is encrypted at rest, so chunks must never be written in the clear
+        master_key = os.getenv('ENCRYPTION_MASTER_KEY')
+        if not master_key:
+            raise BlobStoreConfigError("BLOB_STORE_DIR is set but ENCRYPTION_MASTER_KEY is not; refusing to store plaintext chunks")
+        _shared_store = BlobStore(LocalFileSystemBackend(os.getenv('BLOB_STORE_DIR')), key=master_key.encode('utf-8'))
+    return _shared_store
+
+def _read_corpus(paths: List[str]) -> Iterator[bytes]:
+    for path in paths:
+        if os.path.isfile(path):
+            with open(path, 'rb') as f:
+                yield f.read()
+            continue
+        for directory, _, names in os.walk(path):
+            for name in sorted(names):
+                with open(os.path.join(directory, name), 'rb') as f:
+                    yield f.read()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Report how much chunk-level deduplication would save on a document corpus"
+    )
+    parser.add_argument('paths', nargs='+', help="Files or directories of documents")
+    parser.add_argument('--min-size', type=int, default=MIN_CHUNK_SIZE)
+    parser.add_argument('--avg-size', type=int, default=AVG_CHUNK_SIZE)
+    parser.add_argument('--max-size', type=int, default=MAX_CHUNK_SIZE)
+    parser.add_argument('--raw', action='store_true', help="Chunk files as they are, without unpacking DOCX parts")
+    args = parser.parse_args(argv)
+    
+    start_time = time.time()
+    report = dedup_report(_read_corpus(args.paths), args.min_size, args.avg_size, args.max_size, canonical=not args.raw)
+    print(
+        f"{report['documents']} documents, {report['logical_bytes']} bytes in {report['chunks']} chunks; "
+        f"{report['unique_chunks']} unique chunks, {report['stored_bytes']} bytes stored; "
+        f"dedup ratio {report['dedup_ratio']:.2f}x, {report['storage_ratio']:.2f}x of input size "
+        f"({time.time() - start_time:.1f}s)"
+    )
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
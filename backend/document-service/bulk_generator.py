@@ -0,0 +1,199 @@
+from typing import Dict, List, Any, AsyncIterator, Callable, Deque, Optional, Tuple
+from collections import deque
+from datetime import datetime
+from jinja2 import Template
+import asyncio
+import base64
+import csv
+import hashlib
+import json
+import re
+import zipfile
+from .conversion_executor import ConversionExecutor, get_conversion_executor
+from .format_converter import StreamBuffer
+
+ROW_FORMATS = ('jsonl', 'csv')
+OUTPUT_FORMATS = ('zip', 'jsonl')
+
+SAFE_NAME = re.compile(r'[^A-Za-z0-9._-]+')
+
+FILE_EXTENSIONS = {
+    'docx': 'docx',
+    'pdf': 'pdf',
+    'markdown': 'md',
+    'text': 'txt',
+    'html': 'html'
+}
+
+async def aiter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into decoded lines without buffering the whole body"""
+    buffer = b''
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b'\n')
+        for line in lines:
+            yield line.decode('utf-8').rstrip('\r')
+    if buffer:
+        yield buffer.decode('utf-8').rstrip('\r')
+
+async def aiter_rows(lines: AsyncIterator[str], row_format: str = 'jsonl') -> AsyncIterator[Dict]:
+    """Parse variable rows from JSONL or CSV lines as they arrive"""
+    if row_format not in ROW_FORMATS:
+        raise ValueError(f"Unsupported row format: {row_format}")
+    
+    if row_format == 'jsonl':
+        async for line in lines:
+            if line.strip():
+                yield json.loads(line)
+        return
+    
+    header = None
+    pending = ''
+    async for line in lines:
+        # A quoted field may span lines; wait until its quotes balance
+        pending = f"{pending}\n{line}" if pending else line
+        if pending.count('"') % 2:
+            continue
+        record, pending = next(csv.reader([pending])), ''
+        if header is None:
+            header = record
+        elif any(record):
+            yield dict(zip(header, record))
+
+class BulkGenerator:
+    """Mail-merge generation from one compiled template with pooled conversion"""
+    
+    def __init__(
+        self,
+        converter: Optional[ConversionExecutor] = None,
+        max_pending: Optional[int] = None
+    ):
+        self.converter = converter or get_conversion_executor()
+        self.max_pending = max_pending or self.converter.workers * 2
+    
+    async def generate(
+        self,
+        template: Template,
+        rows: AsyncIterator[Dict],
+        format: str = "docx",
+        output: str = "zip",
+        name_field: Optional[str] = None,
+        progress: Optional[Callable[[Dict[str, int]], None]] = None
+    ) -> AsyncIterator[bytes]:
+        """Stream a ZIP or JSONL manifest of documents rendered from each row"""
+        if output not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output}")
+        
+        documents = self._documents(template, rows, format, name_field, progress)
+        if output == 'zip':
+            async for chunk in self._zip(documents):
+                yield chunk
+        else:
+            async for record in documents:
+                yield (json.dumps(self._manifest_entry(*record)) + '\n').encode('utf-8')
+    
+    async def _documents(
+        self,
+        template: Template,
+        rows: AsyncIterator[Dict],
+        format: str,
+        name_field: Optional[str],
+        progress: Optional[Callable[[Dict[str, int]], None]]
+    ) -> AsyncIterator[Tuple[int, str, Optional[bytes], Optional[str]]]:
+        """Render rows and convert them in the pool, yielding (row, filename, content, error) in order"""
+        stats = {'rendered': 0, 'completed': 0, 'errors': 0}
+        extension = FILE_EXTENSIONS.get(format, format)
+        pending: Deque[Tuple[int, str, Any]] = deque()
+        
+        try:
+            index = 0
+            async for row in rows:
+                filename = self._filename(row, index, name_field, extension)
+                try:
+                    content = template.render(**row)
+                    stats['rendered'] += 1
+                    
+                    # Bulk jobs wait for queue space instead of being rejected like interactive requests
+                    job = asyncio.ensure_future(self.converter.convert(content, "text", format, wait=True))
+                    pending.append((index, filename, job))
+                except Exception as e:
+                    pending.append((index, filename, e))
+                index += 1
+                
+                # Bound in-flight conversions so memory stays flat on large jobs
+                while len(pending) >= self.max_pending:
+                    yield await self._finish(pending.popleft(), stats, progress)
+            
+            while pending:
+                yield await self._finish(pending.popleft(), stats, progress)
+        finally:
+            # Conversions for rows that will never be streamed are dropped
+            for _, _, job in pending:
+                if isinstance(job, asyncio.Future):
+                    job.cancel()
+    
+    async def _finish(
+        self,
+        entry: Tuple[int, str, Any],
+        stats: Dict[str, int],
+        progress: Optional[Callable[[Dict[str, int]], None]]
+    ) -> Tuple[int, str, Optional[bytes], Optional[str]]:
+        """Wait for one conversion and update progress"""
+        index, filename, job = entry
+        content, error = None, None
+        if isinstance(job, Exception):
+            error = str(job)
+        else:
+            try:
+                content = await job
+            except Exception as e:
+                error = str(e)
+        
+        stats['errors' if error else 'completed'] += 1
+        if progress:
+            progress(dict(stats))
+        return index, filename, content, error
+    
+    async def _zip(self, documents: AsyncIterator) -> AsyncIterator[bytes]:
+        """Write documents into a streamed ZIP, flushing after each entry"""
+        sink = StreamBuffer()
+        errors = []
+        timestamp = datetime.now().timetuple()[:6]
+        
+        with zipfile.ZipFile(sink, mode='w', compression=zipfile.ZIP_DEFLATED) as archive:
+            async for index, filename, content, error in documents:
+                if error:
+                    errors.append({'row': index, 'filename': filename, 'error': error})
+                    continue
+                archive.writestr(zipfile.ZipInfo(filename, timestamp), content, zipfile.ZIP_DEFLATED)
+                yield sink.drain()
+            
+            # Failed rows are reported inside the archive rather than aborting the job
+            if errors:
+                archive.writestr(
+                    zipfile.ZipInfo('errors.jsonl', timestamp),
+                    ''.join(json.dumps(error) + '\n' for error in errors)
+                )
+        
+        yield sink.drain()
+    
+    def _filename(self, row: Dict, index: int, name_field: Optional[str], extension: str) -> str:
+        """Archive name from a row field, or the row number"""
+        name = str(row.get(name_field) or '') if name_field else ''
+        name = SAFE_NAME.sub('_', name).strip('._')
+        
+        # Row numbers keep names unique and in row order
+        return f"{index + 1:06d}-{name}.{extension}" if name else f"document-{index + 1:06d}.{extension}"
+    
+    def _manifest_entry(self, index: int, filename: str, content: Optional[bytes], error: Optional[str]) -> Dict:
+        """One JSONL manifest line per document"""
+        if error:
+            return {'row': index, 'filename': filename, 'status': 'error', 'error': error}
+        return {
+            'row': index,
+            'filename': filename,
+            'status': 'completed',
+            'size': len(content),
+            'sha256': hashlib.sha256(content).hexdigest(),
+            'content': base64.b64encode(content).decode('ascii')
+        }
\ No newline at end of file
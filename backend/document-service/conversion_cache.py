@@ -0,0 +1,191 @@
+from typing import Dict, Any, Optional, Union
+from collections import OrderedDict
+import fcntl
+import hashlib
+import logging
+import os
+import tempfile
+import time
+
+logger = logging.getLogger(__name__)
+
+def conversion_key(content: Union[str, bytes], source_format: str, target_format: str, version: str) -> str:
+    """Content address for one conversion's output"""
+    digest = hashlib.sha256(content.encode('utf-8') if isinstance(content, str) else content)
+    digest.update(f"\0{source_format}\0{target_format}\0{version}".encode('utf-8'))
+    return digest.hexdigest()
+
+class ConversionCache:
+    """Converted output in a memory LRU backed by an on-disk LRU shared between processes"""
+    
+    def __init__(
+        self,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        directory: Optional[str] = None,
+        max_disk_bytes: int = 1024 * 1024 * 1024
+    ):
+        self.max_memory_bytes = max_memory_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.entries: OrderedDict = OrderedDict()
+        self.memory_bytes = 0
+        
+        # Other processes write to the same directory, so its size is rescanned rather than tracked
+        self.written_since_scan = max_disk_bytes
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.memory_evictions = 0
+        self.disk_evictions = 0
+    
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached output for a key, promoting disk hits into memory"""
+        data = self.entries.get(key)
+        if data is not None:
+            self.memory_hits += 1
+            self.entries.move_to_end(key)
+            return data
+        
+        data = self._read(key)
+        if data is None:
+            self.misses += 1
+            return None
+        
+        self.disk_hits += 1
+        self._remember(key, data)
+        return data
+    
+    def put(self, key: str, data: bytes) -> None:
+        """Store output in memory and on disk"""
+        self._remember(key, data)
+        if self.directory:
+            self._write(key, data)
+    
+    def clear(self) -> None:
+        """Drop the memory tier"""
+        self.entries.clear()
+        self.memory_bytes = 0
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Hit and eviction counts per tier"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'memory_bytes': self.memory_bytes,
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            'memory_evictions': self.memory_evictions,
+            'disk_evictions': self.disk_evictions
+        }
+    
+    def _remember(self, key: str, data: bytes) -> None:
+        """Add to the memory LRU, evicting least recently used output over the byte limit"""
+        if len(data) > self.max_memory_bytes:
+            return
+        if key in self.entries:
+            self.memory_bytes -= len(self.entries.pop(key))
+        self.entries[key] = data
+        self.memory_bytes += len(data)
+        while self.memory_bytes > self.max_memory_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.memory_bytes -= len(evicted)
+            self.memory_evictions += 1
+    
+    def _path(self, key: str) -> str:
+        """Fan entries out over subdirectories by key prefix"""
+        return os.path.join(self.directory, key[:2], key)
+    
+    def _read(self, key: str) -> Optional[bytes]:
+        """Read an entry from disk, marking it recently used"""
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            # Never written, or evicted by another process
+            return None
+        return data
+    
+    def _write(self, key: str, data: bytes) -> None:
+        """Write via a temp file and rename, so readers never see a partial entry"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            logger.exception(f"Failed to write conversion cache entry {key}")
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            return
+        
+        self.written_since_scan += len(data)
+        if self.written_since_scan >= self.max_disk_bytes // 10:
+            self._evict()
+    
+    def _evict(self) -> None:
+        """Delete least recently used files until the directory is under its size limit"""
+        self.written_since_scan = 0
+        
+        # One process scans and deletes at a time; the others skip rather than wait
+        with open(os.path.join(self.directory, '.lock'), 'w') as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return
+            
+            files = []
+            total = 0
+            stale_before = time.time() - 3600
+            for shard in os.scandir(self.directory):
+                if not shard.is_dir():
+                    continue
+                for entry in os.scandir(shard.path):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    if entry.name.startswith('.tmp-'):
+                        # Left behind by a writer that died mid-write
+                        if stat.st_mtime < stale_before:
+                            os.unlink(entry.path)
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+            
+            # Evict down to 90% so the next few writes don't immediately trigger another scan
+            target = self.max_disk_bytes * 9 // 10
+            if total <= self.max_disk_bytes:
+                return
+            for _, size, path in sorted(files):
+                if total <= target:
+                    break
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                self.disk_evictions += 1
+
+_shared_cache: Optional[ConversionCache] = None
+
+def get_conversion_cache() -> ConversionCache:
+    """Process-wide cache; worker processes on a host share its directory"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = ConversionCache(
+            max_memory_bytes=int(os.getenv('CONVERSION_CACHE_MEMORY_MB', '64')) * 1024 * 1024,
+            directory=os.getenv('CONVERSION_CACHE_DIR') or None,
+            max_disk_bytes=int(os.getenv('CONVERSION_CACHE_DISK_MB', '1024')) * 1024 * 1024
+        )
+    return _shared_cache
\ No newline at end of file
@@ -0,0 +1,238 @@
+from typing import Dict, Any, Optional, Union
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import time
+
+logger = logging.getLogger(__name__)
+
+# How often a waiting job checks whether a worker has picked it up
+POLL_INTERVAL = 0.05
+
+# Submissions per job, so a job whose pool is retired under it by another job's timeout is resubmitted
+MAX_ATTEMPTS = 3
+
+# Per-process state, created once by the pool initializer
+_worker_state: Dict[str, Any] = {}
+
+class ConversionQueueFull(Exception):
+    """Raised when every worker is busy and the queue is at capacity"""
+
+class ConversionTimeout(Exception):
+    """Raised when a conversion runs past its deadline"""
+
+class _PoolRetired(Exception):
+    """Raised when a job was cancelled because its pool was replaced before it ran"""
+
+def _init_worker(started: Optional[Any] = None) -> None:
+    """Create one converter and event loop per worker process"""
+    from .conversion_cache import ConversionCache
+    from .format_converter import FormatConverter
+    from .pdf_extractor import PdfExtractor
+    
+    # The submitting process caches output, so workers keep no cache of their own.
+    # Conversion workers already fill the host, so each extracts PDFs with a single helper process.
+    _worker_state['converter'] = FormatConverter(
+        cache=ConversionCache(max_memory_bytes=0),
+        pdf_extractor=PdfExtractor(workers=1)
+    )
+    _worker_state['loop'] = asyncio.new_event_loop()
+    _worker_state['started'] = started
+
+def _convert(job_id: int, content: Union[str, bytes], source_format: str, target_format: str) -> bytes:
+    """Convert one document inside a worker process"""
+    if not _worker_state:
+        _init_worker()
+    # Deadlines run from here, so jobs waiting for a worker are not timed out
+    if _worker_state['started'] is not None:
+        _worker_state['started'].put(job_id)
+    converter = _worker_state['converter']
+    return _worker_state['loop'].run_until_complete(
+        converter.convert(content=content, source_format=source_format, target_format=target_format)
+    )
+
+class ConversionExecutor:
+    """Process pool for CPU-bound conversions, with a bounded queue and per-job timeouts"""
+    
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        timeout: float = 120.0,
+        executor: Optional[Executor] = None
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue if max_queue is not None else self.workers * 4
+        self.timeout = timeout
+        self.executor = executor
+        self.slots: Optional[asyncio.Semaphore] = None
+        
+        # Workers report each job they pick up; a fresh queue goes with every pool
+        self.started_queue: Optional[Any] = None
+        self.started: Dict[int, float] = {}
+        self.job_ids = itertools.count()
+        
+        self.in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.restarts = 0
+        self.seconds = 0.0
+    
+    @property
+    def capacity(self) -> int:
+        """Jobs running plus jobs waiting for a worker"""
+        return self.workers + self.max_queue
+    
+    async def convert(
+        self,
+        content: Union[str, bytes],
+        source_format: str,
+        target_format: str,
+        timeout: Optional[float] = None,
+        wait: bool = False
+    ) -> bytes:
+        """Convert in a worker process; callers that don't wait are rejected when the queue is full"""
+        if self.slots is None:
+            self.slots = asyncio.Semaphore(self.capacity)
+        if not wait and self.slots.locked():
+            self.rejected += 1
+            raise ConversionQueueFull(f"Conversion queue is full ({self.capacity} jobs)")
+        
+        async with self.slots:
+            self.in_flight += 1
+            self.submitted += 1
+            start_time = time.perf_counter()
+            try:
+                result = await self._run(content, source_format, target_format, timeout or self.timeout)
+                self.completed += 1
+                return result
+            except ConversionTimeout:
+                raise
+            except Exception:
+                self.failed += 1
+                raise
+            finally:
+                self.in_flight -= 1
+                self.seconds += time.perf_counter() - start_time
+    
+    async def _run(self, content: Union[str, bytes], source_format: str, target_format: str, timeout: float) -> bytes:
+        """Submit one job, resubmitting it if another job's timeout retired the pool under it"""
+        for attempt in range(MAX_ATTEMPTS):
+            executor = self._executor()
+            job_id = next(self.job_ids)
+            job = executor.submit(_convert, job_id, content, source_format, target_format)
+            try:
+                return await self._wait(job, job_id, timeout)
+            except ConversionTimeout:
+                self.timeouts += 1
+                # The worker can't be interrupted, so retire the pool rather than lose a worker to it
+                self._restart(executor)
+                raise ConversionTimeout(f"Conversion from {source_format} to {target_format} exceeded {timeout}s")
+            except (_PoolRetired, BrokenProcessPool):
+                if attempt == MAX_ATTEMPTS - 1 or executor is self.executor:
+                    raise
+    
+    async def _wait(self, job: Future, job_id: int, timeout: float) -> bytes:
+        """Job result, timing out only once the job has been running for timeout seconds"""
+        waiter = asyncio.wrap_future(job)
+        try:
+            while True:
+                started = self._started_at(job, job_id)
+                remaining = POLL_INTERVAL if started is None else started + timeout - time.monotonic()
+                if remaining <= 0:
+                    raise ConversionTimeout()
+                done, _ = await asyncio.wait({waiter}, timeout=remaining)
+                if done:
+                    break
+        finally:
+            self.started.pop(job_id, None)
+            # Callers that give up or time out stop listening; a queued job is also withdrawn
+            if not waiter.done():
+                waiter.cancel()
+        
+        if job.cancelled():
+            # Cancelled by a pool shutdown, not by the caller
+            raise _PoolRetired()
+        return waiter.result()
+    
+    def _started_at(self, job: Future, job_id: int) -> Optional[float]:
+        """When a worker picked up a job, as seen by this process"""
+        if self.started_queue is None:
+            # Thread pools mark futures running exactly when a worker takes them
+            if job.running() or job.done():
+                self.started.setdefault(job_id, time.monotonic())
+        else:
+            while True:
+                try:
+                    self.started[self.started_queue.get_nowait()] = time.monotonic()
+                except queue.Empty:
+                    break
+        return self.started.get(job_id)
+    
+    def _executor(self) -> Executor:
+        """Current pool, started on first use"""
+        if self.executor is None:
+            # A worker killed mid-report could leave a shared queue locked, so each pool gets its own
+            self.started_queue = multiprocessing.Queue()
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.started_queue,)
+            )
+        return self.executor
+    
+    def _restart(self, executor: Executor) -> None:
+        """Replace a pool whose worker is stuck, killing its processes"""
+        if executor is not self.executor or not isinstance(executor, ProcessPoolExecutor):
+            return
+        logger.warning("Restarting conversion pool after a timed-out job")
+        self.restarts += 1
+        self.executor = None
+        processes = list((executor._processes or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, outcome counts and average job time"""
+        finished = self.completed + self.failed + self.timeouts
+        return {
+            'workers': self.workers,
+            'capacity': self.capacity,
+            'in_flight': self.in_flight,
+            'queued': max(self.in_flight - self.workers, 0),
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'timeouts': self.timeouts,
+            'restarts': self.restarts,
+            'avg_seconds': self.seconds / finished if finished else 0.0
+        }
+    
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+_shared_executor: Optional[ConversionExecutor] = None
+
+def get_conversion_executor() -> ConversionExecutor:
+    """Process-wide executor shared by every conversion entry point"""
+    global _shared_executor
+    if _shared_executor is None:
+        _shared_executor = ConversionExecutor(
+            workers=int(os.getenv('CONVERSION_WORKERS', '0')) or None,
+            max_queue=int(os.getenv('CONVERSION_QUEUE_SIZE')) if os.getenv('CONVERSION_QUEUE_SIZE') else None,
+            timeout=float(os.getenv('CONVERSION_TIMEOUT', '120'))
+        )
+    return _shared_executor
\ No newline at end of file
@@ -0,0 +1,115 @@
+from typing import Dict, List, Any, Awaitable, Callable, Iterable, Optional, Tuple
+import heapq
+import time
+
+# Converters take the content in their source format and return it in their target format
+Converter = Callable[[Any], Awaitable[Any]]
+
+MEGABYTE = 1024 * 1024
+
+class ConversionEdge:
+    """One converter between two formats, costed as fixed seconds per call plus seconds per megabyte"""
+    
+    def __init__(self, source: str, target: str, converter: Converter, fixed: float, per_mb: float):
+        self.source = source
+        self.target = target
+        self.converter = converter
+        self.fixed = fixed
+        self.per_mb = per_mb
+        self.calls = 0
+        self.seconds = 0.0
+    
+    def estimate(self, size: int) -> float:
+        """Expected seconds to convert size bytes"""
+        return self.fixed + self.per_mb * size / MEGABYTE
+    
+    def record(self, seconds: float, size: int, smoothing: float) -> None:
+        """Move the cost model towards a measured run (normalised least mean squares)"""
+        self.calls += 1
+        self.seconds += seconds
+        megabytes = size / MEGABYTE
+        error = seconds - self.estimate(size)
+        norm = 1 + megabytes * megabytes
+        self.fixed = max(self.fixed + smoothing * error / norm, 0.0)
+        self.per_mb = max(self.per_mb + smoothing * error * megabytes / norm, 0.0)
+
+class ConversionGraph:
+    """Available converters between formats, choosing the cheapest path by measured cost unless a route is pinned"""
+    
+    def __init__(self, smoothing: float = 0.3, terminal: Iterable[str] = ()):
+        self.smoothing = smoothing
+        self.terminal = set(terminal)
+        self.edges: Dict[str, Dict[str, ConversionEdge]] = {}
+        self.pinned: Dict[Tuple[str, str], List[Tuple[Optional[Callable[[Any], bool]], List[str]]]] = {}
+    
+    def add(self, source: str, target: str, converter: Converter, fixed: float, per_mb: float) -> None:
+        """Register a converter with an initial cost estimate"""
+        self.edges.setdefault(source, {})[target] = ConversionEdge(source, target, converter, fixed, per_mb)
+    
+    def pin(self, *formats: str, when: Optional[Callable[[Any], bool]] = None) -> None:
+        """Convert from the first format to the last along this route, whatever the costs, for content matching when"""
+        for source, target in zip(formats, formats[1:]):
+            if target not in self.edges.get(source, {}):
+                raise ValueError(f"No converter from {source} to {target}")
+        self.pinned.setdefault((formats[0], formats[-1]), []).append((when, list(formats)))
+    
+    def path(self, source: str, target: str, size: int = 0, content: Any = None) -> List[ConversionEdge]:
+        """Pinned or cheapest chain of converters from source to target for content of about size bytes"""
+        if source == target:
+            return []
+        
+        # Routes whose output differs are pinned, so timings never change what a conversion produces;
+        # the first pin whose condition the content meets wins
+        for when, route in self.pinned.get((source, target), []):
+            if when is None or (content is not None and when(content)):
+                return [self.edges[step][following] for step, following in zip(route, route[1:])]
+        
+        best = {source: 0.0}
+        previous: Dict[str, ConversionEdge] = {}
+        queue = [(0.0, source)]
+        while queue:
+            cost, node = heapq.heappop(queue)
+            if node == target:
+                break
+            if cost > best[node] or (node in self.terminal and node != source):
+                continue
+            for edge in self.edges.get(node, {}).values():
+                candidate = cost + edge.estimate(size)
+                if candidate < best.get(edge.target, float('inf')):
+                    best[edge.target] = candidate
+                    previous[edge.target] = edge
+                    heapq.heappush(queue, (candidate, edge.target))
+        
+        if target not in previous:
+            raise ValueError(f"No conversion path from {source} to {target}")
+        
+        path = []
+        node = target
+        while node != source:
+            path.append(previous[node])
+            node = previous[node].source
+        return path[::-1]
+    
+    async def convert(self, content: Any, source: str, target: str) -> Any:
+        """Run content along the cheapest path, measuring each step"""
+        for edge in self.path(source, target, len(content), content):
+            size = len(content) if content is not None else 0
+            started = time.perf_counter()
+            content = await edge.converter(content)
+            edge.record(time.perf_counter() - started, size, self.smoothing)
+        return content
+    
+    def stats(self) -> List[Dict]:
+        """Per-edge cost estimates and measured timings"""
+        return [
+            {
+                'source': edge.source,
+                'target': edge.target,
+                'fixed_seconds': edge.fixed,
+                'seconds_per_mb': edge.per_mb,
+                'calls': edge.calls,
+                'seconds': edge.seconds
+            }
+            for targets in self.edges.values()
+            for edge in targets.values()
+        ]
\ No newline at end of file
@@ -0,0 +1,270 @@
+from typing import Dict, List, Any, Hashable, Optional, Sequence, Tuple
+from bisect import bisect_left
+import re
+
+# Word-level tokens: words, runs of whitespace, and single punctuation marks
+TOKEN = re.compile(r'\w+|\s+|[^\w\s]')
+
+# Regions smaller than this skip the patience pass
+PATIENCE_MIN_ITEMS = 64
+
+# Opcodes are (tag, a_start, a_end, b_start, b_end) with tags equal, delete, insert
+Opcode = Tuple[str, int, int, int, int]
+
+def _intern(old: Sequence[str], new: Sequence[str]) -> Tuple[List[int], List[int]]:
+    """Replace items by integer ids so comparisons are hash-once, compare-by-int"""
+    ids: Dict[Hashable, int] = {}
+    return [ids.setdefault(item, len(ids)) for item in old], [ids.setdefault(item, len(ids)) for item in new]
+
+def _middle_snake(
+    a: Sequence[int], a_lo: int, a_hi: int,
+    b: Sequence[int], b_lo: int, b_hi: int,
+    max_d: int
+) -> Optional[Tuple[int, int, int, int, int]]:
+    """Myers' middle snake: (edit distance, x start, y start, x end, y end), or None past max_d"""
+    n = a_hi - a_lo
+    m = b_hi - b_lo
+    delta = n - m
+    odd = delta & 1
+    limit = min((n + m + 1) // 2, max_d)
+    offset = limit + 1
+    forward = [0] * (2 * offset + 1)
+    backward = [0] * (2 * offset + 1)
+    
+    for d in range(limit + 1):
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and forward[offset + k - 1] < forward[offset + k + 1]):
+                x = forward[offset + k + 1]
+            else:
+                x = forward[offset + k - 1] + 1
+            y = x - k
+            x0, y0 = x, y
+            while x < n and y < m and a[a_lo + x] == b[b_lo + y]:
+                x += 1
+                y += 1
+            forward[offset + k] = x
+            if odd and -(d - 1) <= delta - k <= d - 1 and x + backward[offset + delta - k] >= n:
+                return 2 * d - 1, x0, y0, x, y
+        
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and backward[offset + k - 1] < backward[offset + k + 1]):
+                u = backward[offset + k + 1]
+            else:
+                u = backward[offset + k - 1] + 1
+            v = u - k
+            u0, v0 = u, v
+            while u < n and v < m and a[a_hi - 1 - u] == b[b_hi - 1 - v]:
+                u += 1
+                v += 1
+            backward[offset + k] = u
+            if not odd and -d <= delta - k <= d and u + forward[offset + delta - k] >= n:
+                return 2 * d, n - u, m - v, n - u0, m - v0
+    return None
+
+def _myers(
+    a: Sequence[int], a_lo: int, a_hi: int,
+    b: Sequence[int], b_lo: int, b_hi: int,
+    max_d: int, out: List[Opcode]
+) -> None:
+    """Linear-space Myers diff by recursing on the middle snake"""
+    # Strip the common prefix and suffix
+    while a_lo < a_hi and b_lo < b_hi and a[a_lo] == b[b_lo]:
+        out.append(('equal', a_lo, a_lo + 1, b_lo, b_lo + 1))
+        a_lo += 1
+        b_lo += 1
+    suffix = []
+    while a_lo < a_hi and b_lo < b_hi and a[a_hi - 1] == b[b_hi - 1]:
+        a_hi -= 1
+        b_hi -= 1
+        suffix.append(('equal', a_hi, a_hi + 1, b_hi, b_hi + 1))
+    
+    if a_lo == a_hi or b_lo == b_hi:
+        if a_lo < a_hi:
+            out.append(('delete', a_lo, a_hi, b_lo, b_lo))
+        if b_lo < b_hi:
+            out.append(('insert', a_lo, a_lo, b_lo, b_hi))
+    else:
+        # Regions with nothing in common, as in a full rewrite, need no search at all
+        common = not set(a[a_lo:a_hi]).isdisjoint(b[b_lo:b_hi])
+        snake = _middle_snake(a, a_lo, a_hi, b, b_lo, b_hi, max_d) if common else None
+        if snake is None:
+            # Too different to align within budget; report the region as rewritten
+            out.append(('delete', a_lo, a_hi, b_lo, b_lo))
+            out.append(('insert', a_hi, a_hi, b_lo, b_hi))
+        else:
+            # After stripping, each half holds strictly fewer edits, so the recursion terminates
+            _, x0, y0, x1, y1 = snake
+            _myers(a, a_lo, a_lo + x0, b, b_lo, b_lo + y0, max_d, out)
+            for i in range(x1 - x0):
+                out.append(('equal', a_lo + x0 + i, a_lo + x0 + i + 1, b_lo + y0 + i, b_lo + y0 + i + 1))
+            _myers(a, a_lo + x1, a_hi, b, b_lo + y1, b_hi, max_d, out)
+    out.extend(reversed(suffix))
+
+def _unique_anchors(a: Sequence[int], a_lo: int, a_hi: int, b: Sequence[int], b_lo: int, b_hi: int) -> List[Tuple[int, int]]:
+    """Patience anchors: items unique on both sides, longest run appearing in the same order"""
+    counts: Dict[int, List[int]] = {}
+    for i in range(a_lo, a_hi):
+        entry = counts.setdefault(a[i], [0, 0, i, 0])
+        entry[0] += 1
+    for j in range(b_lo, b_hi):
+        entry = counts.get(b[j])
+        if entry is not None:
+            entry[1] += 1
+            entry[3] = j
+    pairs = sorted((entry[2], entry[3]) for entry in counts.values() if entry[0] == 1 and entry[1] == 1)
+    if not pairs:
+        return []
+    
+    # Longest increasing subsequence of b positions, by patience sorting
+    tails: List[int] = []
+    links: List[int] = [-1] * len(pairs)
+    tops: List[int] = []
+    for index, (_, j) in enumerate(pairs):
+        pile = bisect_left(tails, j)
+        if pile == len(tails):
+            tails.append(j)
+            tops.append(index)
+        else:
+            tails[pile] = j
+            tops[pile] = index
+        links[index] = tops[pile - 1] if pile else -1
+    
+    anchors = []
+    index = tops[-1]
+    while index != -1:
+        anchors.append(pairs[index])
+        index = links[index]
+    return anchors[::-1]
+
+def _patience(
+    a: Sequence[int], a_lo: int, a_hi: int,
+    b: Sequence[int], b_lo: int, b_hi: int,
+    max_d: int, out: List[Opcode]
+) -> None:
+    """Align on unique common items, falling back to Myers between anchors"""
+    # Gaps between neighbouring anchors are usually empty or tiny; Myers handles them directly
+    if a_lo == a_hi or b_lo == b_hi or (a_hi - a_lo) + (b_hi - b_lo) < PATIENCE_MIN_ITEMS:
+        _myers(a, a_lo, a_hi, b, b_lo, b_hi, max_d, out)
+        return
+    
+    anchors = _unique_anchors(a, a_lo, a_hi, b, b_lo, b_hi)
+    if not anchors:
+        _myers(a, a_lo, a_hi, b, b_lo, b_hi, max_d, out)
+        return
+    
+    for i, j in anchors:
+        _patience(a, a_lo, i, b, b_lo, j, max_d, out)
+        out.append(('equal', i, i + 1, j, j + 1))
+        a_lo, b_lo = i + 1, j + 1
+    _patience(a, a_lo, a_hi, b, b_lo, b_hi, max_d, out)
+
+def diff_opcodes(
+    old: Sequence[Hashable],
+    new: Sequence[Hashable],
+    max_d: int = 1000,
+    patience: bool = True
+) -> List[Opcode]:
+    """Merged equal/delete/insert runs turning old into new"""
+    a, b = _intern(old, new)
+    raw: List[Opcode] = []
+    align = _patience if patience else _myers
+    align(a, 0, len(a), b, 0, len(b), max_d, raw)
+    
+    merged: List[Opcode] = []
+    for op in raw:
+        if merged and merged[-1][0] == op[0] and merged[-1][2] == op[1] and merged[-1][4] == op[3]:
+            tag, a0, _, b0, _ = merged[-1]
+            merged[-1] = (tag, a0, op[2], b0, op[4])
+        else:
+            merged.append(op)
+    return merged
+
+def word_diff(old: str, new: str) -> List[List[Any]]:
+    """Word-level edits within one paragraph: ['=', chars kept], ['-', removed], ['+', added]"""
+    old_tokens = TOKEN.findall(old)
+    new_tokens = TOKEN.findall(new)
+    edits: List[List[Any]] = []
+    # Paragraphs are short and full of repeated words, so patience anchors don't pay off
+    for tag, a0, a1, b0, b1 in diff_opcodes(old_tokens, new_tokens, patience=False):
+        if tag == 'equal':
+            length = sum(len(token) for token in old_tokens[a0:a1])
+            if edits and edits[-1][0] == '=':
+                edits[-1][1] += length
+            else:
+                edits.append(['=', length])
+        elif tag == 'delete':
+            edits.append(['-', ''.join(old_tokens[a0:a1])])
+        else:
+            edits.append(['+', ''.join(new_tokens[b0:b1])])
+    return edits
+
+def diff_documents(old_text: str, new_text: str, max_d: int = 1000) -> Dict[str, Any]:
+    """Paragraph-aligned change set with word-level edits inside modified paragraphs"""
+    old = old_text.split('\n')
+    new = new_text.split('\n')
+    opcodes = diff_opcodes(old, new, max_d)
+    
+    changes = []
+    stats = {'paragraphs_old': len(old), 'paragraphs_new': len(new), 'unchanged': 0, 'modified': 0, 'inserted': 0, 'deleted': 0}
+    index = 0
+    while index < len(opcodes):
+        tag, a0, a1, b0, b1 = opcodes[index]
+        if tag == 'equal':
+            stats['unchanged'] += a1 - a0
+            index += 1
+            continue
+        
+        # A deletion next to an insertion is an edit; pair paragraphs up and diff their words
+        deleted, inserted = (a0, a1), (b0, b0)
+        if tag == 'insert':
+            deleted, inserted = (a0, a0), (b0, b1)
+        elif index + 1 < len(opcodes) and opcodes[index + 1][0] == 'insert':
+            inserted = (opcodes[index + 1][3], opcodes[index + 1][4])
+            index += 1
+        index += 1
+        
+        paired = min(deleted[1] - deleted[0], inserted[1] - inserted[0])
+        for offset in range(paired):
+            changes.append({
+                'op': 'modify',
+                'at': deleted[0] + offset,
+                'edits': word_diff(old[deleted[0] + offset], new[inserted[0] + offset])
+            })
+        stats['modified'] += paired
+        if deleted[1] - deleted[0] > paired:
+            changes.append({'op': 'delete', 'at': deleted[0] + paired, 'paragraphs': old[deleted[0] + paired:deleted[1]]})
+            stats['deleted'] += deleted[1] - deleted[0] - paired
+        if inserted[1] - inserted[0] > paired:
+            changes.append({'op': 'insert', 'at': deleted[1], 'paragraphs': new[inserted[0] + paired:inserted[1]]})
+            stats['inserted'] += inserted[1] - inserted[0] - paired
+    
+    return {'stats': stats, 'changes': changes}
+
+def apply_changes(old_text: str, change_set: Dict[str, Any]) -> str:
+    """Rebuild the new text from the old one and a change set, as a redline renderer would"""
+    old = old_text.split('\n')
+    new: List[str] = []
+    position = 0
+    for change in change_set['changes']:
+        new.extend(old[position:change['at']])
+        position = change['at']
+        if change['op'] == 'insert':
+            new.extend(change['paragraphs'])
+        elif change['op'] == 'delete':
+            position += len(change['paragraphs'])
+        else:
+            paragraph = old[position]
+            parts = []
+            cursor = 0
+            for op, value in change['edits']:
+                if op == '=':
+                    parts.append(paragraph[cursor:cursor + value])
+                    cursor += value
+                elif op == '-':
+                    cursor += len(value)
+                else:
+                    parts.append(value)
+            new.append(''.join(parts))
+            position += 1
+    new.extend(old[position:])
+    return '\n'.join(new)
\ No newline at end of file
@@ -1,20 +1,25 @@
-from jinja2 import Environment, BaseLoader, Template
-from typing import Dict, List, Optional
+from jinja2 import Template
+from typing import Dict, List, AsyncIterator, Optional, Tuple
 import mammoth
 from docx import Document
 from pypdf import PdfReader, PdfWriter
 import json
 from datetime import datetime
 from .nlp_processor import NLPProcessor
+from .template_cache import CompiledTemplateCache, get_template_cache
+from .template_processor import DEFAULT_CHUNK_SIZE, stream_render
+from .format_converter import FormatConverter
+from .conversion_executor import get_conversion_executor
+# template-service is a sibling service, not a parent package, so it is imported by its installed name
+from template_service.template_inheritance import merge_chain, resolve_chain
 
 class DocumentGenerator:
-    def __init__(self):
-        self.env = Environment(
-            loader=BaseLoader(),
-            trim_blocks=True,
-            lstrip_blocks=True
-        )
+    def __init__(self, template_cache: Optional[CompiledTemplateCache] = None):
+        # Compiled templates are shared across generators and invalidated by template-service
+        self.template_cache = template_cache or get_template_cache()
+        self.env = self.template_cache.env
         self.nlp = NLPProcessor()
+        self.format_converter = FormatConverter(executor=get_conversion_executor())
         
     async def generate_document(
         self,
@@ -37,37 +42,80 @@ class DocumentGenerator:
         # Convert to requested format
         return await self._convert_format(content, format)
     
+    async def generate_document_stream(
+        self,
+        template_id: str,
+        variables: Dict,
+        format: str = "docx",
+        context: Optional[Dict] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """Generate a document as a stream of converted chunks, for very large renders"""
+        template = await self._get_template_chain(template_id)
+        processed_vars = await self._process_variables(variables, context)
+        
+        # Rendered chunks feed the converter directly, so memory is bounded by chunk size
+        chunks = stream_render(template, processed_vars, chunk_size)
+        async for data in self.format_converter.convert_stream(chunks, "text", format):
+            yield data
+    
+    async def compiled_template(self, template_id: str) -> Template:
+        """Compiled template with its inheritance resolved, for rendering many documents"""
+        return await self._get_template_chain(template_id)
+    
     async def _get_template_chain(self, template_id: str) -> Template:
         """Resolve template inheritance chain"""
         template = await self._load_template(template_id)
         
-        # Process inheritance
+        # The resolved checksum changes whenever an ancestor does
+        version = (template.version, template.resolved_checksum)
+        
+        # Reuse the compiled template for this version when available
+        compiled = self.template_cache.get(template_id, version)
+        if compiled is not None:
+            return compiled
+        
+        # The chain is materialised when templates are saved, so one lookup suffices
+        if template.resolved_content is not None:
+            return self.template_cache.compile(template_id, version, template.resolved_content)
+        
+        # Unmaterialised templates are merged exactly as template-service materialises them
+        content = template.content
         if template.parent_templates:
-            parent_content = ""
-            for parent in template.parent_templates:
-                parent_content += await self._load_template(parent.id)
-            
-            # Merge parent and child templates
-            template.content = self._merge_templates(parent_content, template.content)
+            parents, contents = await self._load_ancestry(template)
+            content = merge_chain(resolve_chain(str(template.id), parents), contents)
         
-        return self.env.from_string(template.content)
+        return self.template_cache.compile(template_id, version, content)
+    
+    async def _load_ancestry(self, template) -> Tuple[Dict[str, List[str]], Dict[str, str]]:
+        """Parent ids and content of a template and all its ancestors, keyed by template id"""
+        parents: Dict[str, List[str]] = {}
+        contents: Dict[str, str] = {}
+        pending = [template]
+        while pending:
+            current = pending.pop()
+            current_id = str(current.id)
+            if current_id in contents:
+                continue
+            contents[current_id] = current.content
+            parents[current_id] = [str(parent.id) for parent in current.parent_templates]
+            for parent_id in parents[current_id]:
+                if parent_id not in contents:
+                    pending.append(await self._load_template(parent_id))
+        return parents, contents
     
     async def _process_variables(self, variables: Dict, context: Optional[Dict]) -> Dict:
         """Process and enhance variables with NLP"""
         processed = variables.copy()
         
-        # Enhance content with NLP where appropriate
-        for key, value in processed.items():
-            if isinstance(value, str) and len(value) > 50:  # Only process longer text
-                processed[key] = await self.nlp.enhance_content(value, context)
+        # Enhance content with NLP where appropriate, as one batch
+        keys = [key for key, value in processed.items() if isinstance(value, str) and len(value) > 50]  # Only process longer text
+        if keys:
+            enhanced = await self.nlp.enhance_batch([processed[key] for key in keys], context)
+            processed.update(zip(keys, enhanced))
         
         return processed
     
     async def _convert_format(self, content: str, format: str) -> bytes:
         """Convert document to requested format"""
-        if format == "docx":
-            return await self._to_docx(content)
-        elif format == "pdf":
-            return await self._to_pdf(content)
-        else:
-            return content.encode('utf-8') 
\ No newline at end of file
+        return await self.format_converter.convert(content, "text", format) 
\ No newline at end of file
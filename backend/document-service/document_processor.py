@@ -1,9 +1,14 @@
 from typing import Dict, Optional, List
 from datetime import datetime
+import asyncio
 from .document_generator import DocumentGenerator
 from .template_processor import TemplateProcessor
 from .nlp_processor import NLPProcessor
 from .format_converter import FormatConverter
+from .diff_engine import diff_documents
+from .blob_store import canonical_form, get_blob_store
+from .conversion_executor import get_conversion_executor
+from .document_repository import get_document_repository
 from ..models.document import Document
 from ..models.audit import AuditRecord
 
@@ -12,7 +17,9 @@ class DocumentProcessor:
         self.generator = DocumentGenerator()
         self.template_processor = TemplateProcessor()
         self.nlp_processor = NLPProcessor()
-        self.format_converter = FormatConverter()
+        self.format_converter = FormatConverter(executor=get_conversion_executor())
+        self.blob_store = get_blob_store()
+        self.repository = get_document_repository()
     
     async def process_document(
         self,
@@ -98,9 +105,17 @@ class DocumentProcessor:
         if parent_doc:
             version = parent_doc.version + 1
         
+        # Near-identical versions share most chunks, so the row keeps only a manifest when chunking is enabled.
+        # DOCX parts are stored uncompressed: deflated bytes differ throughout after any edit.
+        manifest = None
+        if self.blob_store is not None:
+            loop = asyncio.get_running_loop()
+            manifest = await loop.run_in_executor(None, lambda: self.blob_store.put(canonical_form(content)))
+        
         # Create new document version
         new_doc = Document(
-            content=content,
+            content=None if manifest else content,
+            content_manifest=manifest,
             version=version,
             parent_version_id=parent_doc.id if parent_doc else None,
             created_by=user_id,
@@ -145,9 +160,29 @@ class DocumentProcessor:
     
     async def _compute_diff(self, old_doc: Document, new_doc: Document) -> Dict:
         """Compute differences between document versions"""
-        # Implementation of diff logic here
-        # Could use libraries like difflib for text comparison
-        pass
+        old_text = await self._diff_text(await self._content(old_doc))
+        new_text = await self._diff_text(await self._content(new_doc))
+        
+        # Alignment is CPU-bound, so keep it off the event loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, diff_documents, old_text, new_text)
+    
+    async def _content(self, document: Document) -> bytes:
+        """Stored content, reassembled from the blob store for chunked documents"""
+        # Content columns are deferred, and lazy loads fail under AsyncSession, so read them with an explicit query
+        return await self.repository.get_content(document.id)
+    
+    async def _diff_text(self, content) -> str:
+        """Plain text of stored content, one paragraph per line"""
+        if isinstance(content, str):
+            return content
+        
+        # Stored content is whatever format was generated; recognise it by its magic bytes
+        if content.startswith(b'PK'):
+            content = await self.format_converter.convert(content, source_format="docx", target_format="text")
+        elif content.startswith(b'%PDF'):
+            content = await self.format_converter.convert(content, source_format="pdf", target_format="text")
+        return content.decode('utf-8', errors='replace')
     
     async def _load_document(self, document_id: str) -> Optional[Document]:
         """Load document from database"""
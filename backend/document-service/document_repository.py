@@ -0,0 +1,148 @@
+from typing import Dict, List, Any, Callable, Optional, Tuple
+import asyncio
+from sqlalchemy import exists, select
+from .blob_store import BlobStore, get_blob_store
+from ..models.base import async_session
+from ..models.document import Document, DocumentStatus
+
+# Queries go through the table, so only the columns named are read and nothing is decrypted by accident
+documents = Document.__table__
+
+# Content columns are never part of a listing; everything else is cheap to read
+CONTENT_COLUMNS = ('content', 'content_manifest')
+LISTING_COLUMNS = [column for column in documents.c if column.name not in CONTENT_COLUMNS]
+
+class DocumentRepository:
+    """Document queries that return metadata and version info, loading content only on request"""
+    
+    def __init__(self, session_factory: Callable = async_session, blob_store: Optional[BlobStore] = None):
+        self.session_factory = session_factory
+        self.blob_store = blob_store or get_blob_store()
+    
+    async def list_documents(
+        self,
+        owner_id: Optional[int] = None,
+        status: Optional[str] = None,
+        jurisdiction: Optional[str] = None,
+        template_id: Optional[int] = None,
+        latest_only: bool = True,
+        limit: int = 50,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Documents matching the filters, newest first, without their content"""
+        query = self._listing(latest_only).where(*self._filters(owner_id, status, jurisdiction, template_id))
+        return await self._fetch(query, limit, offset)
+    
+    async def search(
+        self,
+        text: str,
+        owner_id: Optional[int] = None,
+        status: Optional[str] = None,
+        jurisdiction: Optional[str] = None,
+        latest_only: bool = True,
+        limit: int = 50,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Documents whose title matches, without their content"""
+        # Wildcards in the search text match literally
+        pattern = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        query = self._listing(latest_only).where(
+            documents.c.title.ilike(f"%{pattern}%", escape='\\'),
+            *self._filters(owner_id, status, jurisdiction, None)
+        )
+        return await self._fetch(query, limit, offset)
+    
+    async def list_versions(self, document_id: int) -> List[Dict[str, Any]]:
+        """Every version in a document's lineage up to this one, oldest first"""
+        lineage = select(*LISTING_COLUMNS).where(documents.c.id == document_id).cte('lineage', recursive=True)
+        parent = documents.alias('parent')
+        lineage = lineage.union_all(
+            select(*[parent.c[column.name] for column in LISTING_COLUMNS]).where(parent.c.id == lineage.c.parent_version_id)
+        )
+        async with self.session_factory() as session:
+            result = await session.execute(select(lineage).order_by(lineage.c.version))
+            return [self._row(row) for row in result.mappings()]
+    
+    async def get_content(self, document_id: int) -> bytes:
+        """Full content, reassembled from the blob store when the document is chunked"""
+        manifest, content = await self._load_content(document_id)
+        if manifest is None:
+            return content
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.blob_store.get, manifest)
+    
+    async def read_content_range(self, document_id: int, start: int, end: Optional[int] = None) -> Tuple[bytes, int, int]:
+        """Bytes [start, end) for previews, with slice semantics for negative start; returns data, first byte and total size"""
+        async with self.session_factory() as session:
+            manifest = (await session.execute(
+                select(documents.c.content_manifest).where(documents.c.id == document_id)
+            )).scalar_one_or_none()
+        
+        if manifest is not None:
+            # Chunked documents are read chunk by chunk; the rest of the content is never fetched
+            size = manifest['size']
+            first, last, _ = slice(start, end).indices(size)
+            loop = asyncio.get_running_loop()
+            data = await loop.run_in_executor(None, self.blob_store.read_range, manifest, first, last)
+            return data, first, size
+        
+        # Inline content is one encrypted value, so it has to be fetched whole
+        content = await self.get_content(document_id)
+        first, last, _ = slice(start, end).indices(len(content))
+        return content[first:last], first, len(content)
+    
+    async def _load_content(self, document_id: int) -> Tuple[Optional[Dict], Optional[bytes]]:
+        async with self.session_factory() as session:
+            row = (await session.execute(
+                select(documents.c.content_manifest, documents.c.content).where(documents.c.id == document_id)
+            )).one_or_none()
+        if row is None:
+            raise KeyError(f"Document {document_id} not found")
+        return row.content_manifest, row.content
+    
+    def _listing(self, latest_only: bool):
+        """Select metadata columns, optionally only the newest version of each lineage"""
+        query = select(*LISTING_COLUMNS)
+        if latest_only:
+            child = documents.alias('child')
+            query = query.where(~exists().where(child.c.parent_version_id == documents.c.id))
+        return query.order_by(documents.c.updated_at.desc(), documents.c.id.desc())
+    
+    def _filters(
+        self,
+        owner_id: Optional[int],
+        status: Optional[str],
+        jurisdiction: Optional[str],
+        template_id: Optional[int]
+    ) -> List[Any]:
+        filters = []
+        if owner_id is not None:
+            filters.append(documents.c.owner_id == owner_id)
+        if status is not None:
+            filters.append(documents.c.status == DocumentStatus(status))
+        if jurisdiction is not None:
+            filters.append(documents.c.jurisdiction == jurisdiction)
+        if template_id is not None:
+            filters.append(documents.c.template_id == template_id)
+        return filters
+    
+    async def _fetch(self, query, limit: int, offset: int) -> List[Dict[str, Any]]:
+        async with self.session_factory() as session:
+            result = await session.execute(query.limit(limit).offset(offset))
+            return [self._row(row) for row in result.mappings()]
+    
+    def _row(self, row) -> Dict[str, Any]:
+        """JSON-ready listing entry"""
+        entry = dict(row)
+        if isinstance(entry.get('status'), DocumentStatus):
+            entry['status'] = entry['status'].value
+        return entry
+
+_shared_repository: Optional[DocumentRepository] = None
+
+def get_document_repository() -> DocumentRepository:
+    """Process-wide repository over the shared database session factory"""
+    global _shared_repository
+    if _shared_repository is None:
+        _shared_repository = DocumentRepository()
+    return _shared_repository
\ No newline at end of file
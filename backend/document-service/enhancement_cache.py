@@ -0,0 +1,150 @@
+from typing import Dict, List, Any, Iterable, Optional
+from collections import OrderedDict
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+def enhancement_key(text: str, context: Dict[str, Any], model_version: str) -> str:
+    """Address for one enhancement: the text, the context that shapes it and the model that produced it"""
+    digest = hashlib.sha256(text.encode('utf-8'))
+    digest.update(b'\0' + json.dumps(context, sort_keys=True, default=str).encode('utf-8'))
+    digest.update(f"\0{model_version}".encode('utf-8'))
+    return digest.hexdigest()
+
+class EnhancementCache:
+    """Enhanced text in a memory LRU, optionally backed by a SQLite file shared between processes"""
+    
+    def __init__(self, max_entries: int = 4096, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.path = path
+        self.entries: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+        self.connection: Optional[sqlite3.Connection] = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.connection = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+            # WAL lets readers in other workers proceed while one of them writes
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS enhancements (key TEXT PRIMARY KEY, text TEXT NOT NULL)")
+        
+        self.memory_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: str) -> Optional[str]:
+        """Cached enhancement for a key"""
+        return self.get_many([key]).get(key)
+    
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Cached enhancements for the keys that have one, promoting persistent hits into memory"""
+        found: Dict[str, str] = {}
+        missing = []
+        with self.lock:
+            for key in keys:
+                text = self.entries.get(key)
+                if text is None:
+                    missing.append(key)
+                    continue
+                self.memory_hits += 1
+                self.entries.move_to_end(key)
+                found[key] = text
+        
+        stored = self._read(missing) if missing else {}
+        with self.lock:
+            for key in missing:
+                if key in stored:
+                    self.persistent_hits += 1
+                    self._remember(key, stored[key])
+                    found[key] = stored[key]
+                else:
+                    self.misses += 1
+        return found
+    
+    def put(self, key: str, text: str) -> None:
+        """Store an enhancement"""
+        self.put_many({key: text})
+    
+    def put_many(self, items: Dict[str, str]) -> None:
+        """Store a batch of enhancements in memory and, in one transaction, persistently"""
+        with self.lock:
+            for key, text in items.items():
+                self._remember(key, text)
+        if self.connection is not None and items:
+            self._write(items)
+    
+    def clear(self) -> None:
+        """Drop the memory tier"""
+        with self.lock:
+            self.entries.clear()
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Hit counts per tier"""
+        lookups = self.memory_hits + self.persistent_hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'memory_hits': self.memory_hits,
+            'persistent_hits': self.persistent_hits,
+            'misses': self.misses,
+            'hit_rate': (self.memory_hits + self.persistent_hits) / lookups if lookups else 0.0,
+            'evictions': self.evictions
+        }
+    
+    def _remember(self, key: str, text: str) -> None:
+        """Add to the memory LRU, evicting the least recently used entry over the limit"""
+        if self.max_entries <= 0:
+            return
+        self.entries[key] = text
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+    
+    def _read(self, keys: List[str]) -> Dict[str, str]:
+        """Look keys up in the persistent tier, in chunks under SQLite's parameter limit"""
+        if self.connection is None:
+            return {}
+        stored: Dict[str, str] = {}
+        try:
+            with self.lock:
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    rows = self.connection.execute(
+                        f"SELECT key, text FROM enhancements WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                    )
+                    stored.update(rows)
+        except sqlite3.Error:
+            # The persistent tier is an optimisation; a locked or damaged file just means misses
+            logger.exception("Failed to read enhancement cache")
+        return stored
+    
+    def _write(self, items: Dict[str, str]) -> None:
+        """Write a batch in one transaction"""
+        with self.lock:
+            try:
+                self.connection.execute("BEGIN")
+                self.connection.executemany("INSERT OR REPLACE INTO enhancements (key, text) VALUES (?, ?)", items.items())
+                self.connection.execute("COMMIT")
+            except sqlite3.Error:
+                logger.exception("Failed to write enhancement cache")
+                if self.connection.in_transaction:
+                    self.connection.execute("ROLLBACK")
+
+_shared_cache: Optional[EnhancementCache] = None
+
+def get_enhancement_cache() -> EnhancementCache:
+    """Process-wide cache shared by every NLP processor"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = EnhancementCache(
+            max_entries=int(os.getenv('ENHANCEMENT_CACHE_SIZE', '4096')),
+            path=os.getenv('ENHANCEMENT_CACHE_PATH') or None
+        )
+    return _shared_cache
\ No newline at end of file
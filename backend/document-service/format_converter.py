@@ -1,57 +1,389 @@
-from typing import Union
+from typing import Dict, List, AsyncIterator, Optional, Tuple, Union
 import mammoth
 from docx import Document
-from pypdf import PdfReader, PdfWriter
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
 import markdown
 import html2docx
+from html.parser import HTMLParser
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+import asyncio
 import io
+import re
+import zipfile
+from .conversion_cache import ConversionCache, conversion_key, get_conversion_cache
+from .conversion_executor import ConversionExecutor
+from .conversion_graph import ConversionGraph
+from .pdf_extractor import PdfExtractor, get_pdf_extractor
+
+# Part of every conversion cache key; bump when any converter's output changes
+CONVERTER_VERSION = '3'
+
+# Characters XML 1.0 cannot carry
+XML_INVALID = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+
+DOCX_RELATIONSHIPS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+DOCX_DOCUMENT_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+)
+DOCX_DOCUMENT_END = '</w:body></w:document>'
+
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+WORD_PARAGRAPH = WORD_NAMESPACE + 'p'
+WORD_TEXT = WORD_NAMESPACE + 't'
+WORD_TAB = WORD_NAMESPACE + 'tab'
+WORD_BREAK = WORD_NAMESPACE + 'br'
+
+# Tags and character references, which only HTML rendering interprets
+MARKUP = re.compile(r'<[A-Za-z/!]|&(?:#\d+|#x[0-9A-Fa-f]+|[A-Za-z]+);')
+
+def has_markup(content: str) -> bool:
+    """Whether text carries HTML tags or entities"""
+    return MARKUP.search(content) is not None
+
+MARKDOWN_HEADING = re.compile(r'^(#{1,6})\s+(.*?)\s*#*$')
+MARKDOWN_LIST_ITEM = re.compile(r'^(?:([-*+])|\d+[.)])\s+(.*)$')
+MARKDOWN_EMPHASIS = re.compile(r'(\*\*[^*]+\*\*|\*[^*]+\*)')
+
+class StreamBuffer(io.RawIOBase):
+    """Unseekable sink that hands written bytes back in chunks"""
+    
+    def __init__(self):
+        self.buffer = bytearray()
+        self.position = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        self.buffer.extend(data)
+        self.position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self.position
+    
+    def drain(self) -> bytes:
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+class _HTMLTextExtractor(HTMLParser):
+    """Collect visible text from HTML, breaking lines at block elements"""
+    BLOCK_TAGS = {'p', 'div', 'br', 'li', 'tr', 'pre', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+    SKIP_TAGS = {'script', 'style'}
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.skip_depth = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append('\n')
+    
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self.skip_depth = max(self.skip_depth - 1, 0)
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append('\n')
+    
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.parts.append(data)
 
 class FormatConverter:
+    def __init__(
+        self,
+        graph: Optional[ConversionGraph] = None,
+        pdf_extractor: Optional[PdfExtractor] = None,
+        cache: Optional[ConversionCache] = None,
+        executor: Optional[ConversionExecutor] = None
+    ):
+        self.graph = graph or self._default_graph()
+        self.pdf_extractor = pdf_extractor or get_pdf_extractor()
+        self.cache = cache if cache is not None else get_conversion_cache()
+        
+        # Services hand conversions to worker processes; without an executor they run in-process
+        self.executor = executor
+    
+    def _default_graph(self) -> ConversionGraph:
+        """Converters between formats, with initial costs as (seconds per call, seconds per megabyte)"""
+        # Plain text drops structure, so it is only ever the last step of a path
+        graph = ConversionGraph(terminal=("text",))
+        
+        # Conversions through HTML, which every source can reach
+        graph.add("text", "html", self._text_to_html, 0.0, 0.0)
+        graph.add("markdown", "html", self._markdown_to_html, 0.0005, 0.05)
+        graph.add("docx", "html", self._docx_to_html, 0.01, 0.5)
+        graph.add("pdf", "html", self._pdf_to_html, 0.01, 1.0)
+        graph.add("html", "docx", self._html_to_docx, 0.03, 2.0)
+        graph.add("html", "pdf", self._html_to_pdf, 0.05, 2.0)
+        graph.add("html", "text", self._html_to_text, 0.0002, 0.1)
+        
+        # Direct paths that skip HTML parsing
+        graph.add("text", "docx", self._text_to_docx, 0.02, 0.5)
+        graph.add("markdown", "docx", self._markdown_to_docx, 0.025, 0.8)
+        graph.add("docx", "text", self._docx_to_text, 0.0005, 0.05)
+        graph.add("docx", "markdown", self._docx_to_markdown, 0.01, 0.5)
+        graph.add("pdf", "text", self._pdf_to_text, 0.01, 1.0)
+        
+        # Where routes give different output, one is pinned so results don't depend on timings.
+        # Text with markup is rendered as HTML, so the markup is formatted rather than written literally;
+        # text without any goes straight into DOCX paragraphs.
+        graph.pin("text", "html", "docx", when=has_markup)
+        graph.pin("text", "docx")
+        graph.pin("markdown", "docx")
+        graph.pin("docx", "text")
+        graph.pin("pdf", "text")
+        return graph
+    
     async def convert(
         self,
         content: Union[str, bytes],
         source_format: str,
         target_format: str
     ) -> bytes:
-        """Convert content between different formats"""
-        
-        # First convert to HTML as intermediate format
-        html_content = await self._to_html(content, source_format)
-        
-        # Then convert HTML to target format
-        if target_format == "docx":
-            return await self._html_to_docx(html_content)
-        elif target_format == "pdf":
-            return await self._html_to_pdf(html_content)
-        elif target_format == "markdown":
-            return await self._html_to_markdown(html_content)
-        else:
-            return html_content.encode('utf-8')
-    
-    async def _to_html(self, content: Union[str, bytes], source_format: str) -> str:
-        """Convert source content to HTML"""
-        if source_format == "markdown":
-            return markdown.markdown(content)
-        elif source_format == "docx":
-            result = mammoth.convert_to_html(content)
-            return result.value
-        elif source_format == "pdf":
-            # Extract text from PDF and convert to HTML
-            reader = PdfReader(io.BytesIO(content))
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text()
-            return f"<pre>{text}</pre>"
+        """Convert content between different formats along the cheapest converter path"""
+        key = conversion_key(content, source_format, target_format, CONVERTER_VERSION)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
+        if self.executor is not None:
+            result = await self.executor.convert(content, source_format, target_format)
         else:
-            return content
+            result = await self.graph.convert(content, source_format, target_format)
+            result = result.encode('utf-8') if isinstance(result, str) else result
+        if result is not None:
+            self.cache.put(key, result)
+        return result
+    
+    async def convert_stream(
+        self,
+        chunks: AsyncIterator[str],
+        source_format: str,
+        target_format: str
+    ) -> AsyncIterator[bytes]:
+        """Convert rendered chunks as they arrive, holding at most one chunk in memory"""
+        if target_format in ("html", "text", "docx") and source_format in ("text", "html"):
+            if target_format == "docx":
+                stream = self._stream_docx(self._stream_lines(chunks))
+            elif target_format == "text":
+                stream = self._stream_text(self._stream_lines(chunks))
+            else:
+                stream = (chunk.encode('utf-8') async for chunk in chunks)
+            async for data in stream:
+                if data:
+                    yield data
+            return
+        
+        # Other formats need the whole document, so collect it and convert once
+        content = ''.join([chunk async for chunk in chunks])
+        yield await self.convert(content, source_format, target_format)
+    
+    async def _stream_lines(self, chunks: AsyncIterator[str]) -> AsyncIterator[List[str]]:
+        """Visible text lines per chunk, stripped and without blanks, as _html_to_text produces"""
+        extractor = _HTMLTextExtractor()
+        carry = ''
+        async for chunk in chunks:
+            extractor.feed(chunk)
+            text = carry + ''.join(extractor.parts)
+            extractor.parts.clear()
+            *lines, carry = text.split('\n')
+            yield [line.strip() for line in lines if line.strip()]
+        
+        extractor.close()
+        lines = (carry + ''.join(extractor.parts)).split('\n')
+        yield [line.strip() for line in lines if line.strip()]
+    
+    async def _stream_text(self, batches: AsyncIterator[List[str]]) -> AsyncIterator[bytes]:
+        """Newline-joined text, streamed batch by batch"""
+        first = True
+        async for lines in batches:
+            if lines:
+                yield (('' if first else '\n') + '\n'.join(lines)).encode('utf-8')
+                first = False
+    
+    async def _stream_docx(self, batches: AsyncIterator[List[str]]) -> AsyncIterator[bytes]:
+        """Write a minimal DOCX, one paragraph per line, straight into a streamed ZIP"""
+        sink = StreamBuffer()
+        with zipfile.ZipFile(sink, mode='w', compression=zipfile.ZIP_DEFLATED) as package:
+            package.writestr('[Content_Types].xml', DOCX_CONTENT_TYPES)
+            package.writestr('_rels/.rels', DOCX_RELATIONSHIPS)
+            with package.open('word/document.xml', mode='w', force_zip64=True) as document:
+                document.write(DOCX_DOCUMENT_START.encode('utf-8'))
+                async for lines in batches:
+                    document.write(''.join(
+                        f'<w:p><w:r><w:t xml:space="preserve">{escape(XML_INVALID.sub("", line))}</w:t></w:r></w:p>'
+                        for line in lines
+                    ).encode('utf-8'))
+                    yield sink.drain()
+                document.write(DOCX_DOCUMENT_END.encode('utf-8'))
+        yield sink.drain()
+    
+    async def _text_to_html(self, content: str) -> str:
+        """Plain text is passed through as HTML"""
+        return content
+    
+    async def _markdown_to_html(self, content: str) -> str:
+        """Convert Markdown to HTML"""
+        return markdown.markdown(content)
+    
+    async def _docx_to_html(self, content: bytes) -> str:
+        """Convert DOCX to HTML"""
+        result = mammoth.convert_to_html(io.BytesIO(content))
+        return result.value
+    
+    async def _pdf_to_html(self, content: bytes) -> str:
+        """Extract text from PDF and wrap it as HTML"""
+        text = await self._pdf_to_text(content)
+        return f"<pre>{escape(text)}</pre>"
+    
+    async def _pdf_to_text(self, content: Union[str, bytes]) -> str:
+        """Extract text from every PDF page in worker processes, off the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.pdf_extractor.extract_text, content)
     
     async def _html_to_docx(self, html: str) -> bytes:
         """Convert HTML to DOCX"""
-        doc = html2docx.html2docx(html)
+        return html2docx.html2docx(html, title="").getvalue()
+    
+    async def _text_to_docx(self, content: str) -> bytes:
+        """Write plain text lines straight into DOCX paragraphs"""
+        paragraphs = []
+        for line in content.splitlines():
+            line = line.strip()
+            if line:
+                paragraphs.append((None, [(line, False, False)]))
+        return self._build_docx(paragraphs)
+    
+    async def _markdown_to_docx(self, content: str) -> bytes:
+        """Map Markdown headings, lists and emphasis onto DOCX styles without rendering HTML"""
+        paragraphs = []
+        lines: List[str] = []
+        
+        def flush():
+            if lines:
+                paragraphs.append((None, self._markdown_runs(' '.join(lines))))
+                lines.clear()
+        
+        for line in content.splitlines():
+            line = line.strip()
+            heading = MARKDOWN_HEADING.match(line)
+            item = MARKDOWN_LIST_ITEM.match(line)
+            if not line:
+                flush()
+            elif heading:
+                flush()
+                paragraphs.append((f"Heading {len(heading.group(1))}", self._markdown_runs(heading.group(2))))
+            elif item:
+                flush()
+                style = 'List Bullet' if item.group(1) else 'List Number'
+                paragraphs.append((style, self._markdown_runs(item.group(2))))
+            else:
+                lines.append(line)
+        flush()
+        return self._build_docx(paragraphs)
+    
+    def _markdown_runs(self, text: str) -> List[Tuple[str, bool, bool]]:
+        """Split text into (text, bold, italic) runs on **bold** and *italic* emphasis"""
+        runs = []
+        for part in MARKDOWN_EMPHASIS.split(text):
+            if part.startswith('**') and part.endswith('**') and len(part) > 4:
+                runs.append((part[2:-2], True, False))
+            elif part.startswith('*') and part.endswith('*') and len(part) > 2:
+                runs.append((part[1:-1], False, True))
+            elif part:
+                runs.append((part, False, False))
+        return runs
+    
+    def _build_docx(self, paragraphs: List[Tuple[Optional[str], List[Tuple[str, bool, bool]]]]) -> bytes:
+        """Fill python-docx's default template with (style, runs) paragraphs in one XML parse"""
+        doc = Document()
+        
+        # Style lookups scan styles.xml, so resolve each style once rather than per paragraph
+        style_ids: Dict[str, str] = {}
+        xml = []
+        for style, runs in paragraphs:
+            properties = ''
+            if style:
+                if style not in style_ids:
+                    style_ids[style] = doc.styles[style].style_id
+                properties = f'<w:pPr><w:pStyle w:val="{style_ids[style]}"/></w:pPr>'
+            xml.append('<w:p>' + properties + ''.join(
+                '<w:r>'
+                + ('<w:rPr><w:b/></w:rPr>' if bold else '<w:rPr><w:i/></w:rPr>' if italic else '')
+                + f'<w:t xml:space="preserve">{escape(XML_INVALID.sub("", text))}</w:t></w:r>'
+                for text, bold, italic in runs
+            ) + '</w:p>')
+        
+        section = doc.element.body.sectPr
+        for paragraph in parse_xml(f'<w:body {nsdecls("w")}>{"".join(xml)}</w:body>'):
+            section.addprevious(paragraph)
+        return self._save_docx(doc)
+    
+    def _save_docx(self, doc) -> bytes:
+        """Serialise a python-docx document"""
         buffer = io.BytesIO()
         doc.save(buffer)
         return buffer.getvalue()
     
+    async def _docx_to_text(self, content: bytes) -> str:
+        """Read paragraph text straight from the DOCX body XML"""
+        lines = []
+        parts: List[str] = []
+        with zipfile.ZipFile(io.BytesIO(content)) as package:
+            with package.open('word/document.xml') as document:
+                for _, element in ElementTree.iterparse(document):
+                    if element.tag == WORD_TEXT:
+                        parts.append(element.text or '')
+                    elif element.tag == WORD_TAB:
+                        parts.append('\t')
+                    elif element.tag == WORD_BREAK:
+                        parts.append('\n')
+                    elif element.tag == WORD_PARAGRAPH:
+                        lines.extend(''.join(parts).split('\n'))
+                        parts.clear()
+                        element.clear()
+        return '\n'.join(line.strip() for line in lines if line.strip())
+    
+    async def _docx_to_markdown(self, content: bytes) -> str:
+        """Convert DOCX to Markdown in one mammoth pass"""
+        result = mammoth.convert_to_markdown(io.BytesIO(content))
+        return result.value
+    
+    async def _html_to_text(self, html: str) -> str:
+        """Convert HTML to plain text"""
+        extractor = _HTMLTextExtractor()
+        extractor.feed(html)
+        extractor.close()
+        text = ''.join(extractor.parts)
+        lines = [line.strip() for line in text.splitlines()]
+        return '\n'.join(line for line in lines if line)
+    
     async def _html_to_pdf(self, html: str) -> bytes:
         """Convert HTML to PDF"""
         # Implementation using WeasyPrint or similar library
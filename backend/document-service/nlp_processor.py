@@ -1,32 +1,79 @@
-from typing import Dict, Optional
+from typing import Dict, List, Any, Optional
+import asyncio
 import spacy
 from transformers import pipeline
+from .enhancement_cache import EnhancementCache, enhancement_key, get_enhancement_cache
+from ..models.analysis_tier import AnalysisTier, get_tier
+
+# Bump when the enhancement rules change so cached results from older rules are not reused
+ENHANCER_VERSION = '1'
 
 class NLPProcessor:
-    def __init__(self):
-        self.nlp = spacy.load("en_core_web_lg")
+    def __init__(self, cache: Optional[EnhancementCache] = None):
+        # spaCy models are loaded on first use by the tiers that need them
+        self.nlp_models: Dict[str, Any] = {}
         self.summarizer = pipeline("summarization")
         self.generator = pipeline("text-generation")
+        self.cache = cache or get_enhancement_cache()
     
     async def enhance_content(self, text: str, context: Optional[Dict] = None) -> str:
         """Enhance content using NLP"""
+        return (await self.enhance_batch([text], context))[0]
+    
+    async def enhance_batch(self, texts: List[str], context: Optional[Dict] = None) -> List[str]:
+        """Enhance many texts, reusing cached results and parsing the rest as one spaCy batch"""
+        
+        # The analysis tier picks the spaCy model and enhancement steps
+        tier = get_tier((context or {}).get('analysis_tier'))
+        nlp = self._get_nlp(tier.spacy_model)
+        
+        # Boilerplate repeats across variables and documents, so each distinct text is enhanced once
+        cache_context = self._cache_context(tier, context)
+        model_version = f"{tier.spacy_model}-{nlp.meta.get('version', '')}-{ENHANCER_VERSION}"
+        keys = {text: enhancement_key(text, cache_context, model_version) for text in dict.fromkeys(texts)}
+        results = self.cache.get_many(keys.values())
+        misses = [text for text, key in keys.items() if key not in results]
         
-        # Process text with spaCy
-        doc = self.nlp(text)
+        if misses:
+            # Parsing and rewriting are CPU-bound, so the whole batch runs off the event loop
+            loop = asyncio.get_running_loop()
+            enhanced = await loop.run_in_executor(None, self._enhance_texts, misses, nlp, tier, context)
+            enhanced = {keys[text]: result for text, result in zip(misses, enhanced)}
+            self.cache.put_many(enhanced)
+            results.update(enhanced)
         
-        # Perform named entity recognition
-        entities = self._extract_entities(doc)
+        return [results[keys[text]] for text in texts]
+    
+    def _cache_context(self, tier: AnalysisTier, context: Optional[Dict]) -> Dict[str, Any]:
+        """The parts of the context that can change an enhancement's result"""
+        cache_context: Dict[str, Any] = {'tier': tier.name, 'steps': tier.nlp_steps}
+        if context and 'context' in tier.nlp_steps:
+            cache_context['jurisdiction'] = context.get('jurisdiction')
+        return cache_context
+    
+    def _enhance_texts(self, texts: List[str], nlp: Any, tier: AnalysisTier, context: Optional[Dict]) -> List[str]:
+        """Apply the tier's enhancement steps to a batch, parsing each text at most twice"""
+        docs = list(nlp.pipe(texts, batch_size=tier.batch_size))
+        enhanced = list(texts)
         
-        # Enhance content based on context
-        if context:
-            text = await self._context_aware_enhancement(text, context, entities)
+        # Enhance content based on context and named entities
+        if context and 'context' in tier.nlp_steps:
+            enhanced = [
+                self._context_aware_enhancement(text, context, self._extract_entities(doc))
+                for text, doc in zip(enhanced, docs)
+            ]
         
         # Improve text clarity and structure
-        text = await self._improve_text_structure(text)
+        if 'structure' in tier.nlp_steps:
+            # Texts the context step rewrote are parsed again, together; the rest keep their first parse
+            changed = [index for index, (text, original) in enumerate(zip(enhanced, texts)) if text != original]
+            for index, doc in zip(changed, nlp.pipe([enhanced[index] for index in changed], batch_size=tier.batch_size)):
+                docs[index] = doc
+            enhanced = [self._improve_text_structure(doc) for doc in docs]
         
-        return text
+        return enhanced
     
-    async def _context_aware_enhancement(
+    def _context_aware_enhancement(
         self,
         text: str,
         context: Dict,
@@ -43,11 +90,10 @@ class NLPProcessor:
         
         return text
     
-    async def _improve_text_structure(self, text: str) -> str:
+    def _improve_text_structure(self, doc: Any) -> str:
         """Improve text structure and clarity"""
         
         # Split into sentences
-        doc = self.nlp(text)
         sentences = [sent.text.strip() for sent in doc.sents]
         
         # Improve each sentence
@@ -65,6 +111,12 @@ class NLPProcessor:
         
         return ' '.join(improved_sentences)
     
+    def _get_nlp(self, model_name: str) -> Any:
+        """Load a spaCy model once and reuse it across requests"""
+        if model_name not in self.nlp_models:
+            self.nlp_models[model_name] = spacy.load(model_name)
+        return self.nlp_models[model_name]
+    
     def _extract_entities(self, doc) -> Dict:
         """Extract and classify named entities"""
         entities = {}
@@ -0,0 +1,228 @@
+from typing import Dict, List, Any, Deque, Iterator, Optional, Tuple, Union
+from collections import OrderedDict, deque
+from pypdf import PdfReader
+import itertools
+import logging
+import mmap
+import multiprocessing
+import os
+import queue
+import tempfile
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# How often a waiting caller checks whether its task has started or its pool was replaced
+POLL_INTERVAL = 0.05
+
+# Documents each worker keeps open, so interleaved requests don't reopen on every task
+OPEN_DOCUMENTS = 4
+
+# Per-process state, created once by the pool initializer
+_worker_state: Dict[str, Any] = {}
+
+def _open_reader(path: str) -> Tuple[PdfReader, Any, Any]:
+    """Open a PDF through a read-only memory map, so pages are paged in on demand"""
+    file = open(path, 'rb')
+    mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return PdfReader(mapped), mapped, file
+
+def _init_worker(started: Any) -> None:
+    """Per-worker cache of open documents, and the queue that reports task starts"""
+    _worker_state['documents'] = OrderedDict()
+    _worker_state['started'] = started
+
+def _reader(token: str, path: str) -> PdfReader:
+    """The worker's reader for a document, opened on first use"""
+    documents = _worker_state['documents']
+    if token in documents:
+        documents.move_to_end(token)
+        return documents[token][0]
+    
+    documents[token] = _open_reader(path)
+    if len(documents) > OPEN_DOCUMENTS:
+        _, (reader, mapped, file) = documents.popitem(last=False)
+        del reader
+        mapped.close()
+        file.close()
+    return documents[token][0]
+
+def _extract_range(task_id: int, token: str, path: str, start: int, stop: int) -> List[str]:
+    """Extract the text of pages [start, stop) inside a worker process"""
+    # Timeouts run from here, not from submission, so tasks queued behind other documents are not cut short
+    _worker_state['started'].put(task_id)
+    return _extract_pages(_reader(token, path), start, stop)
+
+def _extract_pages(reader: PdfReader, start: int, stop: int) -> List[str]:
+    """Text of pages [start, stop) of an open document"""
+    pages = reader.pages
+    return [pages[number].extract_text() or '' for number in range(start, stop)]
+
+class PdfExtractor:
+    """Page-parallel PDF text extraction on one shared, bounded pool, streamed in page order"""
+    
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        pages_per_task: int = 8,
+        page_timeout: float = 30.0,
+        max_pending: Optional[int] = None,
+        inline_pages: int = 4
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.pages_per_task = pages_per_task
+        self.page_timeout = page_timeout
+        self.max_pending = max_pending or self.workers * 2
+        self.inline_pages = inline_pages
+        
+        # Every document shares one pool, started on first use and replaced only when a page hangs
+        self._lock = threading.Lock()
+        self._pool: Optional[Any] = None
+        self._generation = 0
+        self._started_queue: Optional[Any] = None
+        self._started: Dict[int, float] = {}
+        self._task_ids = itertools.count()
+    
+    def extract_text(self, source: Union[str, bytes]) -> str:
+        """Text of every page, joined without repeated string concatenation"""
+        return ''.join(self.iter_pages(source))
+    
+    def iter_pages(self, source: Union[str, bytes]) -> Iterator[str]:
+        """Yield page text in order from a file path or PDF bytes"""
+        if isinstance(source, str):
+            yield from self._iter_file(source)
+            return
+        
+        # Workers read from a file rather than receiving the document through pipes
+        with tempfile.NamedTemporaryFile(suffix='.pdf') as file:
+            file.write(source)
+            file.flush()
+            yield from self._iter_file(file.name)
+    
+    def close(self) -> None:
+        """Stop the worker processes; the next extraction starts a new pool"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self._generation += 1
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+    
+    def _iter_file(self, path: str) -> Iterator[str]:
+        """Yield page text in order, extracting page ranges in worker processes"""
+        reader, mapped, file = _open_reader(path)
+        try:
+            total = len(reader.pages)
+            
+            # Small documents don't repay a round trip to the pool
+            if total <= self.inline_pages:
+                for page in reader.pages:
+                    yield page.extract_text() or ''
+                return
+        finally:
+            del reader
+            mapped.close()
+            file.close()
+        
+        # Workers cache readers by token, so a path reused for another document is reopened
+        token = uuid.uuid4().hex
+        ranges = deque(
+            (start, min(start + self.pages_per_task, total))
+            for start in range(0, total, self.pages_per_task)
+        )
+        pending: Deque[Tuple[int, int, int, Any]] = deque()
+        pool, generation = self._get_pool()
+        try:
+            while ranges or pending:
+                # Bound in-flight ranges so extracted text never piles up ahead of the reader
+                while ranges and len(pending) < self.max_pending:
+                    start, stop = ranges.popleft()
+                    task_id = next(self._task_ids)
+                    pending.append((start, stop, task_id, pool.apply_async(_extract_range, (task_id, token, path, start, stop))))
+                
+                start, stop, task_id, result = pending[0]
+                try:
+                    texts = self._wait(result, task_id, generation, self.page_timeout * (stop - start))
+                except multiprocessing.TimeoutError:
+                    pending.popleft()
+                    self._requeue(ranges, pending)
+                    # A stuck page holds its worker, so replace the pool
+                    self._restart_pool(generation)
+                    pool, generation = self._get_pool()
+                    if stop - start > 1:
+                        # Retry the range page by page, in parallel, to find the stuck page
+                        ranges.extendleft(reversed([(number, number + 1) for number in range(start, stop)]))
+                        continue
+                    logger.warning(f"PDF page {start + 1} timed out after {self.page_timeout}s, skipping")
+                    texts = ['']
+                else:
+                    if texts is None:
+                        # Another document's stuck page replaced the pool; resubmit what was lost with it
+                        self._requeue(ranges, pending)
+                        pool, generation = self._get_pool()
+                        continue
+                    pending.popleft()
+                yield from texts
+        finally:
+            for _, _, task_id, _ in pending:
+                self._started.pop(task_id, None)
+    
+    def _requeue(self, ranges: Deque[Tuple[int, int]], pending: Deque[Tuple[int, int, int, Any]]) -> None:
+        """Put in-flight ranges back at the front of the queue, in page order"""
+        ranges.extendleft(reversed([(start, stop) for start, stop, _, _ in pending]))
+        for _, _, task_id, _ in pending:
+            self._started.pop(task_id, None)
+        pending.clear()
+    
+    def _wait(self, result: Any, task_id: int, generation: int, timeout: float) -> Optional[List[str]]:
+        """Task result, or None if its pool was replaced; times out only once the task has started"""
+        while not result.ready():
+            if self._generation != generation:
+                return None
+            started = self._started_at(task_id)
+            if started is not None and time.monotonic() - started > timeout:
+                self._started.pop(task_id, None)
+                raise multiprocessing.TimeoutError
+            result.wait(POLL_INTERVAL)
+        self._started.pop(task_id, None)
+        return result.get()
+    
+    def _started_at(self, task_id: int) -> Optional[float]:
+        """When a worker picked up a task, as seen by this process"""
+        with self._lock:
+            while True:
+                try:
+                    self._started[self._started_queue.get_nowait()] = time.monotonic()
+                except queue.Empty:
+                    break
+            return self._started.get(task_id)
+    
+    def _get_pool(self) -> Tuple[Any, int]:
+        """The shared pool and its generation, starting it if needed"""
+        with self._lock:
+            if self._pool is None:
+                # A worker killed mid-report could leave a shared queue locked, so each pool gets its own
+                self._started_queue = multiprocessing.Queue()
+                self._pool = multiprocessing.Pool(self.workers, initializer=_init_worker, initargs=(self._started_queue,))
+            return self._pool, self._generation
+    
+    def _restart_pool(self, generation: int) -> None:
+        """Replace the pool, unless another caller already replaced that generation"""
+        with self._lock:
+            if generation != self._generation or self._pool is None:
+                return
+            pool, self._pool = self._pool, None
+            self._generation += 1
+        pool.terminate()
+        pool.join()
+
+_shared_extractor: Optional[PdfExtractor] = None
+
+def get_pdf_extractor() -> PdfExtractor:
+    """Process-wide extractor, so concurrent conversions share one bounded pool"""
+    global _shared_extractor
+    if _shared_extractor is None:
+        _shared_extractor = PdfExtractor(workers=int(os.getenv('PDF_EXTRACT_WORKERS', '0')) or None)
+    return _shared_extractor
\ No newline at end of file
@@ -0,0 +1,117 @@
+from typing import Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from jinja2 import Environment, BaseLoader, FileSystemBytecodeCache, Template
+import os
+import time
+
+class CompiledTemplateCache:
+    """LRU of compiled Jinja templates keyed by template id and version"""
+    
+    def __init__(
+        self,
+        env: Optional[Environment] = None,
+        max_entries: int = 256,
+        bytecode_dir: Optional[str] = None
+    ):
+        self.env = env or Environment(
+            loader=BaseLoader(),
+            trim_blocks=True,
+            lstrip_blocks=True
+        )
+        self.max_entries = max_entries
+        self.entries: OrderedDict = OrderedDict()
+        
+        # On-disk bytecode survives restarts; Jinja checks it against the source checksum
+        self.bytecode_cache = FileSystemBytecodeCache(bytecode_dir) if bytecode_dir else None
+        
+        self.hits = 0
+        self.misses = 0
+        self.bytecode_hits = 0
+        self.evictions = 0
+        self.compile_seconds = 0.0
+    
+    def get(self, template_id: Any, version: Any) -> Optional[Template]:
+        """Return the compiled template for this version, if cached"""
+        key = (str(template_id), version)
+        template = self.entries.get(key)
+        if template is None:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return template
+    
+    def compile(self, template_id: Any, version: Any, content: str) -> Template:
+        """Compile template source and cache it under its id and version"""
+        key = (str(template_id), version)
+        template = self._compile(key, content)
+        
+        self.entries[key] = template
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return template
+    
+    def invalidate(self, template_id: Any, version: Any = None) -> int:
+        """Drop one version, or every version, of a template"""
+        template_id = str(template_id)
+        keys = [
+            key for key in self.entries
+            if key[0] == template_id and (version is None or key[1] == version)
+        ]
+        for key in keys:
+            del self.entries[key]
+        return len(keys)
+    
+    def clear(self) -> None:
+        """Drop all compiled templates"""
+        self.entries.clear()
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Hit rate and compile time counters"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'bytecode_hits': self.bytecode_hits,
+            'evictions': self.evictions,
+            'compile_seconds': self.compile_seconds,
+            'avg_compile_ms': self.compile_seconds * 1000 / self.misses if self.misses else 0.0
+        }
+    
+    def _compile(self, key: Tuple[str, Any], content: str) -> Template:
+        """Compile source, reusing on-disk bytecode when the checksum matches"""
+        start_time = time.perf_counter()
+        name = f"{key[0]}@{key[1]}"
+        
+        if self.bytecode_cache is None:
+            template = self.env.from_string(content)
+        else:
+            bucket = self.bytecode_cache.get_bucket(self.env, name, None, content)
+            if bucket.code is None:
+                bucket.code = self.env.compile(content, name)
+                self.bytecode_cache.set_bucket(bucket)
+            else:
+                self.bytecode_hits += 1
+            template = self.env.template_class.from_code(
+                self.env, bucket.code, self.env.make_globals(None), None
+            )
+        
+        self.compile_seconds += time.perf_counter() - start_time
+        return template
+
+_shared_cache: Optional[CompiledTemplateCache] = None
+
+def get_template_cache() -> CompiledTemplateCache:
+    """Process-wide cache shared by generators and the invalidation endpoint"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = CompiledTemplateCache(
+            max_entries=int(os.getenv('TEMPLATE_CACHE_SIZE', '256')),
+            bytecode_dir=os.getenv('TEMPLATE_BYTECODE_DIR') or None
+        )
+    return _shared_cache
\ No newline at end of file
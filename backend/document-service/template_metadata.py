@@ -0,0 +1,163 @@
+from typing import Dict, List, Collection, FrozenSet, NamedTuple, Optional, Tuple
+from collections import OrderedDict
+from jinja2 import Environment, Template, meta, nodes
+import hashlib
+import re
+
+# A marker occupies its whole line, from the line start to the newline
+SECTION_MARKER = re.compile(r'^{%\s*(?:section\s+([^\s%]+)|endsection)\s*%}[^\n]*(?:\n|$)', re.MULTILINE)
+CONDITION = re.compile(r'{%\s*if\s+(.*?)\s*%}')
+
+class SectionSpan(NamedTuple):
+    start: int
+    end: int
+    path: Tuple[str, ...]
+
+class SectionIndex:
+    """Character-offset spans of template text, tagged with their enclosing sections"""
+    
+    def __init__(self, content: str, spans: List[SectionSpan], sections: List[str]):
+        self.content = content
+        self.spans = spans
+        self.sections = sections
+    
+    @classmethod
+    def build(cls, content: str) -> 'SectionIndex':
+        """Index section blocks, including nested ones, in a single scan"""
+        spans = []
+        sections = []
+        stack: List[str] = []
+        position = 0
+        
+        for match in SECTION_MARKER.finditer(content):
+            if match.start() > position:
+                spans.append(SectionSpan(position, match.start(), tuple(stack)))
+            if match.group(1) is not None:
+                stack.append(match.group(1))
+                sections.append(match.group(1))
+            elif stack:
+                stack.pop()
+            position = match.end()
+        
+        # The final line counts even when empty, unless a marker occupied it
+        if position < len(content) or not content or content.endswith('\n'):
+            spans.append(SectionSpan(position, len(content), tuple(stack)))
+        
+        return cls(content, spans, sections)
+    
+    def source(self, sections: Optional[Collection[str]] = None) -> str:
+        """Join the spans whose enclosing sections are all included; None includes every section"""
+        kept = [
+            span for span in self.spans
+            if sections is None or all(name in sections for name in span.path)
+        ]
+        text = ''.join(self.content[span.start:span.end] for span in kept)
+        
+        # Kept lines are newline-joined, so no newline follows the last one unless the source ends there
+        if kept and kept[-1].end != len(self.content) and text.endswith('\n'):
+            text = text[:-1]
+        return text
+
+class TemplateMetadata(NamedTuple):
+    content_hash: str
+    ast: nodes.Template
+    variables: FrozenSet[str]
+    conditions: List[str]
+    sections: List[str]
+    section_index: SectionIndex
+    template: Template
+
+def content_hash(content: str) -> str:
+    """Cache key for template content"""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+def strip_section_markers(content: str) -> str:
+    """Drop section marker lines, which are not Jinja syntax, keeping every section"""
+    return SectionIndex.build(content).source()
+
+class TemplateMetadataCache:
+    """Parse-once template metadata, cached by content hash"""
+    
+    def __init__(
+        self,
+        env: Optional[Environment] = None,
+        max_entries: int = 512,
+        max_renderers: int = 1024
+    ):
+        self.env = env or Environment(trim_blocks=True, lstrip_blocks=True)
+        self.max_entries = max_entries
+        self.max_renderers = max_renderers
+        self.entries: OrderedDict = OrderedDict()
+        self.renderers: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, content: str) -> TemplateMetadata:
+        """Metadata for template content, parsing it only the first time it is seen"""
+        key = content_hash(content)
+        metadata = self.entries.get(key)
+        if metadata is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return metadata
+        
+        self.misses += 1
+        metadata = self._analyse(key, content)
+        self.entries[key] = metadata
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return metadata
+    
+    def renderer(self, content: str, sections: Optional[Collection[str]] = None) -> Template:
+        """Compiled template with only the given sections, cached per section combination"""
+        metadata = self.get(content)
+        if sections is None:
+            return metadata.template
+        
+        # Sections the template doesn't define can't change the output
+        selected = frozenset(name for name in sections if name in metadata.sections)
+        if selected.issuperset(metadata.sections):
+            return metadata.template
+        
+        key = (metadata.content_hash, selected)
+        template = self.renderers.get(key)
+        if template is None:
+            template = self.env.from_string(metadata.section_index.source(selected))
+            self.renderers[key] = template
+            if len(self.renderers) > self.max_renderers:
+                self.renderers.popitem(last=False)
+        else:
+            self.renderers.move_to_end(key)
+        return template
+    
+    def warm(self, contents: List[str]) -> None:
+        """Precompute metadata for templates as they are stored"""
+        for content in contents:
+            self.get(content)
+    
+    def compile(self, ast: nodes.Template) -> Template:
+        """Build a template from an already parsed AST without re-lexing the source"""
+        code = self.env.compile(ast)
+        return self.env.template_class.from_code(self.env, code, self.env.make_globals(None), None)
+    
+    def _analyse(self, key: str, content: str) -> TemplateMetadata:
+        """Parse once and derive variables, conditions, sections and the compiled template"""
+        section_index = SectionIndex.build(content)
+        try:
+            ast = self.env.parse(section_index.source())
+        except Exception as e:
+            raise ValueError(f"Invalid template syntax: {str(e)}")
+        
+        return TemplateMetadata(
+            content_hash=key,
+            ast=ast,
+            variables=frozenset(meta.find_undeclared_variables(ast)),
+            conditions=CONDITION.findall(content),
+            sections=section_index.sections,
+            section_index=section_index,
+            template=self.compile(ast)
+        )
+    
+    def stats(self) -> Dict[str, int]:
+        """Cache hit and miss counts"""
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.entries)}
\ No newline at end of file
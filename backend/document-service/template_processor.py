@@ -1,7 +1,33 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, AsyncIterator, Optional
 from pydantic import BaseModel, validator
-import re
-from jinja2 import Environment, meta
+from jinja2 import Environment, Template
+import asyncio
+from .template_metadata import TemplateMetadata, TemplateMetadataCache
+
+# Shared by validators so one parse serves both checks
+_validation_metadata = TemplateMetadataCache(max_entries=128)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+async def stream_render(
+    template: Template,
+    variables: Dict,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> AsyncIterator[str]:
+    """Render with Jinja's generate(), yielding chunks of about chunk_size characters"""
+    parts: List[str] = []
+    size = 0
+    for part in template.generate(**variables):
+        parts.append(part)
+        size += len(part)
+        if size >= chunk_size:
+            yield ''.join(parts)
+            parts.clear()
+            size = 0
+            # Let other requests run between chunks of a long render
+            await asyncio.sleep(0)
+    if parts:
+        yield ''.join(parts)
 
 class TemplateValidator(BaseModel):
     content: str
@@ -12,11 +38,7 @@ class TemplateValidator(BaseModel):
     @validator('content')
     def validate_template_syntax(cls, v):
         """Validate Jinja2 template syntax"""
-        env = Environment()
-        try:
-            env.parse(v)
-        except Exception as e:
-            raise ValueError(f"Invalid template syntax: {str(e)}")
+        _validation_metadata.get(v)
         return v
     
     @validator('variables')
@@ -25,9 +47,7 @@ class TemplateValidator(BaseModel):
         if 'content' not in values:
             return v
             
-        env = Environment()
-        ast = env.parse(values['content'])
-        variables = meta.find_undeclared_variables(ast)
+        variables = _validation_metadata.get(values['content']).variables
         
         if not all(var in variables for var in v):
             raise ValueError("Template references undeclared variables")
@@ -39,6 +59,7 @@ class TemplateProcessor:
             trim_blocks=True,
             lstrip_blocks=True
         )
+        self.metadata_cache = TemplateMetadataCache(self.env)
     
     async def process_template(
         self,
@@ -48,47 +69,43 @@ class TemplateProcessor:
     ) -> str:
         """Process template with variables and optional sections"""
         
+        # Parse once per distinct template; later renders reuse the cached metadata
+        metadata = self.metadata_cache.get(template)
+        
         # Validate template
-        validator = TemplateValidator(
-            content=template,
-            variables=list(variables.keys()),
-            conditions=self._extract_conditions(template),
-            sections=sections or []
-        )
+        self._validate_variables(metadata, variables)
         
-        # Process conditional sections
-        if sections:
-            template = self._process_sections(template, sections)
+        # Process conditional sections from the precompiled section index
+        template_obj = self.metadata_cache.renderer(template, sections or None)
         
         # Render template
-        template_obj = self.env.from_string(template)
         return template_obj.render(**variables)
     
+    async def process_template_stream(
+        self,
+        template: str,
+        variables: Dict,
+        sections: Optional[List[str]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> AsyncIterator[str]:
+        """Render template in chunks instead of building the whole document"""
+        metadata = self.metadata_cache.get(template)
+        self._validate_variables(metadata, variables)
+        
+        template_obj = self.metadata_cache.renderer(template, sections or None)
+        async for chunk in stream_render(template_obj, variables, chunk_size):
+            yield chunk
+    
+    def _validate_variables(self, metadata: TemplateMetadata, variables: Dict) -> None:
+        """Ensure every supplied variable is referenced by the template"""
+        unknown = set(variables) - metadata.variables
+        if unknown:
+            raise ValueError(f"Template references undeclared variables: {sorted(unknown)}")
+    
     def _extract_conditions(self, template: str) -> List[str]:
         """Extract conditional statements from template"""
-        pattern = r'{%\s*if\s+(.*?)\s*%}'
-        return re.findall(pattern, template)
+        return self.metadata_cache.get(template).conditions
     
     def _process_sections(self, template: str, sections: List[str]) -> str:
         """Process template sections based on inclusion list"""
-        lines = template.split('\n')
-        result = []
-        current_section = None
-        include_line = True
-        
-        for line in lines:
-            section_start = re.match(r'{%\s*section\s+([^\s%]+)\s*%}', line)
-            if section_start:
-                current_section = section_start.group(1)
-                include_line = current_section in sections
-                continue
-                
-            if re.match(r'{%\s*endsection\s*%}', line):
-                current_section = None
-                include_line = True
-                continue
-                
-            if include_line:
-                result.append(line)
-        
-        return '\n'.join(result) 
\ No newline at end of file
+        return self.metadata_cache.get(template).section_index.source(sections)
\ No newline at end of file
@@ -0,0 +1,158 @@
+from typing import Dict, List, Any, Optional, Tuple, Union
+from difflib import SequenceMatcher
+import hashlib
+import sys
+import zlib
+
+# Delta operations: copy n lines from the previous version, skip n of them, or insert new lines
+COPY = 0
+SKIP = 1
+INSERT = 2
+
+Delta = List[Tuple[int, Union[int, Tuple[str, ...]]]]
+
+def compute_delta(old: List[str], new: List[str]) -> Delta:
+    """Line delta turning old into new, storing only the inserted lines"""
+    # Trim the common prefix and suffix first; most revisions touch a few clauses
+    prefix = 0
+    limit = min(len(old), len(new))
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[-suffix - 1] == new[-suffix - 1]:
+        suffix += 1
+    
+    delta: Delta = []
+    if prefix:
+        delta.append((COPY, prefix))
+    
+    matcher = SequenceMatcher(None, old[prefix:len(old) - suffix], new[prefix:len(new) - suffix])
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            delta.append((COPY, i2 - i1))
+            continue
+        if i2 > i1:
+            delta.append((SKIP, i2 - i1))
+        if j2 > j1:
+            delta.append((INSERT, tuple(new[prefix + j1:prefix + j2])))
+    
+    if suffix:
+        delta.append((COPY, suffix))
+    return delta
+
+def apply_delta(old: List[str], delta: Delta) -> List[str]:
+    """Rebuild the newer version's lines from the older one"""
+    lines: List[str] = []
+    position = 0
+    for op, value in delta:
+        if op == COPY:
+            lines.extend(old[position:position + value])
+            position += value
+        elif op == SKIP:
+            position += value
+        else:
+            lines.extend(value)
+    return lines
+
+def _split(content: str) -> List[str]:
+    """Lines with their endings, so joining them restores the content exactly"""
+    return content.splitlines(keepends=True)
+
+class VersionStore:
+    """Per-document version history as periodic snapshots plus line deltas"""
+    
+    def __init__(self, snapshot_interval: int = 16, compress: bool = True):
+        self.snapshot_interval = snapshot_interval
+        self.compress = compress
+        self.documents: Dict[str, Dict[str, Any]] = {}
+    
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.documents
+    
+    def add(self, doc_id: str, content: str, metadata: Optional[Dict[str, Any]] = None) -> int:
+        """Record a new version and return its number, starting at 1"""
+        history = self.documents.setdefault(doc_id, {'versions': [], 'latest': None})
+        versions = history['versions']
+        number = len(versions) + 1
+        lines = _split(content)
+        
+        entry = {
+            'metadata': dict(metadata or {}),
+            'size': len(content),
+            'checksum': hashlib.sha256(content.encode('utf-8')).hexdigest()
+        }
+        if (number - 1) % self.snapshot_interval == 0:
+            entry['snapshot'] = self._pack(content)
+        else:
+            entry['delta'] = compute_delta(_split(history['latest']), lines)
+        versions.append(entry)
+        
+        # The newest version is kept whole so reading it never replays deltas
+        history['latest'] = content
+        return number
+    
+    def latest(self, doc_id: str) -> str:
+        """Content of the newest version"""
+        return self._history(doc_id)['latest']
+    
+    def get(self, doc_id: str, version: int) -> str:
+        """Content of any version, replaying at most snapshot_interval - 1 deltas"""
+        history = self._history(doc_id)
+        versions = history['versions']
+        if not 1 <= version <= len(versions):
+            raise KeyError(f"Document {doc_id} has no version {version}")
+        if version == len(versions):
+            return history['latest']
+        
+        base = (version - 1) // self.snapshot_interval * self.snapshot_interval
+        lines = _split(self._unpack(versions[base]['snapshot']))
+        for entry in versions[base + 1:version]:
+            lines = apply_delta(lines, entry['delta'])
+        return ''.join(lines)
+    
+    def metadata(self, doc_id: str, version: Optional[int] = None) -> Dict[str, Any]:
+        """Stored metadata for one version, the newest by default"""
+        versions = self._history(doc_id)['versions']
+        index = (len(versions) if version is None else version) - 1
+        if not 0 <= index < len(versions):
+            raise KeyError(f"Document {doc_id} has no version {version}")
+        return versions[index]['metadata']
+    
+    def list_versions(self, doc_id: str) -> List[Dict[str, Any]]:
+        """Version metadata without reconstructing any content"""
+        return [
+            {
+                **entry['metadata'],
+                'version': number,
+                'size': entry['size'],
+                'checksum': entry['checksum'],
+                'snapshot': 'snapshot' in entry
+            }
+            for number, entry in enumerate(self._history(doc_id)['versions'], start=1)
+        ]
+    
+    def memory_usage(self, doc_id: str) -> int:
+        """Approximate bytes held for a document's content history"""
+        history = self._history(doc_id)
+        total = sys.getsizeof(history['latest'])
+        for entry in history['versions']:
+            if 'snapshot' in entry:
+                total += sys.getsizeof(entry['snapshot'])
+            else:
+                total += sys.getsizeof(entry['delta'])
+                for op, value in entry['delta']:
+                    total += sys.getsizeof((op, value))
+                    if op == INSERT:
+                        total += sys.getsizeof(value) + sum(sys.getsizeof(line) for line in value)
+        return total
+    
+    def _history(self, doc_id: str) -> Dict[str, Any]:
+        if doc_id not in self.documents:
+            raise KeyError(f"Document {doc_id} not found")
+        return self.documents[doc_id]
+    
+    def _pack(self, content: str) -> Union[str, bytes]:
+        return zlib.compress(content.encode('utf-8')) if self.compress else content
+    
+    def _unpack(self, snapshot: Union[str, bytes]) -> str:
+        return zlib.decompress(snapshot).decode('utf-8') if isinstance(snapshot, bytes) else snapshot
\ No newline at end of file
@@ -0,0 +1,54 @@
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+
+# Per-clause analysers run by the contract review agent
+CLAUSE_ANALYZERS = ['risk_factors', 'obligations', 'dependencies', 'temporal_aspects', 'jurisdiction']
+
+# Content enhancement steps run by the NLP processor
+NLP_STEPS = ['entities', 'context', 'structure']
+
+class AnalysisTier(BaseModel):
+    name: str
+    spacy_model: str
+    summary_mode: Optional[str]
+    analyzers: List[str]
+    nlp_steps: List[str]
+    batch_size: int
+
+ANALYSIS_TIERS: Dict[str, AnalysisTier] = {
+    # Sub-second quick scan for intake
+    'fast': AnalysisTier(
+        name='fast',
+        spacy_model='en_core_web_sm',
+        summary_mode=None,
+        analyzers=['risk_factors'],
+        nlp_steps=['entities'],
+        batch_size=32
+    ),
+    'balanced': AnalysisTier(
+        name='balanced',
+        spacy_model='en_core_web_lg',
+        summary_mode='extractive',
+        analyzers=['risk_factors', 'obligations', 'dependencies'],
+        nlp_steps=['entities', 'context'],
+        batch_size=16
+    ),
+    # Exhaustive review before signing
+    'thorough': AnalysisTier(
+        name='thorough',
+        spacy_model='en_core_web_lg',
+        summary_mode='abstractive',
+        analyzers=CLAUSE_ANALYZERS,
+        nlp_steps=NLP_STEPS,
+        batch_size=8
+    )
+}
+
+DEFAULT_TIER = 'thorough'
+
+def get_tier(name: Optional[str] = None) -> AnalysisTier:
+    """Look up an analysis tier by name, defaulting to the full analysis"""
+    try:
+        return ANALYSIS_TIERS[name or DEFAULT_TIER]
+    except KeyError:
+        raise ValueError(f"Unknown analysis tier: {name}")
\ No newline at end of file
@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Enum, UniqueConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy_utils import EncryptedType
 from sqlalchemy.dialects.postgresql import JSONB
 from .base import Base
@@ -18,7 +18,9 @@ class Document(Base):
     id = Column(Integer, primary_key=True)
     version = Column(Integer, nullable=False, default=1)
     title = Column(String(255), nullable=False)
-    content = Column(EncryptedType, nullable=False)  # Encrypted storage
+    # Content is only loaded and decrypted when accessed, never by listings or status queries
+    content = deferred(Column(EncryptedType, nullable=True), group='content')  # Encrypted storage, unless chunked into the blob store
+    content_manifest = deferred(Column(JSONB, nullable=True), group='content')  # Blob store chunk ids and sizes when content is chunked
     status = Column(Enum(DocumentStatus), default=DocumentStatus.DRAFT)
     jurisdiction = Column(String(100), nullable=False)
     metadata = Column(JSONB, nullable=False, default={})
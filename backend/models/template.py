@@ -28,6 +28,11 @@ class Template(Base):
         backref="child_templates"
     )
     
+    # Resolved inheritance chain and merged source, materialised on save
+    resolved_ancestors = Column(JSONB, nullable=False, default=[])
+    resolved_content = Column(String, nullable=True)
+    resolved_checksum = Column(String(40), nullable=True)
+    
     # Variables and placeholders
     variables = Column(JSONB, nullable=False, default=[])
     
@@ -1,12 +1,21 @@
 from fastapi import FastAPI, HTTPException, Security
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
-from typing import List, Dict
+from typing import List, Dict, Optional
+import asyncio
+import httpx
+import logging
+import os
 import uuid
 from datetime import datetime
+from .template_inheritance import TemplateCycleError, materialize
 
 app = FastAPI()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+logger = logging.getLogger(__name__)
+
+DOCUMENT_SERVICE_URL = os.getenv("DOCUMENT_SERVICE_URL", "http://document-service:8000")
+SERVICE_TOKEN = os.getenv("SERVICE_TOKEN", "")
 
 class Template(BaseModel):
     id: str
@@ -18,6 +27,12 @@ class Template(BaseModel):
     version: int
     created_at: datetime
     updated_at: datetime
+    
+    # Inheritance, and the chain and merged source derived from it at save time
+    parent_ids: List[str] = []
+    resolved_ancestors: List[str] = []
+    resolved_content: Optional[str] = None
+    resolved_checksum: Optional[str] = None
 
 class TemplateService:
     def __init__(self):
@@ -32,11 +47,70 @@ class TemplateService:
             updated_at=datetime.now(),
             **template_data
         )
-        self.templates[template_id] = template
+        self._save(template)
         return template
+    
+    async def update_template(self, template_id: str, updates: dict) -> Template:
+        if template_id not in self.templates:
+            raise HTTPException(status_code=404, detail="Template not found")
+        
+        current = self.templates[template_id]
+        template = current.copy(update={
+            **updates,
+            'version': current.version + 1,
+            'updated_at': datetime.now()
+        })
+        affected = self._save(template)
+        
+        # Descendants' merged source changed too, so drop their compiled copies
+        await self._notify_templates_changed(affected)
+        return self.templates[template_id]
+    
+    def _save(self, template: Template) -> List[str]:
+        """Store a template, re-materialising its inheritance chain and its descendants'"""
+        parents = {t.id: t.parent_ids for t in self.templates.values()}
+        parents[template.id] = template.parent_ids
+        contents = {t.id: t.content for t in self.templates.values()}
+        contents[template.id] = template.content
+        
+        missing = [parent for parent in template.parent_ids if parent not in contents]
+        if missing:
+            raise HTTPException(status_code=400, detail=f"Unknown parent templates: {missing}")
+        
+        # Reject cycles before anything is stored
+        try:
+            resolved = materialize(template.id, parents, contents)
+        except TemplateCycleError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        self.templates[template.id] = template
+        for affected_id, derived in resolved.items():
+            self.templates[affected_id] = self.templates[affected_id].copy(update=derived)
+        return list(resolved)
+    
+    async def _notify_templates_changed(self, template_ids: List[str]) -> None:
+        """Tell document-service to drop compiled copies of the templates, all at once"""
+        # Sent concurrently, so a deep inheritance tree costs one timeout rather than one per descendant
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            await asyncio.gather(*[self._notify_template_changed(client, template_id) for template_id in template_ids])
+    
+    async def _notify_template_changed(self, client: httpx.AsyncClient, template_id: str) -> None:
+        """Tell document-service to drop compiled copies of the template"""
+        try:
+            response = await client.post(
+                f"{DOCUMENT_SERVICE_URL}/templates/{template_id}/invalidate",
+                headers={"Authorization": f"Bearer {SERVICE_TOKEN}"}
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning("Template cache invalidation failed for %s: %s", template_id, e)
 
 template_service = TemplateService()
 
 @app.post("/templates/", response_model=Template)
 async def create_template(template_data: dict, token: str = Security(oauth2_scheme)):
-    return await template_service.create_template(template_data) 
\ No newline at end of file
+    return await template_service.create_template(template_data) 
+
+@app.put("/templates/{template_id}", response_model=Template)
+async def update_template(template_id: str, updates: dict, token: str = Security(oauth2_scheme)):
+    return await template_service.update_template(template_id, updates)
\ No newline at end of file
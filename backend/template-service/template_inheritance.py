@@ -0,0 +1,81 @@
+from typing import Dict, List, Mapping, Set
+import hashlib
+
+class TemplateCycleError(ValueError):
+    """Raised when a template would inherit from itself"""
+    
+    def __init__(self, cycle: List[str]):
+        self.cycle = cycle
+        super().__init__("Template inheritance cycle: " + " -> ".join(cycle))
+
+def resolve_chain(template_id: str, parents: Mapping[str, List[str]]) -> List[str]:
+    """Ancestors in topological order, most distant first, ending with the template itself"""
+    order: List[str] = []
+    done: Set[str] = set()
+    path: List[str] = []
+    on_path: Set[str] = set()
+    
+    # Iterative depth-first post-order so deep hierarchies don't hit the recursion limit
+    stack = [(template_id, iter(parents.get(template_id, [])))]
+    path.append(template_id)
+    on_path.add(template_id)
+    while stack:
+        node, remaining = stack[-1]
+        parent = next(remaining, None)
+        if parent is None:
+            stack.pop()
+            path.pop()
+            on_path.discard(node)
+            done.add(node)
+            order.append(node)
+        elif parent in on_path:
+            raise TemplateCycleError(path[path.index(parent):] + [parent])
+        elif parent not in done:
+            stack.append((parent, iter(parents.get(parent, []))))
+            path.append(parent)
+            on_path.add(parent)
+    
+    return order
+
+def descendants(template_id: str, parents: Mapping[str, List[str]]) -> List[str]:
+    """Every template that inherits, directly or not, from template_id"""
+    children: Dict[str, List[str]] = {}
+    for child, child_parents in parents.items():
+        for parent in child_parents:
+            children.setdefault(parent, []).append(child)
+    
+    found: List[str] = []
+    seen = {template_id}
+    queue = [template_id]
+    while queue:
+        for child in children.get(queue.pop(0), []):
+            if child not in seen:
+                seen.add(child)
+                found.append(child)
+                queue.append(child)
+    return found
+
+def merge_chain(chain: List[str], contents: Mapping[str, str]) -> str:
+    """Merged source: ancestor content first, the template's own content last"""
+    return '\n'.join(contents[template_id] for template_id in chain)
+
+def checksum(content: str) -> str:
+    """Fingerprint of merged source, used to version compiled templates"""
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+def materialize(
+    template_id: str,
+    parents: Mapping[str, List[str]],
+    contents: Mapping[str, str]
+) -> Dict[str, Dict]:
+    """Resolve the chain and merged source for a saved template and all its descendants"""
+    resolved = {}
+    for affected in [template_id] + descendants(template_id, parents):
+        chain = resolve_chain(affected, parents)
+        content = merge_chain(chain, contents)
+        resolved[affected] = {
+            'resolved_ancestors': chain[:-1],
+            'resolved_content': content,
+            'resolved_checksum': checksum(content)
+        }
+    return resolved
\ No newline at end of file
@@ -0,0 +1,57 @@
+import pytest
+import os
+import random
+from ai_orchestrator.utils.batching import (
+    BucketedBatcher,
+    bucketed_batches,
+    estimate_flops,
+    padded_batches
+)
+
+class TestBatchingPerformance:
+    @pytest.fixture
+    def clause_lengths(self):
+        # Token lengths exported from production, one per line, when available
+        lengths_file = os.getenv("CLAUSE_LENGTHS_FILE")
+        if lengths_file:
+            with open(lengths_file) as f:
+                return [int(line) for line in f if line.strip()]
+        
+        # Otherwise a log-normal fit of the observed 10 to 2,000 token range
+        rng = random.Random(42)
+        return [
+            int(min(2000, max(10, rng.lognormvariate(4.6, 0.9))))
+            for _ in range(20000)
+        ]
+    
+    @pytest.mark.parametrize("batch_size", [8, 16, 32])
+    def test_bucketed_batching_flops_saved(self, clause_lengths, batch_size):
+        # Arrange
+        batcher = BucketedBatcher(max_length=512, batch_size=batch_size)
+        
+        # Act
+        naive = estimate_flops(padded_batches(clause_lengths, batch_size, 512))
+        bucketed = estimate_flops(bucketed_batches(clause_lengths, batcher))
+        useful = estimate_flops([(1, min(length, 512)) for length in clause_lengths])
+        saved = 1 - bucketed / naive
+        
+        # Log performance metrics
+        print(f"batch_size={batch_size}: naive {naive / 1e12:.1f} TFLOPs, "
+              f"bucketed {bucketed / 1e12:.1f} TFLOPs, unpadded {useful / 1e12:.1f} TFLOPs")
+        print(f"FLOPs saved by bucketing: {saved:.1%}")
+        
+        # Bucketing should remove most of the padding overhead
+        assert bucketed <= naive
+        assert saved >= 0.3, f"Bucketing saved only {saved:.1%} of FLOPs"
+        assert bucketed / useful <= 1.5
+    
+    def test_batches_cover_every_input_once(self, clause_lengths):
+        # Arrange
+        batcher = BucketedBatcher(max_length=512, batch_size=16)
+        
+        # Act
+        batches = bucketed_batches(clause_lengths, batcher)
+        
+        # Assert
+        assert sum(size for size, _ in batches) == len(clause_lengths)
+        assert all(size <= 16 for size, _ in batches)
\ No newline at end of file
@@ -0,0 +1,75 @@
+import pytest
+import asyncio
+import os
+import time
+from document_service.format_converter import FormatConverter
+
+RUNS = int(os.getenv("CONVERSION_BENCH_RUNS", "5"))
+PARAGRAPHS = int(os.getenv("CONVERSION_BENCH_PARAGRAPHS", "2000"))
+
+PAIRS = [
+    ("text", "docx"),
+    ("markdown", "docx"),
+    ("html", "docx"),
+    ("docx", "text"),
+    ("docx", "markdown"),
+    ("docx", "html"),
+    ("html", "text")
+]
+
+class TestConversionGraphPerformance:
+    @pytest.fixture(scope="class")
+    def sources(self):
+        clauses = [
+            f"{i}. The Supplier shall deliver the Services described in Schedule {i} by the Delivery Date."
+            for i in range(PARAGRAPHS)
+        ]
+        converter = FormatConverter()
+        text = "\n".join(clauses)
+        return {
+            "text": text,
+            "markdown": "# Agreement\n\n" + "\n\n".join(clauses),
+            "html": "".join(f"<p>{clause}</p>" for clause in clauses),
+            "docx": asyncio.run(converter.convert(text, "text", "docx"))
+        }
+    
+    def _time(self, path, content) -> float:
+        """Median seconds for one conversion along a forced path"""
+        async def along_path():
+            current = content
+            for edge in path:
+                current = await edge.converter(current)
+            return current
+        
+        timings = []
+        for _ in range(RUNS):
+            started = time.perf_counter()
+            asyncio.run(along_path())
+            timings.append(time.perf_counter() - started)
+        return sorted(timings)[len(timings) // 2]
+    
+    @pytest.mark.parametrize("source,target", PAIRS)
+    def test_path_timings(self, sources, source, target):
+        # Arrange
+        converter = FormatConverter()
+        content = sources[source]
+        chosen = converter.graph.path(source, target, len(content), content)
+        
+        # Through HTML, as every conversion went before the graph
+        via_html = None
+        edges = converter.graph.edges
+        if "html" in edges.get(source, {}) and target in edges["html"] and source != "html":
+            via_html = [edges[source]["html"], edges["html"][target]]
+        
+        # Act
+        chosen_seconds = self._time(chosen, content)
+        # Text passes through as HTML, where its line breaks collapse, so time the same paragraphs as markup
+        via_content = sources["html"] if source == "text" else content
+        html_seconds = self._time(via_html, via_content) if via_html else None
+        
+        # Assert
+        route = " -> ".join([source] + [edge.target for edge in chosen])
+        print(f"{source} -> {target}: {route} {chosen_seconds * 1000:.1f} ms"
+              + (f", via html {html_seconds * 1000:.1f} ms" if html_seconds is not None else ""))
+        if html_seconds is not None and chosen != via_html:
+            assert chosen_seconds < html_seconds
\ No newline at end of file
@@ -0,0 +1,79 @@
+import pytest
+import multiprocessing
+import os
+import statistics
+import time
+
+torch = pytest.importorskip("torch")
+
+from ai_orchestrator.utils.inference_scheduler import InferenceScheduler, physical_cores
+
+REQUESTS_PER_WORKER = int(os.getenv("LAYOUT_BENCH_REQUESTS", "20"))
+
+def _inference_worker(layout, worker_index, pin, start, results):
+    """Run encoder forward passes the size of a clause batch under one layout"""
+    workers, threads = layout
+    scheduler = InferenceScheduler(workers=workers, threads_per_worker=threads, pin_workers=pin)
+    scheduler.configure_worker(worker_index)
+    
+    torch.manual_seed(0)
+    model = torch.nn.TransformerEncoderLayer(d_model=768, nhead=12, batch_first=True).eval()
+    batch = torch.randn(8, 128, 768)
+    
+    latencies = []
+    start.wait()
+    with torch.inference_mode():
+        for _ in range(REQUESTS_PER_WORKER):
+            request_start = time.time()
+            model(batch)
+            latencies.append(time.time() - request_start)
+    results.put(latencies)
+
+def _sweep_layouts(cores: int):
+    """Every workers x threads split that fills the physical cores"""
+    return [(workers, cores // workers) for workers in range(1, cores + 1) if cores % workers == 0]
+
+class TestCPULayoutPerformance:
+    @pytest.mark.parametrize("pin", [False, True])
+    def test_layout_sweep(self, pin):
+        # Arrange
+        cores = len(physical_cores())
+        ctx = multiprocessing.get_context("spawn")
+        report = {}
+        
+        for layout in _sweep_layouts(cores):
+            workers, _ = layout
+            start = ctx.Barrier(workers + 1)
+            results = ctx.Queue()
+            processes = [
+                ctx.Process(target=_inference_worker, args=(layout, index, pin, start, results))
+                for index in range(workers)
+            ]
+            for process in processes:
+                process.start()
+            
+            # Act
+            start.wait()
+            wall_start = time.time()
+            latencies = [latency for _ in processes for latency in results.get()]
+            wall_time = time.time() - wall_start
+            for process in processes:
+                process.join()
+            
+            latencies.sort()
+            report[layout] = {
+                "throughput": len(latencies) / wall_time,
+                "p50": statistics.median(latencies),
+                "p95": latencies[int(len(latencies) * 0.95) - 1]
+            }
+        
+        # Log performance metrics
+        for (workers, threads), metrics in report.items():
+            print(f"{workers} workers x {threads} threads{' (pinned)' if pin else ''}: "
+                  f"{metrics['throughput']:.1f} batches/sec, "
+                  f"p50 {metrics['p50'] * 1000:.0f} ms, p95 {metrics['p95'] * 1000:.0f} ms")
+        best = max(report, key=lambda layout: report[layout]["throughput"])
+        print(f"Best layout for {cores} cores: {best[0]} workers x {best[1]} threads")
+        
+        # Assert
+        assert all(metrics["throughput"] > 0 for metrics in report.values())
\ No newline at end of file
@@ -0,0 +1,66 @@
+import pytest
+import difflib
+import json
+import os
+import random
+import time
+from document_service.diff_engine import apply_changes, diff_documents
+
+PAGES = int(os.getenv("DIFF_BENCH_PAGES", "1000"))
+PARAGRAPHS_PER_PAGE = 8
+
+def _document(rng: random.Random) -> list:
+    words = ["Supplier", "Customer", "shall", "deliver", "Services", "Schedule", "fees", "liability",
+             "notice", "terminate", "the", "under", "this", "Agreement", "within", "days"]
+    return [
+        f"{number}. " + " ".join(rng.choice(words) for _ in range(rng.randint(20, 60))) + "."
+        for number in range(PAGES * PARAGRAPHS_PER_PAGE)
+    ]
+
+def _revise(rng: random.Random, paragraphs: list, pattern: str) -> list:
+    revised = list(paragraphs)
+    if pattern == "light":
+        edits = 20
+    elif pattern == "heavy":
+        edits = len(revised) // 20
+    else:
+        # Every paragraph reworded
+        return [paragraph.replace("shall", "must").replace("the", "The") + " Amended." for paragraph in revised]
+    
+    for _ in range(edits):
+        index = rng.randrange(len(revised))
+        choice = rng.random()
+        if choice < 0.6:
+            revised[index] = revised[index].replace("shall", "must", 1) + " As agreed."
+        elif choice < 0.8:
+            revised.insert(index, f"New clause {rng.random():.8f} agreed by the parties.")
+        else:
+            del revised[index]
+    return revised
+
+class TestDiffEnginePerformance:
+    @pytest.fixture(scope="class")
+    def document(self):
+        return _document(random.Random(3))
+    
+    @pytest.mark.parametrize("pattern", ["light", "heavy", "rewrite"])
+    def test_thousand_page_diff(self, document, pattern):
+        # Arrange
+        revised = _revise(random.Random(5), document, pattern)
+        old_text, new_text = "\n".join(document), "\n".join(revised)
+        
+        # Act
+        started = time.perf_counter()
+        change_set = diff_documents(old_text, new_text)
+        engine_seconds = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        list(difflib.SequenceMatcher(None, document, revised).get_opcodes())
+        difflib_seconds = time.perf_counter() - started
+        
+        # Assert
+        size = len(json.dumps(change_set))
+        print(f"{pattern}: {PAGES} pages, engine {engine_seconds * 1000:.0f} ms, "
+              f"difflib paragraphs only {difflib_seconds * 1000:.0f} ms, "
+              f"change set {size / 1024:.0f} KB, {change_set['stats']}")
+        assert apply_changes(old_text, change_set) == new_text
\ No newline at end of file
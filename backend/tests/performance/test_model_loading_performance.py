@@ -0,0 +1,83 @@
+import pytest
+import multiprocessing
+import os
+import statistics
+import time
+
+pytest.importorskip("torch")
+pytest.importorskip("safetensors")
+
+from ai_orchestrator.utils.model_store import ModelStore, MODEL_SET
+
+NUM_WORKERS = int(os.getenv("MODEL_BENCH_WORKERS", "4"))
+
+def _memory_stats() -> dict:
+    """Resident memory breakdown of the current process in MB"""
+    stats = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                stats[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return {
+        "rss": stats.get("Rss", 0.0),
+        "pss": stats.get("Pss", 0.0),
+        "private": stats.get("Private_Clean", 0.0) + stats.get("Private_Dirty", 0.0),
+        "shared": stats.get("Shared_Clean", 0.0) + stats.get("Shared_Dirty", 0.0)
+    }
+
+def _load_worker(store_dir, ready, results):
+    """Load the agent model set the way a review worker does"""
+    store = ModelStore(store_dir)
+    start_time = time.time()
+    models = [
+        store.load_pipeline(task, name) if task != "sequence-classification" else store.load_model(name, task)
+        for name, task in MODEL_SET.items()
+    ]
+    elapsed = time.time() - start_time
+    
+    # Wait until every worker has loaded so shared pages are counted together
+    ready.wait()
+    results.put({"load_time": elapsed, **_memory_stats()})
+    del models
+
+class TestModelLoadingPerformance:
+    @pytest.fixture
+    def store_dir(self):
+        store_dir = os.getenv("MODEL_STORE_DIR")
+        if not store_dir or not all(ModelStore(store_dir).is_converted(name) for name in MODEL_SET):
+            pytest.skip("Set MODEL_STORE_DIR to a converted model set (python -m ai_orchestrator.utils.model_store)")
+        return store_dir
+    
+    def _run_workers(self, store_dir):
+        context = multiprocessing.get_context("spawn")
+        ready = context.Barrier(NUM_WORKERS + 1)
+        results = context.Queue()
+        workers = [
+            context.Process(target=_load_worker, args=(store_dir, ready, results))
+            for _ in range(NUM_WORKERS)
+        ]
+        for worker in workers:
+            worker.start()
+        ready.wait()
+        stats = [results.get(timeout=600) for _ in workers]
+        for worker in workers:
+            worker.join()
+        return stats
+    
+    def test_mapped_weights_reduce_per_worker_memory(self, store_dir):
+        # Act
+        private_copies = self._run_workers("")
+        mapped = self._run_workers(store_dir)
+        
+        # Log performance metrics
+        for label, stats in (("private copies", private_copies), ("memory-mapped", mapped)):
+            print(f"{label}: cold start {statistics.mean(s['load_time'] for s in stats):.1f}s, "
+                  f"RSS {statistics.mean(s['rss'] for s in stats):.0f} MB, "
+                  f"PSS {statistics.mean(s['pss'] for s in stats):.0f} MB, "
+                  f"private {statistics.mean(s['private'] for s in stats):.0f} MB per worker "
+                  f"({NUM_WORKERS} workers)")
+        
+        # Mapped weights are shared, so each worker's private memory should drop
+        assert statistics.mean(s["private"] for s in mapped) < statistics.mean(s["private"] for s in private_copies)
+        assert statistics.mean(s["pss"] for s in mapped) < statistics.mean(s["pss"] for s in private_copies)
\ No newline at end of file
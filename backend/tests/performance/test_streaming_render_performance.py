@@ -0,0 +1,59 @@
+import pytest
+import asyncio
+import multiprocessing
+import os
+import resource
+from jinja2 import Environment
+from document_service.format_converter import FormatConverter
+from document_service.template_processor import stream_render
+
+DOCUMENT_BYTES = int(os.getenv("STREAM_BENCH_BYTES", str(100 * 1024 * 1024)))
+RSS_CEILING_MB = int(os.getenv("STREAM_BENCH_RSS_MB", "64"))
+
+TEMPLATE = (
+    "{% for row in rows %}"
+    "{{ row.number }}. The {{ row.party }} shall deliver the Services described in Schedule {{ row.number }} "
+    "by the Delivery Date, and liability under this clause is limited to the fees paid.\n"
+    "{% endfor %}"
+)
+
+def _rows(total_bytes: int):
+    # Rows are produced lazily so the variables never hold the document
+    sample = len(Environment().from_string(TEMPLATE).render(rows=[{"number": 1, "party": "Supplier"}]))
+    for number in range(total_bytes // sample + 1):
+        yield {"number": number, "party": "Supplier"}
+
+async def _render(target_format: str, total_bytes: int) -> int:
+    template = Environment().from_string(TEMPLATE)
+    chunks = stream_render(template, {"rows": _rows(total_bytes)})
+    written = 0
+    async for data in FormatConverter().convert_stream(chunks, "text", target_format):
+        written += len(data)
+    return written
+
+def _measure(target_format: str, total_bytes: int, results) -> None:
+    """Render in a fresh process so peak RSS reflects only this render"""
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    written = asyncio.run(_render(target_format, total_bytes))
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put({"written": written, "growth_mb": (peak - baseline) / 1024})
+
+class TestStreamingRenderPerformance:
+    @pytest.mark.parametrize("target_format", ["text", "docx"])
+    def test_rss_bounded_by_chunk_size(self, target_format):
+        # Arrange
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        
+        # Act
+        process = context.Process(target=_measure, args=(target_format, DOCUMENT_BYTES, results))
+        process.start()
+        result = results.get(timeout=600)
+        process.join()
+        
+        # Assert
+        print(f"{target_format}: {result['written'] / 1024 / 1024:.1f} MB written, "
+              f"peak RSS growth {result['growth_mb']:.1f} MB")
+        assert process.exitcode == 0
+        assert result["written"] > 0
+        assert result["growth_mb"] < RSS_CEILING_MB
\ No newline at end of file
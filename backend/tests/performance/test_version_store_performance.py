@@ -0,0 +1,83 @@
+import pytest
+import os
+import random
+import time
+from document_service.version_store import VersionStore
+
+VERSIONS = int(os.getenv("VERSION_BENCH_VERSIONS", "300"))
+CONTRACT_BYTES = int(os.getenv("VERSION_BENCH_BYTES", str(2 * 1024 * 1024)))
+
+def _contract(rng: random.Random) -> list:
+    # Numbered clauses separated by blank lines, about CONTRACT_BYTES in total
+    lines = []
+    size = 0
+    number = 0
+    while size < CONTRACT_BYTES:
+        number += 1
+        clause = (
+            f"{number}. The Supplier shall deliver the Services described in Schedule {rng.randint(1, 40)} "
+            f"within {rng.randint(5, 90)} days, and liability under this clause is limited to "
+            f"{rng.randint(1, 24)} months of fees.\n"
+        )
+        lines.extend([clause, "\n"])
+        size += len(clause) + 1
+    return lines
+
+def _negotiation(rng: random.Random, lines: list, pattern: str) -> list:
+    """One round of edits in the style of the given pattern"""
+    lines = list(lines)
+    if pattern == "clause_edits":
+        # A handful of clauses reworded per round
+        for _ in range(rng.randint(1, 5)):
+            index = rng.randrange(0, len(lines), 2)
+            lines[index] = lines[index].replace("shall", "must", 1).rstrip("\n") + " (as amended)\n"
+    elif pattern == "insertions":
+        # Whole clauses added or struck
+        for _ in range(rng.randint(1, 3)):
+            index = rng.randrange(0, len(lines), 2)
+            if rng.random() < 0.5:
+                lines[index:index] = [f"New clause {rng.random():.6f} agreed by the parties.\n", "\n"]
+            else:
+                del lines[index:index + 2]
+    else:
+        # Occasional sweeping redrafts touching a fifth of the document
+        if rng.random() < 0.05:
+            for index in range(0, len(lines), 10):
+                lines[index] = lines[index].upper()
+        else:
+            index = rng.randrange(0, len(lines), 2)
+            lines[index] = lines[index].rstrip("\n") + " Subject to clause 1.\n"
+    return lines
+
+class TestVersionStorePerformance:
+    @pytest.mark.parametrize("pattern", ["clause_edits", "insertions", "redrafts"])
+    def test_memory_per_document(self, pattern):
+        # Arrange
+        rng = random.Random(7)
+        store = VersionStore()
+        lines = _contract(rng)
+        contents = []
+        
+        # Act
+        started = time.perf_counter()
+        for _ in range(VERSIONS):
+            content = "".join(lines)
+            contents.append(content)
+            store.add("contract", content, {"title": "Master Services Agreement"})
+            lines = _negotiation(rng, lines, pattern)
+        add_seconds = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        sampled = rng.sample(range(1, VERSIONS + 1), 20)
+        for version in sampled:
+            assert store.get("contract", version) == contents[version - 1]
+        get_ms = (time.perf_counter() - started) * 1000 / len(sampled)
+        
+        # Assert
+        full_copies = sum(len(content) for content in contents)
+        stored = store.memory_usage("contract")
+        print(f"{pattern}: {VERSIONS} versions, full copies {full_copies / 1024 / 1024:.0f} MB, "
+              f"store {stored / 1024 / 1024:.1f} MB ({full_copies / stored:.0f}x), "
+              f"add {add_seconds * 1000 / VERSIONS:.1f} ms/version, get {get_ms:.1f} ms/version")
+        assert store.latest("contract") == contents[-1]
+        assert stored * 10 < full_copies
\ No newline at end of file
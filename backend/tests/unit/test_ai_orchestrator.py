@@ -1,4 +1,5 @@
 import pytest
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, AsyncMock
 from ai_orchestrator.orchestrator import AIOrchestrator
 from ai_orchestrator.agents import (
@@ -11,6 +12,7 @@ from ai_orchestrator.agents import (
 from ai_orchestrator.models.ai_config import AITask
 from ai_orchestrator.utils.task_queue import TaskQueue
 from ai_orchestrator.utils.result_aggregator import ResultAggregator
+from ai_orchestrator.utils.document_router import RoutingDecision
 
 class TestAIOrchestrator:
     @pytest.fixture
@@ -78,6 +80,7 @@ class TestAIOrchestrator:
             "high_risk_areas": ["liability", "termination"]
         }
         orchestrator.result_aggregator.aggregate.return_value = final_result
+        merge = orchestrator.result_aggregator.create_merge.return_value
         
         # Act
         result = await orchestrator.process_task(task_data)
@@ -87,8 +90,8 @@ class TestAIOrchestrator:
         orchestrator._create_task.assert_called_once_with(task_data)
         orchestrator._determine_agents.assert_called_once_with(task)
         orchestrator._create_subtasks.assert_called_once_with(task, required_agents)
-        orchestrator._execute_subtasks.assert_called_once_with(subtasks)
-        orchestrator.result_aggregator.aggregate.assert_called_once_with(subtask_results)
+        orchestrator._execute_subtasks.assert_called_once_with(subtasks, merge)
+        orchestrator.result_aggregator.aggregate.assert_called_once_with(subtask_results, merge)
         orchestrator._update_task_status.assert_called_once_with(task, final_result)
     
     @pytest.mark.asyncio
@@ -123,6 +126,30 @@ class TestAIOrchestrator:
             # Assert
             assert set(result) == set(case["expected_agents"])
     
+    @pytest.mark.asyncio
+    async def test_determine_agents_keeps_thorough_tier_by_default(self, orchestrator):
+        # Arrange
+        orchestrator.router = Mock()
+        orchestrator.router.route.return_value = RoutingDecision(
+            task_type="contract_analysis",
+            agents=["contract_review"],
+            prediction=None,
+            reason="short document"
+        )
+        cases = [(None, "thorough"), ("fast", "fast"), ("exhaustive", "thorough")]
+        
+        for requested, expected in cases:
+            task = SimpleNamespace(id="task5", task_type="contract_analysis", input_data={
+                "document": "Short NDA", "analysis_tier": requested
+            })
+            
+            # Act
+            agents = await orchestrator._determine_agents(task)
+            
+            # Assert: a short document does not lower the tier
+            assert agents == ["contract_review"]
+            assert task.input_data["analysis_tier"] == expected
+    
     @pytest.mark.asyncio
     async def test_execute_subtasks(self, orchestrator):
         # Arrange
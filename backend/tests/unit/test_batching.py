@@ -0,0 +1,97 @@
+import pytest
+import re
+from ai_orchestrator.utils.batching import BucketedBatcher
+
+class WhitespaceTokenizer:
+    """One token per word, with a [CLS]/[SEP] pair added by the model"""
+    model_max_length = 512
+    
+    def __init__(self, offsets: bool = True):
+        self.offsets = offsets
+    
+    def __call__(self, texts, add_special_tokens=False, truncation=False, return_offsets_mapping=False):
+        if return_offsets_mapping and not self.offsets:
+            raise NotImplementedError
+        words = [list(re.finditer(r'\S+', text)) for text in texts]
+        encoding = {'input_ids': [[len(match.group()) for match in matches] for matches in words]}
+        if return_offsets_mapping:
+            encoding['offset_mapping'] = [[match.span() for match in matches] for matches in words]
+        return encoding
+    
+    def num_special_tokens_to_add(self, pair=False):
+        return 2
+    
+    def decode(self, token_ids, skip_special_tokens=True):
+        return ' '.join('x' * token_id for token_id in token_ids)
+
+class RecordingPipe:
+    """Echoes each input and records the batches it was called with"""
+    
+    def __init__(self, tokenizer):
+        self.tokenizer = tokenizer
+        self.batches = []
+    
+    def __call__(self, texts, batch_size, truncation, **kwargs):
+        self.batches.append(list(texts))
+        return [{'text': text} for text in texts]
+
+class TestBucketedBatcher:
+    @pytest.fixture
+    def pipe(self):
+        return RecordingPipe(WhitespaceTokenizer())
+    
+    def test_results_follow_input_order(self, pipe):
+        # Arrange
+        batcher = BucketedBatcher(max_length=64, batch_size=2, bucket_boundaries=(8, 16, 32))
+        texts = [' '.join(['word'] * length) for length in (30, 2, 12, 3, 25, 1)]
+        
+        # Act
+        results = batcher.run(pipe, texts)
+        
+        # Assert
+        assert [result['text'] for result in results] == texts
+        # Short inputs are batched together rather than with the long ones
+        assert all(len(batch) <= 2 for batch in pipe.batches)
+        assert {len(text.split()) for text in pipe.batches[0]} == {1, 2}
+    
+    def test_truncation_keeps_source_text(self, pipe):
+        # Arrange
+        batcher = BucketedBatcher(max_length=8)
+        text = "The Supplier  shall INDEMNIFY the\tCustomer against all losses arising hereunder"
+        
+        # Act
+        batcher.run(pipe, [text])
+        
+        # Assert: six words fit beside the two special tokens, with original case and spacing
+        assert pipe.batches == [["The Supplier  shall INDEMNIFY the\tCustomer"]]
+    
+    def test_chunking_with_stride_and_combine(self, pipe):
+        # Arrange
+        batcher = BucketedBatcher(max_length=6, chunk_stride=1)
+        text = "a b c d e f g h i j"
+        
+        # Act
+        results = batcher.run(
+            pipe, [text, "short"], overflow='chunk',
+            combine=lambda chunks: [chunk['text'] for chunk in chunks]
+        )
+        
+        # Assert: windows of four words overlapping by one
+        assert results[0] == ["a b c d", "d e f g", "g h i j"]
+        assert results[1] == ["short"]
+    
+    def test_falls_back_to_decode_without_offsets(self):
+        # Arrange
+        pipe = RecordingPipe(WhitespaceTokenizer(offsets=False))
+        batcher = BucketedBatcher(max_length=4)
+        
+        # Act
+        batcher.run(pipe, ["aa bbb c dddd"])
+        
+        # Assert
+        assert pipe.batches == [["xx xxx"]]
+    
+    def test_empty_input(self, pipe):
+        # Act / Assert
+        assert BucketedBatcher().run(pipe, []) == []
+        assert pipe.batches == []
\ No newline at end of file
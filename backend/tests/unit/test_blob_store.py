@@ -0,0 +1,215 @@
+import pytest
+import io
+import random
+from docx import Document
+from document_service import blob_store
+from document_service.blob_store import (
+    BlobStore,
+    BlobStoreConfigError,
+    LocalFileSystemBackend,
+    canonical_form,
+    chunk_boundaries,
+    dedup_report,
+    get_blob_store,
+    main
+)
+
+def make_contract(seed: int, size: int = 200_000) -> bytes:
+    """Pseudo-random clause text; the same seed gives the same contract"""
+    rng = random.Random(seed)
+    words = ['party', 'shall', 'agreement', 'indemnify', 'term', 'notice', 'liability', 'supplier', 'customer', 'breach']
+    text = []
+    length = 0
+    while length < size:
+        word = rng.choice(words) + str(rng.randint(0, 999))
+        text.append(word)
+        length += len(word) + 1
+    return ' '.join(text).encode('utf-8')[:size]
+
+class TestChunking:
+    def test_boundaries_cover_content_within_limits(self):
+        # Arrange
+        content = make_contract(1)
+        
+        # Act
+        boundaries = list(chunk_boundaries(content, 1024, 4096, 16384))
+        
+        # Assert
+        assert boundaries[0][0] == 0
+        assert boundaries[-1][1] == len(content)
+        assert all(end == start for (_, end), (start, _) in zip(boundaries, boundaries[1:]))
+        assert all(1024 < end - start <= 16384 for start, end in boundaries[:-1])
+    
+    def test_insertion_only_moves_nearby_boundaries(self):
+        # Arrange
+        content = make_contract(2)
+        edited = content[:100_000] + b'The Supplier shall also maintain insurance. ' + content[100_000:]
+        
+        # Act
+        before = {content[start:end] for start, end in chunk_boundaries(content)}
+        after = {edited[start:end] for start, end in chunk_boundaries(edited)}
+        
+        # Assert
+        assert len(after - before) <= 3
+
+class TestBlobStore:
+    @pytest.fixture
+    def store(self, tmp_path):
+        return BlobStore(LocalFileSystemBackend(str(tmp_path / "blobs")))
+    
+    def test_round_trip(self, store):
+        # Arrange
+        content = make_contract(3)
+        
+        # Act
+        manifest = store.put(content)
+        
+        # Assert
+        assert store.get(manifest) == content
+        assert sum(size for _, size in manifest['chunks']) == len(content)
+    
+    def test_near_identical_documents_share_chunks(self, store):
+        # Arrange
+        original = make_contract(4)
+        revised = original.replace(b'notice', b'written notice', 1)
+        
+        # Act
+        store.put(original)
+        before = store.backend.usage()['bytes']
+        store.put(revised)
+        after = store.backend.usage()['bytes']
+        
+        # Assert
+        assert after - before < 20_000
+    
+    def test_collect_keeps_shared_chunks(self, store):
+        # Arrange
+        original = make_contract(5)
+        revised = original[:150_000] + b'Governing law is New York. ' + original[150_000:]
+        first = store.put(original)
+        second = store.put(revised)
+        
+        # Act
+        store.release(first)
+        removed = store.collect()
+        
+        # Assert
+        assert 0 < removed < len(first['chunks'])
+        assert store.get(second) == revised
+        
+        # Releasing the last reference frees everything
+        store.release(second)
+        store.collect()
+        assert store.backend.usage() == {'chunks': 0, 'bytes': 0}
+    
+    def test_read_range_spans_chunks(self, store):
+        # Arrange
+        content = make_contract(9)
+        manifest = store.put(content)
+        
+        # Act
+        preview = store.read_range(manifest, 0, 500)
+        middle = store.read_range(manifest, 3000, 70_000)
+        tail = store.read_range(manifest, len(content) - 10, len(content) + 10)
+        
+        # Assert
+        assert preview == content[:500]
+        assert middle == content[3000:70_000]
+        assert tail == content[-10:]
+    
+    def test_corrupt_chunk_is_detected(self, store):
+        # Arrange
+        manifest = store.put(make_contract(6))
+        chunk_id = manifest['chunks'][0][0]
+        store.backend.write(chunk_id, b'tampered')
+        
+        # Act / Assert
+        with pytest.raises(ValueError):
+            store.get(manifest)
+    
+    def test_encrypted_chunks_still_deduplicate(self, tmp_path):
+        # Arrange
+        pytest.importorskip("cryptography")
+        store = BlobStore(LocalFileSystemBackend(str(tmp_path / "blobs")), key=b"master-key")
+        content = make_contract(7)
+        
+        # Act
+        first = store.put(content)
+        second = store.put(content)
+        
+        # Assert
+        assert first['chunks'] == second['chunks']
+        assert store.get(second) == content
+        assert store.backend.read(first['chunks'][0][0]) != content[:first['chunks'][0][1]]
+
+def make_docx(text: bytes) -> bytes:
+    """DOCX with one paragraph per 200 bytes of text"""
+    document = Document()
+    for start in range(0, len(text), 200):
+        document.add_paragraph(text[start:start + 200].decode('utf-8'))
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+class TestCanonicalForm:
+    def test_docx_parts_are_stored_uncompressed(self):
+        # Arrange
+        content = make_docx(make_contract(10, 50_000))
+        
+        # Act
+        canonical = canonical_form(content)
+        
+        # Assert: still a DOCX with the same text, and rewriting is idempotent
+        original = [p.text for p in Document(io.BytesIO(content)).paragraphs]
+        assert [p.text for p in Document(io.BytesIO(canonical)).paragraphs] == original
+        assert canonical_form(canonical) == canonical
+        assert canonical_form(b"plain text") == b"plain text"
+    
+    def test_edited_docx_deduplicates(self):
+        # Arrange
+        text = make_contract(11, 100_000)
+        versions = [make_docx(text), make_docx(text.replace(b'notice', b'written notice', 1))]
+        
+        # Act
+        raw = dedup_report(versions, canonical=False)
+        canonical = dedup_report(versions)
+        
+        # Assert
+        assert raw['dedup_ratio'] < 1.4
+        assert canonical['dedup_ratio'] > 1.6
+
+class TestSharedStore:
+    def test_refuses_to_start_without_key(self, tmp_path, monkeypatch):
+        # Arrange
+        monkeypatch.setattr(blob_store, "_shared_store", None)
+        monkeypatch.setenv("BLOB_STORE_DIR", str(tmp_path / "blobs"))
+        monkeypatch.delenv("ENCRYPTION_MASTER_KEY", raising=False)
+        
+        # Act / Assert
+        with pytest.raises(BlobStoreConfigError):
+            get_blob_store()
+    
+    def test_disabled_without_directory(self, monkeypatch):
+        # Arrange
+        monkeypatch.setattr(blob_store, "_shared_store", None)
+        monkeypatch.delenv("BLOB_STORE_DIR", raising=False)
+        
+        # Act / Assert
+        assert get_blob_store() is None
+
+class TestDedupReport:
+    def test_report_ratio(self, capsys, tmp_path):
+        # Arrange
+        contract = make_contract(8)
+        for index in range(4):
+            (tmp_path / f"contract-{index}.txt").write_bytes(contract.replace(b'party', f'party{index}'.encode(), 1))
+        
+        # Act
+        report = dedup_report(path.read_bytes() for path in sorted(tmp_path.iterdir()))
+        exit_code = main([str(tmp_path)])
+        
+        # Assert
+        assert report['documents'] == 4
+        assert report['dedup_ratio'] > 3
+        assert exit_code == 0
+        assert "dedup ratio" in capsys.readouterr().out
\ No newline at end of file
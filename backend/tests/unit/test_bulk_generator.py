@@ -0,0 +1,72 @@
+import pytest
+import io
+import json
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from jinja2 import Environment
+from unittest.mock import patch
+from document_service import conversion_executor
+from document_service.bulk_generator import BulkGenerator, aiter_lines, aiter_rows
+from document_service.conversion_executor import ConversionExecutor
+
+async def _chunks(data: bytes, size: int = 7):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+async def _collect(stream) -> bytes:
+    return b"".join([chunk async for chunk in stream])
+
+class TestBulkGenerator:
+    @pytest.fixture
+    def template(self):
+        return Environment().from_string("Dear {{ name }}, your fee is {{ fee }}.")
+    
+    @pytest.fixture
+    def generator(self):
+        # Convert in threads with a stub converter instead of worker processes
+        with patch.object(conversion_executor, "_convert", lambda job_id, content, source, target: content.encode("utf-8")), \
+                ThreadPoolExecutor(max_workers=2) as executor:
+            yield BulkGenerator(ConversionExecutor(workers=2, executor=executor), max_pending=2)
+    
+    @pytest.mark.asyncio
+    async def test_csv_rows_with_quoted_newlines(self):
+        # Arrange
+        body = b'name,fee\n"Acme\nCorp",100\nBeta,200\n'
+        
+        # Act
+        rows = [row async for row in aiter_rows(aiter_lines(_chunks(body)), "csv")]
+        
+        # Assert
+        assert rows == [{"name": "Acme\nCorp", "fee": "100"}, {"name": "Beta", "fee": "200"}]
+    
+    @pytest.mark.asyncio
+    async def test_streams_zip_archive(self, generator, template):
+        # Arrange
+        body = b"".join(json.dumps({"name": n, "fee": i}).encode() + b"\n" for i, n in enumerate(["Acme", "Beta", "Gamma"]))
+        rows = aiter_rows(aiter_lines(_chunks(body)))
+        updates = []
+        
+        # Act
+        data = await _collect(generator.generate(template, rows, "text", "zip", "name", updates.append))
+        
+        # Assert
+        archive = zipfile.ZipFile(io.BytesIO(data))
+        assert archive.namelist() == ["000001-Acme.txt", "000002-Beta.txt", "000003-Gamma.txt"]
+        assert archive.read("000002-Beta.txt") == b"Dear Beta, your fee is 1."
+        assert updates[-1] == {"rendered": 3, "completed": 3, "errors": 0}
+    
+    @pytest.mark.asyncio
+    async def test_jsonl_manifest_reports_failures(self, generator):
+        # Arrange
+        template = Environment().from_string("{{ fee / 0 }}")
+        
+        async def rows():
+            yield {"fee": 1}
+        
+        # Act
+        data = await _collect(generator.generate(template, rows(), "text", "jsonl"))
+        
+        # Assert
+        entry = json.loads(data)
+        assert entry["status"] == "error"
+        assert entry["filename"] == "document-000001.txt"
\ No newline at end of file
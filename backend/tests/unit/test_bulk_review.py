@@ -0,0 +1,98 @@
+import pytest
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, patch
+
+# bulk_review imports ContractReviewAgent, which needs the NLP stack
+pytest.importorskip("spacy")
+pytest.importorskip("transformers")
+
+from ai_orchestrator import bulk_review
+from ai_orchestrator.bulk_review import BulkReviewRunner, iter_documents, load_checkpoint
+
+class TestBulkReview:
+    @pytest.fixture
+    def data_room(self, tmp_path):
+        root = tmp_path / "data-room"
+        (root / "nested").mkdir(parents=True)
+        (root / "a.txt").write_text("Agreement A")
+        (root / "b.txt").write_text("Agreement B")
+        (root / "nested" / "c.txt").write_text("Agreement C")
+        (root / "notes.xlsx").write_bytes(b"ignored")
+        return root
+    
+    @pytest.fixture
+    def fake_worker(self):
+        # Run the pool in-process with a mocked agent instead of loading models
+        agent = AsyncMock()
+        agent.process.side_effect = lambda data: {"summary": data["document"]}
+        
+        def init_worker(config, worker_counter=None):
+            bulk_review._worker_state.update(agent=agent, converter=AsyncMock(), loop=asyncio.new_event_loop())
+        
+        with patch.object(bulk_review, "ProcessPoolExecutor", ThreadPoolExecutor), \
+                patch.object(bulk_review, "_init_worker", init_worker):
+            yield agent
+    
+    def test_iter_documents_streams_supported_files(self, data_room):
+        # Act
+        paths = list(iter_documents(str(data_room)))
+        
+        # Assert
+        assert [p.rsplit("/", 1)[-1] for p in paths] == ["a.txt", "b.txt", "c.txt"]
+    
+    def test_load_checkpoint_truncates_partial_line(self, tmp_path):
+        # Arrange
+        output = tmp_path / "results.jsonl"
+        output.write_text(json.dumps({"path": "/x/a.txt", "status": "completed"}) + "\n" + '{"path": "/x/b.t')
+        
+        # Act
+        completed = load_checkpoint(str(output))
+        
+        # Assert
+        assert completed == {"/x/a.txt"}
+        assert output.read_text().endswith("}\n")
+    
+    def test_load_checkpoint_retries_errors(self, tmp_path):
+        # Arrange
+        output = tmp_path / "results.jsonl"
+        output.write_text(
+            json.dumps({"path": "/x/a.txt", "status": "completed"}) + "\n"
+            + json.dumps({"path": "/x/b.txt", "status": "error", "error": "timeout"}) + "\n"
+        )
+        
+        # Act
+        completed = load_checkpoint(str(output))
+        
+        # Assert
+        assert completed == {"/x/a.txt"}
+    
+    def test_run_writes_jsonl(self, data_room, tmp_path, fake_worker):
+        # Arrange
+        output = tmp_path / "results.jsonl"
+        runner = BulkReviewRunner(str(data_room), str(output), workers=2, batch_size=2)
+        
+        # Act
+        stats = runner.run()
+        
+        # Assert
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        assert stats["completed"] == 3
+        assert {r["result"]["summary"] for r in records} == {"Agreement A", "Agreement B", "Agreement C"}
+    
+    def test_run_resumes_from_checkpoint(self, data_room, tmp_path, fake_worker):
+        # Arrange
+        output = tmp_path / "results.jsonl"
+        done = str(data_room / "a.txt")
+        output.write_text(json.dumps({"path": done, "status": "completed", "result": {}}) + "\n")
+        runner = BulkReviewRunner(str(data_room), str(output), workers=1, batch_size=1)
+        
+        # Act
+        stats = runner.run()
+        
+        # Assert
+        assert stats["skipped"] == 1
+        assert stats["completed"] == 2
+        assert fake_worker.process.call_count == 2
+        assert len(output.read_text().splitlines()) == 3
\ No newline at end of file
@@ -0,0 +1,87 @@
+import pytest
+from types import SimpleNamespace
+from ai_orchestrator.utils.clause_index import ClauseIndex, TermAutomaton
+
+class TestClauseIndex:
+    @pytest.fixture
+    def clauses(self):
+        return [
+            SimpleNamespace(id="c1", text='1. Definitions. "Confidential Information" means any non-public data. "Services" means the work.'),
+            SimpleNamespace(id="c2", text='2. Services. Acme Corp (the "Provider") shall perform the Services subject to Section 3.1.'),
+            SimpleNamespace(id="c3", text='3. Confidentiality. The Provider shall protect Confidential Information as set out in Sections 2 and 9.'),
+            SimpleNamespace(id="c4", text='4. Term. The term of ServicesCo obligations is one year.')
+        ]
+    
+    def test_build_indexes_terms_and_sections(self, clauses):
+        # Act
+        index = ClauseIndex.build(clauses)
+        
+        # Assert
+        assert index.terms == {
+            "Confidential Information": "c1",
+            "Services": "c1",
+            "Provider": "c2"
+        }
+        assert index.sections == {"1": "c1", "2": "c2", "3": "c3", "4": "c4"}
+    
+    def test_resolve_defined_terms_and_references(self, clauses):
+        # Arrange
+        index = ClauseIndex.build(clauses)
+        
+        # Act
+        dependencies = index.resolve("c3", clauses[2].text)
+        
+        # Assert
+        targets = {(d["type"], d["reference"], d["clause_id"]) for d in dependencies}
+        assert targets == {
+            ("defined_term", "Provider", "c2"),
+            ("defined_term", "Confidential Information", "c1"),
+            ("section_reference", "2", "c2")
+        }
+    
+    def test_subsection_reference_falls_back_to_parent(self, clauses):
+        # Arrange
+        index = ClauseIndex.build(clauses)
+        
+        # Act
+        dependencies = index.resolve("c2", clauses[1].text)
+        
+        # Assert
+        assert {"type": "section_reference", "reference": "3.1", "clause_id": "c3"} in dependencies
+        # Self-references are not dependencies
+        assert all(d["clause_id"] != "c2" for d in dependencies)
+    
+    def test_terms_match_whole_words_only(self, clauses):
+        # Arrange
+        index = ClauseIndex.build(clauses)
+        
+        # Act
+        dependencies = index.resolve("c4", clauses[3].text)
+        
+        # Assert
+        assert dependencies == []
+    
+    def test_dependency_graph(self, clauses):
+        # Arrange
+        index = ClauseIndex.build(clauses)
+        for clause in clauses:
+            index.resolve(clause.id, clause.text)
+        
+        # Act
+        graph = index.dependency_graph()
+        
+        # Assert
+        assert graph["nodes"] == ["c1", "c2", "c3", "c4"]
+        assert {"source": "c3", "target": "c1", "type": "defined_term", "reference": "Confidential Information"} in graph["edges"]
+    
+    def test_automaton_finds_overlapping_terms(self):
+        # Arrange
+        automaton = TermAutomaton(["Party", "Disclosing Party", "Receiving Party"])
+        
+        # Act
+        matches = list(automaton.find("The Disclosing Party notifies the Receiving Party."))
+        
+        # Assert
+        assert (4, "Disclosing Party") in matches
+        assert (15, "Party") in matches
+        assert (34, "Receiving Party") in matches
\ No newline at end of file
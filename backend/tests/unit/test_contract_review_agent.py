@@ -0,0 +1,125 @@
+import pytest
+import asyncio
+from collections import OrderedDict
+
+pytest.importorskip("spacy")
+pytest.importorskip("transformers")
+
+from ai_orchestrator.agents.contract_review_agent import ContractReviewAgent, SummaryNotFound
+from ai_orchestrator.models.contract import RiskAssessment
+from ai_orchestrator.utils.recommendation_cache import RecommendationCache
+
+class TestAbstractiveSummaries:
+    @pytest.fixture
+    def agent(self):
+        # Only the summary bookkeeping is exercised, so no models are loaded
+        agent = ContractReviewAgent.__new__(ContractReviewAgent)
+        agent.pending_summaries = OrderedDict()
+        agent.summary_finished_at = {}
+        agent.max_pending_summaries = 3
+        agent.summary_ttl = 600
+        agent._abstractive_summary = lambda document: f"summary of {document}"
+        return agent
+    
+    @pytest.mark.asyncio
+    async def test_result_survives_notification(self, agent):
+        # Arrange
+        notified = []
+        summary_id = agent._schedule_abstractive_summary("contract", {'on_summary': lambda *args: notified.append(args)})
+        
+        # Act
+        first = await agent.get_abstractive_summary(summary_id, timeout=5)
+        await asyncio.sleep(0)
+        second = await agent.get_abstractive_summary(summary_id, timeout=5)
+        
+        # Assert
+        assert first == second == "summary of contract"
+        assert notified == [(summary_id, "summary of contract")]
+    
+    @pytest.mark.asyncio
+    async def test_entries_are_capped(self, agent):
+        # Arrange
+        summary_ids = [agent._schedule_abstractive_summary(f"contract {i}", {}) for i in range(3)]
+        for summary_id in summary_ids:
+            await agent.get_abstractive_summary(summary_id, timeout=5)
+        await asyncio.sleep(0)
+        
+        # Act
+        agent._schedule_abstractive_summary("contract 3", {})
+        
+        # Assert: the oldest finished summary made room
+        assert len(agent.pending_summaries) == 3
+        with pytest.raises(SummaryNotFound):
+            await agent.get_abstractive_summary(summary_ids[0])
+        assert await agent.get_abstractive_summary(summary_ids[1]) == "summary of contract 1"
+    
+    @pytest.mark.asyncio
+    async def test_finished_entries_expire(self, agent):
+        # Arrange
+        summary_id = agent._schedule_abstractive_summary("contract", {})
+        await agent.get_abstractive_summary(summary_id, timeout=5)
+        await asyncio.sleep(0)
+        agent.summary_ttl = -1
+        
+        # Act
+        agent._prune_summaries()
+        
+        # Assert
+        with pytest.raises(SummaryNotFound, match="expired"):
+            await agent.get_abstractive_summary(summary_id)
+class TestRecommendations:
+    @pytest.fixture
+    def agent(self):
+        agent = ContractReviewAgent.__new__(ContractReviewAgent)
+        agent.config = {'risk_threshold': 0.5}
+        agent.recommendation_cache = RecommendationCache()
+        return agent
+    
+    @pytest.mark.asyncio
+    async def test_same_risk_level_gets_advice_per_clause_type(self, agent):
+        # Arrange
+        analyzed_clauses = [
+            {'clause': {'id': '4.2', 'type': 'indemnification'}},
+            {'clause': {'id': '9.1', 'type': 'termination'}}
+        ]
+        risks = [
+            RiskAssessment(clause_id='4.2', risk_level='high', risk_score=0.9, risk_factors=['uncapped'], potential_impact='financial'),
+            RiskAssessment(clause_id='9.1', risk_level='high', risk_score=0.9, risk_factors=['uncapped'], potential_impact='financial')
+        ]
+        
+        # Act
+        recommendations = await agent._generate_recommendations(risks, [], analyzed_clauses, {'jurisdiction': 'US-NY'})
+        
+        # Assert
+        assert "indemnification clause 4.2" in recommendations[0]['recommendation']
+        assert "termination clause 9.1" in recommendations[1]['recommendation']
+        assert agent.recommendation_cache.stats()['misses'] == 2
+    
+    @pytest.mark.asyncio
+    async def test_compliance_issues_under_one_regulation_keep_their_requirement(self, agent):
+        # Arrange
+        issues = [
+            {'regulation': 'GDPR', 'clause_id': '4', 'requirement': "No lawful basis for processing"},
+            {'regulation': 'GDPR', 'clause_id': '7', 'requirement': "Retention costs $5 per record"}
+        ]
+        
+        # Act
+        recommendations = await agent._generate_recommendations([], issues, [], {'jurisdiction': 'EU'})
+        
+        # Assert
+        assert recommendations[0]['recommendation'] == "Amend clause 4 to comply with GDPR in EU: No lawful basis for processing."
+        assert recommendations[1]['recommendation'] == "Amend clause 7 to comply with GDPR in EU: Retention costs $5 per record."
+        assert agent.recommendation_cache.stats()['misses'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_dollar_signs_in_regulation_and_risk_level_are_literal(self, agent):
+        # Arrange
+        risk = RiskAssessment(clause_id='2', risk_level='$high', risk_score=0.9, risk_factors=[], potential_impact='financial')
+        issue = {'regulation': 'Reg $clause_id', 'clause_id': '3'}
+        
+        # Act
+        recommendations = await agent._generate_recommendations([risk], [issue], [], {})
+        
+        # Assert
+        assert recommendations[0]['risk_level'] == '$high'
+        assert recommendations[1]['regulation'] == 'Reg $clause_id'
\ No newline at end of file
@@ -0,0 +1,88 @@
+import pytest
+import os
+from document_service.conversion_cache import ConversionCache, conversion_key
+from document_service.conversion_graph import ConversionGraph
+from document_service.format_converter import CONVERTER_VERSION, FormatConverter
+
+class TestConversionCache:
+    @pytest.fixture
+    def directory(self, tmp_path):
+        return str(tmp_path / "conversions")
+    
+    def test_key_covers_formats_and_version(self):
+        # Act
+        key = conversion_key("Dear Acme", "text", "docx", "1")
+        
+        # Assert
+        assert key == conversion_key(b"Dear Acme", "text", "docx", "1")
+        assert key != conversion_key("Dear Acme", "text", "pdf", "1")
+        assert key != conversion_key("Dear Acme", "text", "docx", "2")
+    
+    def test_memory_tier_evicts_by_size(self):
+        # Arrange
+        cache = ConversionCache(max_memory_bytes=10)
+        cache.put("a", b"12345")
+        cache.put("b", b"12345")
+        cache.get("a")
+        
+        # Act
+        cache.put("c", b"12345")
+        
+        # Assert
+        assert cache.get("b") is None
+        assert cache.get("a") == b"12345"
+        assert cache.memory_bytes == 10
+        assert cache.metrics()["memory_evictions"] == 1
+        assert cache.metrics()["disk_evictions"] == 0
+    
+    def test_disk_tier_is_shared(self, directory):
+        # Arrange
+        writer = ConversionCache(directory=directory)
+        writer.put("ab" * 32, b"converted")
+        
+        # Act
+        reader = ConversionCache(directory=directory)
+        data = reader.get("ab" * 32)
+        
+        # Assert
+        assert data == b"converted"
+        assert reader.metrics()["disk_hits"] == 1
+        assert not [name for _, _, names in os.walk(directory) for name in names if name.startswith(".tmp-")]
+    
+    def test_disk_tier_evicts_least_recently_used(self, directory):
+        # Arrange
+        cache = ConversionCache(max_memory_bytes=0, directory=directory, max_disk_bytes=100)
+        for index, key in enumerate(["aa1", "bb2", "cc3"]):
+            cache.put(key, b"x" * 40)
+            os.utime(cache._path(key), (index, index))
+        
+        # Act
+        cache.put("dd4", b"x" * 40)
+        
+        # Assert
+        assert cache.get("aa1") is None
+        assert cache.get("bb2") is None
+        assert cache.get("dd4") == b"x" * 40
+        assert cache.metrics()["disk_evictions"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_converter_reuses_output(self):
+        # Arrange
+        calls = []
+        
+        async def to_html(content):
+            calls.append(content)
+            return f"<p>{content}</p>"
+        
+        graph = ConversionGraph()
+        graph.add("text", "html", to_html, 0.0, 0.0)
+        converter = FormatConverter(graph=graph, cache=ConversionCache())
+        
+        # Act
+        first = await converter.convert("Acme", "text", "html")
+        second = await converter.convert("Acme", "text", "html")
+        
+        # Assert
+        assert first == second == b"<p>Acme</p>"
+        assert calls == ["Acme"]
+        assert converter.cache.get(conversion_key("Acme", "text", "html", CONVERTER_VERSION)) == first
\ No newline at end of file
@@ -0,0 +1,119 @@
+import pytest
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from document_service import conversion_executor
+from document_service.conversion_executor import ConversionExecutor, ConversionQueueFull, ConversionTimeout
+
+def _process_convert(job_id, content, source, target):
+    # Runs in a forked worker; reports its start the way _convert does
+    conversion_executor._worker_state['started'].put(job_id)
+    if content == "stuck":
+        time.sleep(30)
+    return f"{source}:{target}:{content}".encode("utf-8")
+
+class TestConversionExecutor:
+    @pytest.fixture
+    def release(self):
+        return threading.Event()
+    
+    @pytest.fixture
+    def executor(self, release):
+        def convert(job_id, content, source, target):
+            # Jobs for "slow" content hold their worker until released
+            if content == "slow":
+                release.wait(5)
+            return f"{source}:{target}:{content}".encode("utf-8")
+        
+        with patch.object(conversion_executor, "_convert", convert), ThreadPoolExecutor(max_workers=1) as pool:
+            yield ConversionExecutor(workers=1, max_queue=1, timeout=5, executor=pool)
+            release.set()
+    
+    @pytest.mark.asyncio
+    async def test_converts_in_pool(self, executor):
+        # Act
+        result = await executor.convert("Acme", "text", "docx")
+        
+        # Assert
+        assert result == b"text:docx:Acme"
+        assert executor.metrics()["completed"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_full(self, executor, release):
+        # Arrange
+        running = asyncio.ensure_future(executor.convert("slow", "text", "docx"))
+        queued = asyncio.ensure_future(executor.convert("next", "text", "docx"))
+        await asyncio.sleep(0.05)
+        
+        # Act
+        with pytest.raises(ConversionQueueFull):
+            await executor.convert("rejected", "text", "docx")
+        release.set()
+        
+        # Assert
+        assert await queued == b"text:docx:next"
+        assert await running == b"text:docx:slow"
+        assert executor.metrics()["rejected"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_waiting_callers_queue_instead(self, executor, release):
+        # Arrange
+        jobs = [asyncio.ensure_future(executor.convert(name, "text", "html", wait=True)) for name in ["slow", "b", "c"]]
+        await asyncio.sleep(0.05)
+        
+        # Act
+        release.set()
+        results = await asyncio.gather(*jobs)
+        
+        # Assert
+        assert results == [b"text:html:slow", b"text:html:b", b"text:html:c"]
+    
+    @pytest.mark.asyncio
+    async def test_timeout(self, executor):
+        # Act
+        with pytest.raises(ConversionTimeout):
+            await executor.convert("slow", "text", "pdf", timeout=0.1)
+        
+        # Assert
+        assert executor.metrics()["timeouts"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_queued_jobs_are_timed_from_their_start(self, executor, release):
+        # Arrange
+        running = asyncio.ensure_future(executor.convert("slow", "text", "docx"))
+        await asyncio.sleep(0.05)
+        
+        # Act: the queued job waits longer than its timeout, but runs within it
+        queued = asyncio.ensure_future(executor.convert("next", "text", "docx", timeout=0.2))
+        await asyncio.sleep(0.4)
+        release.set()
+        
+        # Assert
+        assert await queued == b"text:docx:next"
+        assert await running == b"text:docx:slow"
+        assert executor.metrics()["timeouts"] == 0
+
+class TestConversionPoolRestart:
+    @pytest.mark.asyncio
+    async def test_jobs_behind_a_stuck_job_are_resubmitted(self):
+        # Arrange
+        executor = ConversionExecutor(workers=1, max_queue=4, timeout=0.5)
+        try:
+            with patch.object(conversion_executor, "_convert", _process_convert):
+                stuck = asyncio.ensure_future(executor.convert("stuck", "text", "docx"))
+                await asyncio.sleep(0.05)
+                queued = [asyncio.ensure_future(executor.convert(name, "text", "docx")) for name in ["a", "b", "c"]]
+                
+                # Act
+                with pytest.raises(ConversionTimeout):
+                    await stuck
+                results = await asyncio.gather(*queued)
+        finally:
+            executor.shutdown()
+        
+        # Assert
+        assert results == [b"text:docx:a", b"text:docx:b", b"text:docx:c"]
+        metrics = executor.metrics()
+        assert (metrics["completed"], metrics["timeouts"], metrics["restarts"]) == (3, 1, 1)
\ No newline at end of file
@@ -0,0 +1,131 @@
+import pytest
+import io
+from docx import Document
+from document_service.conversion_graph import ConversionGraph
+from document_service.format_converter import FormatConverter
+
+async def _upper(content):
+    return content.upper()
+
+class TestConversionGraph:
+    @pytest.fixture
+    def graph(self):
+        graph = ConversionGraph(terminal=("text",))
+        graph.add("markdown", "html", _upper, 0.001, 0.1)
+        graph.add("html", "docx", _upper, 0.03, 2.0)
+        graph.add("markdown", "docx", _upper, 0.02, 0.5)
+        graph.add("html", "text", _upper, 0.0002, 0.1)
+        graph.add("text", "docx", _upper, 0.001, 0.1)
+        return graph
+    
+    def test_prefers_cheapest_path(self, graph):
+        # Act
+        path = graph.path("markdown", "docx")
+        
+        # Assert
+        assert [(edge.source, edge.target) for edge in path] == [("markdown", "docx")]
+    
+    def test_terminal_formats_are_not_traversed(self, graph):
+        # Act
+        path = graph.path("html", "docx")
+        
+        # Assert
+        assert [(edge.source, edge.target) for edge in path] == [("html", "docx")]
+    
+    @pytest.mark.asyncio
+    async def test_measurements_update_costs(self, graph):
+        # Arrange
+        edge = graph.edges["markdown"]["docx"]
+        
+        # Act
+        for _ in range(20):
+            edge.record(1.0, 1024, graph.smoothing)
+        
+        # Assert
+        assert [(edge.source, edge.target) for edge in graph.path("markdown", "docx")] == [
+            ("markdown", "html"), ("html", "docx")
+        ]
+        assert await graph.convert("abc", "markdown", "html") == "ABC"
+    
+    def test_pinned_route_ignores_costs(self, graph):
+        # Arrange
+        graph.pin("markdown", "html", "docx")
+        
+        # Act
+        path = graph.path("markdown", "docx")
+        
+        # Assert
+        assert [(edge.source, edge.target) for edge in path] == [("markdown", "html"), ("html", "docx")]
+        with pytest.raises(ValueError, match="No converter"):
+            graph.pin("docx", "markdown")
+    
+    def test_conditional_pin_applies_only_to_matching_content(self, graph):
+        # Arrange
+        graph.pin("markdown", "html", "docx", when=lambda content: "<" in content)
+        
+        # Act / Assert
+        assert len(graph.path("markdown", "docx", 0, "<b>Terms</b>")) == 2
+        assert len(graph.path("markdown", "docx", 0, "**Terms**")) == 1
+        assert len(graph.path("markdown", "docx")) == 1
+    
+    def test_missing_path_raises(self, graph):
+        # Act / Assert
+        with pytest.raises(ValueError, match="No conversion path"):
+            graph.path("docx", "markdown")
+
+class TestDirectConverters:
+    @pytest.fixture
+    def converter(self):
+        return FormatConverter()
+    
+    @pytest.mark.asyncio
+    async def test_text_docx_round_trip(self, converter):
+        # Act
+        content = await converter.convert("<p>First <b>clause</b></p><p>Second &amp; final</p>", "text", "docx")
+        text = await converter.convert(content, "docx", "text")
+        
+        # Assert: markup in text is rendered, not written literally
+        paragraphs = Document(io.BytesIO(content)).paragraphs
+        assert [p.text for p in paragraphs] == ["First clause", "Second & final"]
+        assert any(run.bold for run in paragraphs[0].runs)
+        assert text == b"First clause\nSecond & final"
+    
+    def test_routes_do_not_depend_on_timings(self, converter):
+        # Arrange: make each text-to-docx route look free in turn
+        graph = converter.graph
+        for edge in (graph.edges["text"]["docx"], graph.edges["text"]["html"], graph.edges["html"]["docx"]):
+            edge.fixed = edge.per_mb = 0.0
+        graph.edges["text"]["docx"].fixed = 10.0
+        
+        # Act
+        plain = graph.path("text", "docx", 1024, "First clause\nSecond & final")
+        marked_up = graph.path("text", "docx", 1024, "<p>First <b>clause</b></p>")
+        
+        # Assert
+        assert [edge.target for edge in plain] == ["docx"]
+        assert [edge.target for edge in marked_up] == ["html", "docx"]
+    
+    @pytest.mark.asyncio
+    async def test_plain_text_goes_straight_to_docx(self, converter):
+        # Act
+        content = await converter.convert("First clause\n\n  Second & final\n", "text", "docx")
+        
+        # Assert: each line is its own paragraph, as HTML rendering would not keep them
+        assert [p.text for p in Document(io.BytesIO(content)).paragraphs] == ["First clause", "Second & final"]
+        assert converter.graph.edges["text"]["docx"].calls == 1
+        assert converter.graph.edges["text"]["html"].calls == 0
+    
+    @pytest.mark.asyncio
+    async def test_markdown_to_docx_styles(self, converter):
+        # Act
+        content = await converter.convert("# Terms\n\nThe **Supplier** shall\ndeliver.\n\n- Fees\n1. Term\n", "markdown", "docx")
+        
+        # Assert
+        paragraphs = Document(io.BytesIO(content)).paragraphs
+        assert [(p.style.name, p.text) for p in paragraphs] == [
+            ("Heading 1", "Terms"),
+            ("Normal", "The Supplier shall deliver."),
+            ("List Bullet", "Fees"),
+            ("List Number", "Term")
+        ]
+        assert paragraphs[1].runs[1].bold
\ No newline at end of file
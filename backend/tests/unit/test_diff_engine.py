@@ -0,0 +1,48 @@
+import pytest
+import json
+from document_service.diff_engine import apply_changes, diff_documents, diff_opcodes, word_diff
+
+class TestDiffEngine:
+    @pytest.fixture
+    def contract(self):
+        return "\n".join(f"{i}. The Supplier shall deliver Schedule {i} by the Delivery Date." for i in range(1, 21))
+    
+    def test_opcodes_cover_both_sides(self):
+        # Act
+        opcodes = diff_opcodes(list("abcabba"), list("cbabac"))
+        
+        # Assert
+        assert opcodes[0][1] == 0 and opcodes[0][3] == 0
+        assert opcodes[-1][2] == 7 and opcodes[-1][4] == 6
+        assert sum(a1 - a0 for tag, a0, a1, _, _ in opcodes if tag == "equal") == 4
+    
+    def test_word_edits_inside_modified_paragraph(self):
+        # Act
+        edits = word_diff("The Supplier shall deliver.", "The Supplier must deliver promptly.")
+        
+        # Assert
+        assert edits == [["=", 13], ["-", "shall"], ["+", "must"], ["=", 8], ["+", " promptly"], ["=", 1]]
+    
+    def test_change_set_round_trip(self, contract):
+        # Arrange
+        paragraphs = contract.split("\n")
+        paragraphs[3] = paragraphs[3].replace("shall", "must")
+        del paragraphs[10]
+        paragraphs.insert(15, "15A. Either party may terminate on notice.")
+        revised = "\n".join(paragraphs)
+        
+        # Act
+        change_set = diff_documents(contract, revised)
+        
+        # Assert
+        assert change_set["stats"]["modified"] == 1
+        assert change_set["stats"]["deleted"] == 1
+        assert change_set["stats"]["inserted"] == 1
+        assert apply_changes(contract, json.loads(json.dumps(change_set))) == revised
+    
+    def test_rewrite_beyond_budget_is_replaced(self):
+        # Act
+        change_set = diff_documents("\n".join("abcdefgh"), "\n".join("hgfedcba"), max_d=1)
+        
+        # Assert
+        assert apply_changes("\n".join("abcdefgh"), change_set) == "\n".join("hgfedcba")
\ No newline at end of file
@@ -0,0 +1,110 @@
+import pytest
+import os
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("sqlalchemy_utils")
+pytest.importorskip("aiosqlite")
+pytest.importorskip("cryptography")
+
+# The shared engine is built at import time; these tests bring their own
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from document_service.blob_store import BlobStore, LocalFileSystemBackend
+from document_service.document_repository import DocumentRepository
+
+# SQLite can't create the JSONB and encrypted column types, so the table is declared by hand with the same columns
+DOCUMENTS_DDL = """
+CREATE TABLE documents (
+    id INTEGER PRIMARY KEY,
+    version INTEGER NOT NULL,
+    title VARCHAR(255) NOT NULL,
+    content BLOB,
+    content_manifest JSON,
+    status VARCHAR(8),
+    jurisdiction VARCHAR(100) NOT NULL,
+    metadata JSON NOT NULL,
+    parent_version_id INTEGER,
+    owner_id INTEGER NOT NULL,
+    template_id INTEGER,
+    created_at DATETIME,
+    updated_at DATETIME,
+    compliance_status JSON NOT NULL,
+    last_compliance_check DATETIME
+)
+"""
+
+# Two lineages: an MSA revised twice, and a separately drafted NDA
+ROWS = [
+    (1, 1, "Master Services Agreement", None, "DRAFT", "US-NY", 1),
+    (2, 2, "Master Services Agreement", 1, "REVIEW", "US-NY", 1),
+    (3, 3, "Master Services Agreement", 2, "APPROVED", "US-NY", 1),
+    (4, 1, "NDA 100% confidential", None, "DRAFT", "UK", 2),
+    (5, 1, "NDA 100 confidential_v2", None, "DRAFT", "UK", 2)
+]
+
+@asynccontextmanager
+async def seeded_repository(blob_dir):
+    """Repository over an in-memory database holding ROWS"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.execute(text(DOCUMENTS_DDL))
+        for document_id, version, title, parent_id, status, jurisdiction, owner_id in ROWS:
+            await connection.execute(
+                text(
+                    "INSERT INTO documents (id, version, title, content, parent_version_id, status, jurisdiction, "
+                    "owner_id, metadata, compliance_status, created_at, updated_at) VALUES (:id, :version, :title, "
+                    ":content, :parent, :status, :jurisdiction, :owner, '{}', '{}', :timestamp, :timestamp)"
+                ),
+                {
+                    'id': document_id, 'version': version, 'title': title, 'content': b'',
+                    'parent': parent_id, 'status': status, 'jurisdiction': jurisdiction,
+                    'owner': owner_id, 'timestamp': datetime(2024, 1, document_id)
+                }
+            )
+    
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        yield DocumentRepository(session_factory, BlobStore(LocalFileSystemBackend(str(blob_dir))))
+    finally:
+        await engine.dispose()
+
+class TestDocumentRepository:
+    @pytest.mark.asyncio
+    async def test_list_versions_follows_lineage(self, tmp_path):
+        async with seeded_repository(tmp_path / "blobs") as repository:
+            # Act
+            versions = await repository.list_versions(3)
+            
+            # Assert
+            assert [(entry['id'], entry['version']) for entry in versions] == [(1, 1), (2, 2), (3, 3)]
+            assert all('content' not in entry and 'content_manifest' not in entry for entry in versions)
+            assert [entry['id'] for entry in await repository.list_versions(4)] == [4]
+    
+    @pytest.mark.asyncio
+    async def test_latest_only_skips_superseded_versions(self, tmp_path):
+        async with seeded_repository(tmp_path / "blobs") as repository:
+            # Act
+            latest = await repository.list_documents()
+            everything = await repository.list_documents(latest_only=False)
+            
+            # Assert: newest first
+            assert [entry['id'] for entry in latest] == [5, 4, 3]
+            assert [entry['id'] for entry in everything] == [5, 4, 3, 2, 1]
+            assert [entry['id'] for entry in await repository.list_documents(status='approved')] == [3]
+            assert await repository.list_documents(status='draft', jurisdiction='US-NY') == []
+    
+    @pytest.mark.asyncio
+    async def test_search_matches_wildcards_literally(self, tmp_path):
+        async with seeded_repository(tmp_path / "blobs") as repository:
+            # Act / Assert
+            assert [entry['id'] for entry in await repository.search("100%")] == [4]
+            assert [entry['id'] for entry in await repository.search("l_v")] == [5]
+            assert await repository.search("100_c") == []
+            assert [entry['id'] for entry in await repository.search("services agreement")] == [3]
+            assert [entry['id'] for entry in await repository.search("services agreement", latest_only=False)] == [3, 2, 1]
\ No newline at end of file
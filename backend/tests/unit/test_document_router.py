@@ -0,0 +1,72 @@
+import pytest
+from ai_orchestrator.utils.document_router import DocumentRouter
+
+class TestDocumentRouter:
+    @pytest.fixture
+    def router(self):
+        return DocumentRouter()
+    
+    @pytest.fixture
+    def nda_text(self):
+        return (
+            "MUTUAL NON-DISCLOSURE AGREEMENT\n"
+            "1. The Disclosing Party may share Confidential Information with the Receiving Party.\n"
+            "2. The Receiving Party shall protect Confidential Information.\n"
+        )
+    
+    def test_predict_document_type(self, router, nda_text):
+        # Act
+        prediction = router.predict(nda_text)
+        
+        # Assert
+        assert prediction.document_type == "nda"
+        assert prediction.complexity == "low"
+        assert prediction.confidence > 0.5
+    
+    def test_unrecognised_documents_are_general(self, router):
+        # Act
+        prediction = router.predict("Meeting notes from Tuesday.")
+        
+        # Assert
+        assert prediction.document_type == "general"
+    
+    def test_route_uses_minimal_agent_set(self, router, nda_text):
+        # Arrange
+        default_agents = ["contract_review", "risk_assessment", "compliance"]
+        
+        # Act
+        decision = router.route("contract_analysis", nda_text, default_agents)
+        
+        # Assert
+        assert decision.agents == ["contract_review", "compliance"]
+        assert decision.reason == "policy"
+    
+    def test_complex_documents_get_full_workflow(self, router, nda_text):
+        # Arrange
+        default_agents = ["contract_review", "risk_assessment", "compliance"]
+        document = nda_text + "".join(
+            f"{i}. Subject to Section {i - 1}, the Receiving Party shall comply.\n" for i in range(3, 3000)
+        )
+        
+        # Act
+        decision = router.route("contract_analysis", document, default_agents)
+        
+        # Assert
+        assert decision.prediction.complexity == "high"
+        assert decision.agents == default_agents
+    
+    def test_unrouted_task_types_fall_back_to_workflow(self, router, nda_text):
+        # Act
+        decision = router.route("document_generation", nda_text, ["document_generation", "compliance"])
+        
+        # Assert
+        assert decision.agents == ["document_generation", "compliance"]
+        assert decision.reason == "workflow"
+    
+    def test_override(self, router):
+        # Act
+        decision = router.override("contract_analysis", ["compliance"])
+        
+        # Assert
+        assert decision.agents == ["compliance"]
+        assert decision.overridden
\ No newline at end of file
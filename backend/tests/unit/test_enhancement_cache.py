@@ -0,0 +1,78 @@
+import pytest
+from document_service.enhancement_cache import EnhancementCache, enhancement_key
+
+class TestEnhancementCache:
+    @pytest.fixture
+    def path(self, tmp_path):
+        return str(tmp_path / "nlp" / "enhancements.db")
+    
+    def test_key_covers_context_and_model(self):
+        # Arrange
+        context = {'tier': 'thorough', 'jurisdiction': 'US-NY'}
+        
+        # Act
+        key = enhancement_key("The Supplier shall deliver", context, "en_core_web_lg-3.7.1-1")
+        
+        # Assert
+        assert key == enhancement_key("The Supplier shall deliver", dict(reversed(list(context.items()))), "en_core_web_lg-3.7.1-1")
+        assert key != enhancement_key("The Supplier shall deliver", {**context, 'jurisdiction': 'UK'}, "en_core_web_lg-3.7.1-1")
+        assert key != enhancement_key("The Supplier shall deliver", context, "en_core_web_lg-3.8.0-1")
+        assert key != enhancement_key("The Supplier shall deliver.", context, "en_core_web_lg-3.7.1-1")
+    
+    def test_memory_tier_evicts_least_recently_used(self):
+        # Arrange
+        cache = EnhancementCache(max_entries=2)
+        cache.put("a", "first")
+        cache.put("b", "second")
+        cache.get("a")
+        
+        # Act
+        cache.put("c", "third")
+        
+        # Assert
+        assert cache.get("b") is None
+        assert cache.get_many(["a", "c"]) == {"a": "first", "c": "third"}
+        assert cache.metrics()["evictions"] == 1
+    
+    def test_persistent_tier_survives_restart(self, path):
+        # Arrange
+        writer = EnhancementCache(path=path)
+        writer.put_many({"a": "first", "b": "second"})
+        
+        # Act
+        reader = EnhancementCache(path=path)
+        found = reader.get_many(["a", "b", "c"])
+        
+        # Assert
+        assert found == {"a": "first", "b": "second"}
+        metrics = reader.metrics()
+        assert metrics["persistent_hits"] == 2
+        assert metrics["misses"] == 1
+    
+    def test_persistent_hits_are_promoted(self, path):
+        # Arrange
+        EnhancementCache(path=path).put("a", "first")
+        cache = EnhancementCache(path=path)
+        cache.get("a")
+        
+        # Act
+        cache.get("a")
+        
+        # Assert
+        metrics = cache.metrics()
+        assert metrics["persistent_hits"] == 1
+        assert metrics["memory_hits"] == 1
+        assert metrics["hit_rate"] == 1.0
+    
+    def test_large_batches_are_chunked(self, path):
+        # Arrange
+        cache = EnhancementCache(max_entries=0, path=path)
+        items = {f"key-{i}": f"text-{i}" for i in range(1200)}
+        cache.put_many(items)
+        
+        # Act
+        found = cache.get_many(list(items))
+        
+        # Assert
+        assert found == items
+        assert cache.metrics()["entries"] == 0
\ No newline at end of file
@@ -0,0 +1,67 @@
+import pytest
+from ai_orchestrator.utils.extractive_summarizer import ExtractiveSummarizer, split_sentences
+
+class TestExtractiveSummarizer:
+    @pytest.fixture
+    def contract_text(self):
+        return (
+            "This Services Agreement is entered into by Acme Corp and Beta LLC. "
+            "Acme shall provide software services to Beta under this Agreement. "
+            "Beta shall pay Acme the fees for the software services within 30 days. "
+            "The parties enjoyed lunch together. "
+            "Either party may terminate this Agreement for material breach of the services terms. "
+            "Late fees accrue on unpaid services fees."
+        )
+    
+    def test_split_sentences(self, contract_text):
+        # Act
+        sentences = split_sentences(contract_text)
+        
+        # Assert
+        assert len(sentences) == 6
+        assert sentences[3] == "The parties enjoyed lunch together."
+    
+    def test_summary_keeps_central_sentences_in_order(self, contract_text):
+        # Arrange
+        summarizer = ExtractiveSummarizer(num_sentences=3)
+        
+        # Act
+        summary = summarizer.summarize(contract_text)
+        
+        # Assert
+        sentences = split_sentences(summary)
+        assert len(sentences) == 3
+        assert "The parties enjoyed lunch together." not in sentences
+        original = split_sentences(contract_text)
+        assert [original.index(s) for s in sentences] == sorted(original.index(s) for s in sentences)
+    
+    def test_short_documents_are_returned_whole(self):
+        # Arrange
+        summarizer = ExtractiveSummarizer(num_sentences=5)
+        
+        # Act
+        summary = summarizer.summarize("Only one sentence here.")
+        
+        # Assert
+        assert summary == "Only one sentence here."
+    
+    def test_truncation_is_logged(self, caplog):
+        # Arrange
+        summarizer = ExtractiveSummarizer(num_sentences=1, max_sentences=2)
+        
+        # Act
+        summary = summarizer.summarize("Fees are due. Fees are late. Fees accrue interest.")
+        
+        # Assert
+        assert "Fees accrue interest." not in summary
+        assert "first 2 of 3 sentences" in caplog.text
+    
+    def test_sentences_without_shared_terms(self):
+        # Arrange
+        summarizer = ExtractiveSummarizer(num_sentences=1)
+        
+        # Act
+        ranked = summarizer.rank(["Alpha beta.", "Gamma delta.", "Epsilon zeta."])
+        
+        # Assert
+        assert len(ranked) == 1
\ No newline at end of file
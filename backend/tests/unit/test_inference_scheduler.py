@@ -0,0 +1,85 @@
+import pytest
+import sys
+from unittest.mock import patch
+from ai_orchestrator.utils import inference_scheduler
+from ai_orchestrator.utils.inference_scheduler import InferenceScheduler, cpu_utilisation, plan_layout
+
+class TestInferenceScheduler:
+    @pytest.fixture
+    def smt_host(self):
+        # 8 logical CPUs on 4 physical cores, siblings numbered n and n + 4
+        def read_topology(cpu, name):
+            return 0 if name == 'physical_package_id' else cpu % 4
+        
+        with patch.object(inference_scheduler, "_read_topology", read_topology):
+            yield list(range(8))
+    
+    def test_layout_skips_smt_siblings(self, smt_host):
+        # Act
+        layout = plan_layout(workers=2, cores=smt_host)
+        
+        # Assert
+        assert layout.threads_per_worker == 2
+        assert layout.core_sets == [[0, 1], [2, 3]]
+    
+    def test_layout_with_smt(self, smt_host):
+        # Act
+        layout = plan_layout(threads_per_worker=2, cores=smt_host, use_smt=True)
+        
+        # Assert
+        assert layout.workers == 4
+        assert layout.core_sets[0] == [0, 4]
+    
+    def test_oversubscribed_layout_wraps(self, smt_host):
+        # Act
+        layout = plan_layout(workers=3, threads_per_worker=2, cores=smt_host)
+        
+        # Assert
+        assert layout.core_sets[2] == [0, 1]
+    
+    @pytest.fixture
+    def isolated_process(self, monkeypatch):
+        # Every setting configure_worker touches is restored after the test
+        for name in inference_scheduler.THREAD_ENV_VARS:
+            monkeypatch.delenv(name, raising=False)
+        monkeypatch.setitem(sys.modules, "torch", None)
+        monkeypatch.setattr(inference_scheduler, "_active_scheduler", None)
+    
+    def test_configure_worker_sets_thread_env(self, smt_host, isolated_process):
+        # Arrange
+        with patch.object(inference_scheduler, "available_cores", return_value=smt_host):
+            scheduler = InferenceScheduler(workers=4)
+        
+        # Act
+        core_set = scheduler.configure_worker(1)
+        
+        # Assert
+        assert core_set == [1]
+        assert all(inference_scheduler.os.environ[name] == "1" for name in inference_scheduler.THREAD_ENV_VARS)
+        assert inference_scheduler.active_scheduler() is scheduler
+    
+    def test_stats_omit_layout_until_applied(self, smt_host, isolated_process):
+        # Arrange
+        with patch.object(inference_scheduler, "available_cores", return_value=smt_host):
+            scheduler = InferenceScheduler(workers=4)
+        
+        # Act
+        before = scheduler.stats()
+        scheduler.configure_worker(0)
+        after = scheduler.stats()
+        
+        # Assert
+        assert before['configured'] is False and 'workers' not in before
+        assert after['workers'] == 4
+        assert after['thread_settings']['OMP_NUM_THREADS'] == "1"
+    
+    def test_cpu_utilisation(self):
+        # Arrange
+        previous = {"cpu0": [100, 0, 100, 700, 100, 0, 0, 0]}
+        current = {"cpu0": [400, 0, 200, 900, 100, 0, 0, 0]}
+        
+        # Act
+        utilisation = cpu_utilisation(previous, current)
+        
+        # Assert
+        assert utilisation["cpu0"] == pytest.approx(0.4 / 0.6)
\ No newline at end of file
@@ -0,0 +1,43 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+safetensors_torch = pytest.importorskip("safetensors.torch")
+
+from ai_orchestrator.utils.model_store import ModelStore, WeightsMismatchError, WEIGHTS_FILE
+
+TINY_BERT = dict(vocab_size=64, hidden_size=16, num_hidden_layers=1, num_attention_heads=2, intermediate_size=32, num_labels=3)
+
+class TestModelStore:
+    @pytest.fixture
+    def store(self, tmp_path, monkeypatch):
+        # The store root is passed explicitly; the environment must not matter
+        monkeypatch.delenv("MODEL_STORE_DIR", raising=False)
+        return ModelStore(str(tmp_path / "store"))
+    
+    def _save(self, store, model_name, model):
+        model.save_pretrained(store.model_dir(model_name), safe_serialization=True)
+    
+    def test_loads_converted_weights(self, store):
+        # Arrange
+        torch.manual_seed(0)
+        original = transformers.BertForSequenceClassification(transformers.BertConfig(**TINY_BERT)).eval()
+        self._save(store, "tiny/bert", original)
+        
+        # Act
+        loaded = store.load_model("tiny/bert", "text-classification")
+        
+        # Assert
+        inputs = torch.tensor([[1, 5, 9, 2]])
+        assert torch.allclose(loaded(inputs).logits, original(inputs).logits)
+    
+    def test_rejects_weights_for_another_model(self, store):
+        # Arrange
+        model = transformers.BertForSequenceClassification(transformers.BertConfig(**TINY_BERT))
+        self._save(store, "tiny/bert", model)
+        state_dict = {f"renamed.{key}": value.contiguous() for key, value in model.state_dict().items()}
+        safetensors_torch.save_file(state_dict, f"{store.model_dir('tiny/bert')}/{WEIGHTS_FILE}")
+        
+        # Act / Assert
+        with pytest.raises(WeightsMismatchError, match="missing"):
+            store.load_model("tiny/bert", "text-classification")
\ No newline at end of file
@@ -0,0 +1,78 @@
+import pytest
+from types import SimpleNamespace
+
+pytest.importorskip("spacy")
+pytest.importorskip("transformers")
+
+from document_service.enhancement_cache import EnhancementCache
+from document_service.nlp_processor import NLPProcessor
+
+class FakeNLP:
+    """Splits sentences on '. ' and records every batch it parses"""
+    meta = {'version': '0.0'}
+    
+    def __init__(self):
+        self.batches = []
+    
+    def pipe(self, texts, batch_size):
+        texts = list(texts)
+        self.batches.append(texts)
+        for text in texts:
+            sentences = [SimpleNamespace(text=sentence) for sentence in text.split('. ')]
+            yield SimpleNamespace(text=text, ents=[], sents=sentences)
+
+class TestEnhanceBatch:
+    @pytest.fixture
+    def nlp(self):
+        return FakeNLP()
+    
+    @pytest.fixture
+    def processor(self, nlp):
+        # Only the batching and caching around the enhancement steps are exercised
+        processor = NLPProcessor.__new__(NLPProcessor)
+        processor.nlp_models = {'en_core_web_sm': nlp, 'en_core_web_lg': nlp}
+        processor.cache = EnhancementCache(max_entries=16)
+        processor._add_jurisdiction_context = lambda text, jurisdiction: f"{text} ({jurisdiction})"
+        processor._add_entity_definitions = lambda text, entities: text
+        processor._is_passive = lambda sentence: False
+        processor._is_complex = lambda sentence: False
+        return processor
+    
+    @pytest.mark.asyncio
+    async def test_duplicates_are_parsed_once_in_order(self, processor, nlp):
+        # Arrange
+        texts = ["The Supplier shall deliver", "Fees are due monthly", "The Supplier shall deliver"]
+        
+        # Act
+        results = await processor.enhance_batch(texts, {'analysis_tier': 'thorough'})
+        
+        # Assert
+        assert results == texts
+        assert nlp.batches == [["The Supplier shall deliver", "Fees are due monthly"]]
+    
+    @pytest.mark.asyncio
+    async def test_cached_texts_are_not_parsed_again(self, processor, nlp):
+        # Arrange
+        context = {'analysis_tier': 'fast'}
+        await processor.enhance_batch(["First clause"], context)
+        
+        # Act
+        results = await processor.enhance_batch(["Second clause", "First clause"], context)
+        
+        # Assert
+        assert results == ["Second clause", "First clause"]
+        assert nlp.batches == [["First clause"], ["Second clause"]]
+        assert processor.cache.metrics()['memory_hits'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_only_rewritten_texts_are_parsed_twice(self, processor, nlp):
+        # Arrange
+        processor._add_jurisdiction_context = lambda text, jurisdiction: text + " under NY law" if "governed" in text else text
+        context = {'analysis_tier': 'thorough', 'jurisdiction': 'US-NY'}
+        
+        # Act
+        results = await processor.enhance_batch(["This is governed", "Fees. Are due"], context)
+        
+        # Assert
+        assert results == ["This is governed under NY law", "Fees Are due"]
+        assert nlp.batches == [["This is governed", "Fees. Are due"], ["This is governed under NY law"]]
\ No newline at end of file
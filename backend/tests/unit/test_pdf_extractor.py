@@ -0,0 +1,114 @@
+import pytest
+import time
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+from document_service import pdf_extractor
+from document_service.pdf_extractor import PdfExtractor
+
+HANGING_PAGE = 4
+
+def _hanging_pages(reader, start, stop):
+    # Stands in for a pathological page that never finishes
+    if start <= HANGING_PAGE < stop:
+        time.sleep(60)
+    return [f"Page {number}\n" for number in range(start, stop)]
+
+def _slow_pages(reader, start, stop):
+    time.sleep(0.2 * (stop - start))
+    return [f"Page {number}\n" for number in range(start, stop)]
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    writer = PdfWriter()
+    font = writer._add_object(DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica")
+    }))
+    for number in range(10):
+        page = writer.add_blank_page(612, 792)
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})
+        })
+        stream = DecodedStreamObject()
+        stream.set_data(f"BT /F1 12 Tf 72 720 Td (Page {number}) Tj ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(stream)
+    
+    path = tmp_path / "filing.pdf"
+    writer.write(str(path))
+    return str(path)
+
+@pytest.fixture
+def extractors():
+    # Pools outlive a single extraction, so each test stops the ones it started
+    started = []
+    
+    def make(**options):
+        extractor = PdfExtractor(**options)
+        started.append(extractor)
+        return extractor
+    
+    yield make
+    for extractor in started:
+        extractor.close()
+
+class TestPdfExtractor:
+    def test_pages_stream_in_order(self, pdf_path, extractors):
+        # Arrange
+        extractor = extractors(workers=2, pages_per_task=3, max_pending=2, inline_pages=0)
+        
+        # Act
+        pages = list(extractor.iter_pages(pdf_path))
+        
+        # Assert
+        assert pages == [f"Page {number}" for number in range(10)]
+    
+    def test_pool_is_reused_across_documents(self, pdf_path, extractors):
+        # Arrange
+        extractor = extractors(workers=2, inline_pages=0)
+        with open(pdf_path, "rb") as f:
+            content = f.read()
+        
+        # Act
+        first = extractor.extract_text(pdf_path)
+        pool = extractor._pool
+        second = extractor.extract_text(content)
+        
+        # Assert
+        assert first == second
+        assert extractor._pool is pool
+    
+    def test_queued_pages_do_not_time_out(self, pdf_path, extractors, monkeypatch):
+        # Arrange: ten pages queue behind one worker, each well inside its timeout
+        monkeypatch.setattr(pdf_extractor, "_extract_pages", _slow_pages)
+        extractor = extractors(workers=1, pages_per_task=1, max_pending=10, page_timeout=1.0, inline_pages=0)
+        
+        # Act
+        pages = list(extractor.iter_pages(pdf_path))
+        
+        # Assert
+        assert pages == [f"Page {number}\n" for number in range(10)]
+    
+    def test_reads_pdf_bytes(self, pdf_path, extractors):
+        # Arrange
+        with open(pdf_path, "rb") as f:
+            content = f.read()
+        
+        # Act
+        text = extractors(workers=2, inline_pages=0).extract_text(content)
+        
+        # Assert
+        assert text == "".join(f"Page {number}" for number in range(10))
+    
+    def test_stuck_page_is_skipped(self, pdf_path, extractors, monkeypatch):
+        # Arrange
+        monkeypatch.setattr(pdf_extractor, "_extract_pages", _hanging_pages)
+        extractor = extractors(workers=2, pages_per_task=3, page_timeout=0.5, inline_pages=0)
+        
+        # Act
+        started = time.monotonic()
+        pages = list(extractor.iter_pages(pdf_path))
+        
+        # Assert: the range times out once, then its pages are retried together rather than one after another
+        assert pages == [f"Page {number}\n" if number != HANGING_PAGE else "" for number in range(10)]
+        assert time.monotonic() - started < 0.5 * 3 + 0.5 * 3
\ No newline at end of file
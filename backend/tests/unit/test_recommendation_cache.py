@@ -0,0 +1,96 @@
+import pytest
+import asyncio
+from ai_orchestrator.utils.recommendation_cache import RecommendationCache, fill_slots, recommendation_key
+
+class TestRecommendationCache:
+    @pytest.fixture
+    def cache(self):
+        return RecommendationCache(max_entries=2)
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_generate_once(self, cache):
+        # Arrange
+        calls = []
+        
+        async def generate():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"recommendation": "Cap liability in clause ${clause_id}"}
+        
+        key = recommendation_key("compliance", {"rule_id": "CA-1668"}, "US-CA")
+        
+        # Act
+        results = await asyncio.gather(*[cache.get_or_create(key, generate) for _ in range(5)])
+        
+        # Assert
+        assert len(calls) == 1
+        assert all(result == results[0] for result in results)
+        assert cache.stats() == {"hits": 4, "misses": 1, "entries": 1}
+    
+    @pytest.mark.asyncio
+    async def test_failed_generation_is_not_cached(self, cache):
+        # Arrange
+        async def fail():
+            raise RuntimeError("model unavailable")
+        
+        async def generate():
+            return "Review ${clause_id}"
+        
+        # Act
+        with pytest.raises(RuntimeError):
+            await cache.get_or_create(("risk", "high", ""), fail)
+        result = await cache.get_or_create(("risk", "high", ""), generate)
+        
+        # Assert
+        assert result == "Review ${clause_id}"
+    
+    @pytest.mark.asyncio
+    async def test_least_recently_used_entry_is_evicted(self, cache):
+        # Arrange
+        async def generate():
+            return "text"
+        
+        # Act
+        for key in (("risk", "a", ""), ("risk", "b", ""), ("risk", "a", ""), ("risk", "c", "")):
+            await cache.get_or_create(key, generate)
+        
+        # Assert
+        assert list(cache.entries) == [("risk", "a", ""), ("risk", "c", "")]
+    
+    def test_keys_separate_jurisdictions(self):
+        # Arrange
+        issue = {"rule_id": "GDPR-6", "category": "privacy"}
+        
+        # Act / Assert
+        assert recommendation_key("compliance", issue, "EU") != recommendation_key("compliance", issue, "UK")
+        assert recommendation_key("risk", {"risk_level": "high"}, None) == ("risk", "/high/", "")
+    
+    def test_risk_keys_separate_clause_types_and_factors(self):
+        # Arrange
+        indemnity = {"clause_type": "indemnification", "risk_level": "high", "risk_factors": ["uncapped", "one-sided"]}
+        termination = {"clause_type": "termination", "risk_level": "high", "risk_factors": ["uncapped", "one-sided"]}
+        reordered = {**indemnity, "risk_factors": [{"type": "one-sided"}, {"type": "uncapped"}]}
+        
+        # Act / Assert
+        assert recommendation_key("risk", indemnity, None) != recommendation_key("risk", termination, None)
+        assert recommendation_key("risk", indemnity, None) != recommendation_key("risk", {**indemnity, "risk_factors": ["uncapped"]}, None)
+        assert recommendation_key("risk", indemnity, None) == recommendation_key("risk", reordered, None)
+    
+    def test_compliance_keys_separate_issues_with_and_without_requirements(self):
+        # Arrange
+        stated = {"rule_id": "GDPR-6", "requirement": "No lawful basis for processing"}
+        other = {"rule_id": "GDPR-6", "description": "Retention period not stated"}
+        
+        # Act / Assert
+        assert recommendation_key("compliance", stated, "EU") == recommendation_key("compliance", other, "EU")
+        assert recommendation_key("compliance", stated, "EU") != recommendation_key("compliance", {"rule_id": "GDPR-6"}, "EU")
+    
+    def test_fill_slots(self):
+        # Arrange
+        template = {"recommendation": "Limit ${clause_id} to ${cap}", "priority": 1}
+        
+        # Act
+        result = fill_slots(template, {"clause_id": "4.2"})
+        
+        # Assert
+        assert result == {"recommendation": "Limit 4.2 to ${cap}", "priority": 1}
\ No newline at end of file
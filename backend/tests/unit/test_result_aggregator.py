@@ -0,0 +1,84 @@
+import pytest
+from ai_orchestrator.utils.result_aggregator import ResultAggregator, ResultMerge, fingerprint
+
+class TestResultAggregator:
+    @pytest.fixture
+    def aggregator(self):
+        return ResultAggregator()
+    
+    @pytest.fixture
+    def review_result(self):
+        return {
+            "compliance_issues": [
+                {"clause_text": "Data may be shared with  affiliates.", "rule_id": "GDPR-6", "category": "privacy", "confidence": 0.7},
+                {"clause_text": "Liability is unlimited.", "rule_id": "CA-1668", "category": "liability", "confidence": 0.9}
+            ],
+            "risks": [
+                {"clause_id": "c4", "risk_level": "high", "risk_score": 0.8}
+            ],
+            "summary": "Services agreement"
+        }
+    
+    @pytest.fixture
+    def compliance_result(self):
+        return {
+            "issues": [
+                {"clause_text": "data may be shared with affiliates.", "rule_id": "GDPR-6", "category": "privacy", "confidence": 0.95, "remediation": "Add lawful basis"}
+            ],
+            "summary": "Two issues found"
+        }
+    
+    @pytest.mark.asyncio
+    async def test_aggregate_deduplicates_issues(self, aggregator, review_result, compliance_result):
+        # Arrange
+        merge = aggregator.create_merge()
+        merge.add("contract_review", review_result)
+        merge.add("compliance", compliance_result)
+        
+        # Act
+        result = await aggregator.aggregate([review_result, compliance_result], merge)
+        
+        # Assert
+        assert len(result["compliance_issues"]) == 2
+        privacy = next(i for i in result["compliance_issues"] if i["rule_id"] == "GDPR-6")
+        assert privacy["confidence"] == 0.95
+        assert privacy["remediation"] == "Add lawful basis"
+        assert privacy["sources"] == ["contract_review", "compliance"]
+        assert result["duplicates_removed"] == 1
+        assert result["agents"] == ["contract_review", "compliance"]
+    
+    @pytest.mark.asyncio
+    async def test_aggregate_without_merge(self, aggregator, review_result, compliance_result):
+        # Act
+        result = await aggregator.aggregate([
+            {"agent_type": "contract_review", **review_result},
+            {"agent_type": "compliance", **compliance_result}
+        ])
+        
+        # Assert
+        assert len(result["compliance_issues"]) == 2
+        assert len(result["risks"]) == 1
+    
+    def test_conflicting_fields_keep_provenance(self, review_result, compliance_result):
+        # Arrange
+        merge = ResultMerge()
+        
+        # Act
+        merge.add("contract_review", review_result)
+        merge.add("compliance", compliance_result)
+        result = merge.to_dict()
+        
+        # Assert
+        assert result["summary"] == "Services agreement"
+        assert result["conflicts"]["summary"] == {
+            "contract_review": "Services agreement",
+            "compliance": "Two issues found"
+        }
+    
+    def test_fingerprint_distinguishes_rules(self):
+        # Arrange
+        issue = {"clause_text": "Liability is unlimited.", "rule_id": "CA-1668", "category": "liability"}
+        
+        # Act / Assert
+        assert fingerprint("issue", issue) == fingerprint("issue", dict(issue, confidence=0.1))
+        assert fingerprint("issue", issue) != fingerprint("issue", dict(issue, rule_id="NY-5-501"))
\ No newline at end of file
@@ -0,0 +1,31 @@
+import pytest
+import asyncio
+from ai_orchestrator.utils.summary_registry import SummaryNotFound, get_abstractive_summary, register_summary_owner
+
+class FakeAgent:
+    """Holds pending summaries the way ContractReviewAgent does"""
+    
+    def __init__(self, summaries):
+        self.pending_summaries = summaries
+    
+    async def get_abstractive_summary(self, summary_id, timeout=None):
+        return await asyncio.wait_for(asyncio.shield(self.pending_summaries[summary_id]), timeout)
+
+class TestSummaryRegistry:
+    @pytest.mark.asyncio
+    async def test_summary_is_found_on_the_agent_that_scheduled_it(self):
+        # Arrange
+        loop = asyncio.get_running_loop()
+        finished, running = loop.create_future(), loop.create_future()
+        finished.set_result("summary of contract")
+        agents = [FakeAgent({"a": finished}), FakeAgent({"b": running})]
+        for agent in agents:
+            register_summary_owner(agent)
+        
+        # Act / Assert
+        assert await get_abstractive_summary("a", timeout=0) == "summary of contract"
+        with pytest.raises(asyncio.TimeoutError):
+            await get_abstractive_summary("b", timeout=0)
+        assert not running.cancelled()
+        with pytest.raises(SummaryNotFound):
+            await get_abstractive_summary("c")
\ No newline at end of file
@@ -0,0 +1,58 @@
+import pytest
+from document_service.template_cache import CompiledTemplateCache
+
+class TestCompiledTemplateCache:
+    @pytest.fixture
+    def cache(self):
+        return CompiledTemplateCache(max_entries=2)
+    
+    def test_compiles_once_per_version(self, cache):
+        # Arrange
+        cache.compile("nda", 1, "Between {{ party }} and Acme")
+        
+        # Act
+        template = cache.get("nda", 1)
+        
+        # Assert
+        assert template.render(party="Beta") == "Between Beta and Acme"
+        assert cache.get("nda", 2) is None
+        assert cache.metrics()["hits"] == 1
+        assert cache.metrics()["misses"] == 1
+    
+    def test_least_recently_used_version_is_evicted(self, cache):
+        # Arrange
+        cache.compile("nda", 1, "v1")
+        cache.compile("msa", 1, "msa")
+        cache.get("nda", 1)
+        
+        # Act
+        cache.compile("nda", 2, "v2")
+        
+        # Assert
+        assert cache.get("msa", 1) is None
+        assert cache.get("nda", 1) is not None
+        assert cache.metrics()["evictions"] == 1
+    
+    def test_invalidate_drops_every_version(self, cache):
+        # Arrange
+        cache.compile("nda", 1, "v1")
+        cache.compile("nda", 2, "v2")
+        
+        # Act
+        removed = cache.invalidate("nda")
+        
+        # Assert
+        assert removed == 2
+        assert cache.get("nda", 2) is None
+    
+    def test_bytecode_cache_survives_restart(self, tmp_path):
+        # Arrange
+        CompiledTemplateCache(bytecode_dir=str(tmp_path)).compile("nda", 1, "Hello {{ name }}")
+        restarted = CompiledTemplateCache(bytecode_dir=str(tmp_path))
+        
+        # Act
+        template = restarted.compile("nda", 1, "Hello {{ name }}")
+        
+        # Assert
+        assert template.render(name="Beta") == "Hello Beta"
+        assert restarted.metrics()["bytecode_hits"] == 1
\ No newline at end of file
@@ -0,0 +1,80 @@
+import pytest
+from types import SimpleNamespace
+from template_service.template_inheritance import (
+    TemplateCycleError,
+    descendants,
+    materialize,
+    merge_chain,
+    resolve_chain
+)
+
+class TestTemplateInheritance:
+    @pytest.fixture
+    def parents(self):
+        # base <- commercial <- nda, with nda also inheriting from privacy
+        return {
+            "base": [],
+            "privacy": ["base"],
+            "commercial": ["base"],
+            "nda": ["commercial", "privacy"],
+            "mutual_nda": ["nda"]
+        }
+    
+    @pytest.fixture
+    def contents(self, parents):
+        return {template_id: f"<{template_id}>" for template_id in parents}
+    
+    def test_chain_is_topologically_ordered(self, parents):
+        # Act
+        chain = resolve_chain("mutual_nda", parents)
+        
+        # Assert
+        assert chain == ["base", "commercial", "privacy", "nda", "mutual_nda"]
+    
+    def test_cycle_is_detected(self, parents):
+        # Arrange
+        parents["base"] = ["mutual_nda"]
+        
+        # Act / Assert
+        with pytest.raises(TemplateCycleError) as error:
+            resolve_chain("nda", parents)
+        assert error.value.cycle[0] == error.value.cycle[-1]
+        assert isinstance(error.value, ValueError)
+    
+    def test_descendants(self, parents):
+        # Act / Assert
+        assert set(descendants("privacy", parents)) == {"nda", "mutual_nda"}
+        assert descendants("mutual_nda", parents) == []
+    
+    def test_ancestor_change_rematerialises_descendants(self, parents, contents):
+        # Act
+        resolved = materialize("commercial", parents, contents)
+        
+        # Assert
+        assert set(resolved) == {"commercial", "nda", "mutual_nda"}
+        assert resolved["nda"]["resolved_ancestors"] == ["base", "commercial", "privacy"]
+        assert resolved["nda"]["resolved_content"] == "<base>\n<commercial>\n<privacy>\n<nda>"
+        assert len(resolved["nda"]["resolved_checksum"]) == 40
+    @pytest.mark.asyncio
+    async def test_generator_fallback_matches_materialised_content(self, parents, contents):
+        # Arrange
+        pytest.importorskip("spacy")
+        pytest.importorskip("transformers")
+        from document_service.document_generator import DocumentGenerator
+        templates = {}
+        for template_id in parents:
+            templates[template_id] = SimpleNamespace(id=template_id, content=contents[template_id], parent_templates=[])
+        for template_id, parent_ids in parents.items():
+            templates[template_id].parent_templates = [templates[parent_id] for parent_id in parent_ids]
+        generator = DocumentGenerator.__new__(DocumentGenerator)
+        
+        async def load_template(template_id):
+            return templates[template_id]
+        generator._load_template = load_template
+        
+        # Act
+        parent_ids, loaded = await generator._load_ancestry(templates["mutual_nda"])
+        
+        # Assert: templates saved before materialisation render the same source
+        expected = materialize("mutual_nda", parents, contents)["mutual_nda"]["resolved_content"]
+        assert merge_chain(resolve_chain("mutual_nda", parent_ids), loaded) == expected
\ No newline at end of file
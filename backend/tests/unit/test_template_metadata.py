@@ -0,0 +1,106 @@
+import pytest
+from unittest.mock import patch
+from document_service.template_metadata import SectionIndex, TemplateMetadataCache
+from document_service.template_processor import TemplateProcessor
+
+class TestTemplateMetadata:
+    @pytest.fixture
+    def template(self):
+        return (
+            "Agreement between {{ party_a }} and {{ party_b }}.\n"
+            "{% section confidentiality %}\n"
+            "{% if mutual %}Both parties keep secrets.{% endif %}\n"
+            "{% endsection %}\n"
+            "Governed by {{ law }}."
+        )
+    
+    def test_metadata_is_parsed_once_per_content(self, template):
+        # Arrange
+        cache = TemplateMetadataCache()
+        
+        # Act
+        with patch.object(cache.env, "parse", wraps=cache.env.parse) as parse:
+            first = cache.get(template)
+            second = cache.get(template)
+        
+        # Assert
+        assert parse.call_count == 1
+        assert first is second
+        assert first.variables == {"party_a", "party_b", "mutual", "law"}
+        assert first.conditions == ["mutual"]
+        assert first.sections == ["confidentiality"]
+    
+    def test_invalid_syntax(self):
+        # Act / Assert
+        with pytest.raises(ValueError, match="Invalid template syntax"):
+            TemplateMetadataCache().get("{% if %}")
+    
+    @pytest.mark.asyncio
+    async def test_render_uses_cached_template(self, template):
+        # Arrange
+        processor = TemplateProcessor()
+        variables = {"party_a": "Acme", "party_b": "Beta", "mutual": True, "law": "Delaware"}
+        
+        # Act
+        with patch.object(processor.env, "from_string") as from_string:
+            result = await processor.process_template(template, variables)
+        
+        # Assert
+        from_string.assert_not_called()
+        assert "Both parties keep secrets." in result
+        assert result.endswith("Governed by Delaware.")
+    
+    @pytest.mark.asyncio
+    async def test_unknown_variables_are_rejected(self, template):
+        # Arrange
+        processor = TemplateProcessor()
+        
+        # Act / Assert
+        with pytest.raises(ValueError, match="undeclared variables"):
+            await processor.process_template(template, {"party_c": "Gamma"})
+
+class TestSectionIndex:
+    @pytest.fixture
+    def template(self):
+        return (
+            "Preamble\n"
+            "{% section payment %}\n"
+            "Pay within 30 days.\n"
+            "{% section late_fees %}\n"
+            "Late fees of {{ rate }} apply.\n"
+            "{% endsection %}\n"
+            "Invoices are emailed.\n"
+            "{% endsection %}\n"
+            "Signatures"
+        )
+    
+    def test_nested_sections(self, template):
+        # Arrange
+        index = SectionIndex.build(template)
+        
+        # Act / Assert
+        assert index.sections == ["payment", "late_fees"]
+        assert index.source(["payment"]) == "Preamble\nPay within 30 days.\nInvoices are emailed.\nSignatures"
+        assert index.source(["late_fees"]) == "Preamble\nSignatures"
+        assert "Late fees" in index.source(["payment", "late_fees"])
+    
+    def test_excluded_trailing_section_leaves_no_newline(self):
+        # Arrange
+        index = SectionIndex.build("Body\n{% section extra %}\nExtra\n{% endsection %}\n")
+        
+        # Act / Assert
+        assert index.source([]) == "Body\n"
+        assert index.source(["extra"]) == "Body\nExtra\n"
+    
+    def test_renderers_are_cached_per_combination(self, template):
+        # Arrange
+        cache = TemplateMetadataCache()
+        
+        # Act
+        first = cache.renderer(template, ["payment", "unknown"])
+        second = cache.renderer(template, ["payment"])
+        
+        # Assert
+        assert first is second
+        assert cache.renderer(template, ["payment", "late_fees"]) is cache.get(template).template
+        assert first.render(rate="2%") == "Preamble\nPay within 30 days.\nInvoices are emailed.\nSignatures"
\ No newline at end of file
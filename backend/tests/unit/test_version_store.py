@@ -0,0 +1,53 @@
+import pytest
+from document_service.version_store import VersionStore, apply_delta, compute_delta
+
+class TestVersionStore:
+    @pytest.fixture
+    def store(self):
+        store = VersionStore(snapshot_interval=3)
+        for number in range(1, 8):
+            clauses = [f"{i}. Clause revised in round {number if i == number else 0}\n" for i in range(1, 10)]
+            store.add("msa", "".join(clauses), {"title": "MSA", "round": number})
+        return store
+    
+    def test_delta_round_trip(self):
+        # Arrange
+        old = ["a\n", "b\n", "c\n", "d\n"]
+        new = ["a\n", "B\n", "c\n", "e\n", "d\n"]
+        
+        # Act
+        delta = compute_delta(old, new)
+        
+        # Assert
+        assert apply_delta(old, delta) == new
+    
+    def test_every_version_is_reconstructed(self, store):
+        # Act
+        versions = [store.get("msa", number) for number in range(1, 8)]
+        
+        # Assert
+        for number, content in enumerate(versions, start=1):
+            assert f"{number}. Clause revised in round {number}\n" in content
+        assert store.latest("msa") == versions[-1]
+    
+    def test_snapshots_every_interval(self, store):
+        # Act
+        listing = store.list_versions("msa")
+        
+        # Assert
+        assert [entry["snapshot"] for entry in listing] == [True, False, False, True, False, False, True]
+        assert [entry["round"] for entry in listing] == list(range(1, 8))
+        assert "content" not in listing[0]
+    
+    def test_unknown_version(self, store):
+        # Act / Assert
+        with pytest.raises(KeyError):
+            store.get("msa", 8)
+    
+    def test_version_zero_is_not_the_latest(self, store):
+        # Act / Assert
+        with pytest.raises(KeyError):
+            store.metadata("msa", 0)
+        with pytest.raises(KeyError):
+            store.get("msa", 0)
+        assert store.metadata("msa") == store.metadata("msa", len(store.list_versions("msa")))
\ No newline at end of file